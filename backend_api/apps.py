@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class BackendApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "backend_api"
+
+    def ready(self):
+        from backend_api import signals  # noqa: F401
+        from backend_api.utils.db_routing import check_sticky_shared
+        from backend_api.utils.versions import check_shared
+
+        check_shared()
+        check_sticky_shared()
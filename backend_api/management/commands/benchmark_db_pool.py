@@ -0,0 +1,108 @@
+import copy
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from backend_api.utils.benchmark import percentile
+from backend_api.utils.db_pool import get_pool_stats
+
+MODES = ("unpooled", "persistent", "pooled")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares request throughput with new connections per request (unpooled), "
+        "persistent per-thread connections (CONN_MAX_AGE) and the psycopg pool, under concurrent load. "
+        "PostgreSQL only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=32, help="Concurrent simulated requests")
+        parser.add_argument("--requests", type=int, default=50, help="Requests per thread")
+        parser.add_argument("--queries", type=int, default=3, help="Queries per request")
+        parser.add_argument("--max-size", type=int, help="Pool max_size (defaults to DB_POOL_MAX_SIZE)")
+        parser.add_argument("--only", nargs="*", choices=MODES)
+
+    def handle(self, *args, **options):
+        base = connections.settings[DEFAULT_DB_ALIAS]
+        if base["ENGINE"] != "django.db.backends.postgresql":
+            raise CommandError("Connection pooling needs PostgreSQL: point DATABASE_URL at a postgres database.")
+
+        report = {
+            "threads": options["threads"],
+            "requests_per_thread": options["requests"],
+            "queries_per_request": options["queries"],
+            "results": {},
+        }
+        for mode in options["only"] or MODES:
+            alias = f"pool_benchmark_{mode}"
+            connections.settings[alias] = self.get_settings(base, mode, options["max_size"])
+            try:
+                report["results"][mode] = self.run(alias, options)
+            finally:
+                if mode == "pooled":
+                    connections[alias].close_pool()
+                del connections.settings[alias]
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def get_settings(self, base, mode, max_size):
+        settings_dict = copy.deepcopy(base)
+        options = settings_dict.setdefault("OPTIONS", {})
+        options.pop("pool", None)
+        settings_dict["CONN_MAX_AGE"] = 600 if mode == "persistent" else 0
+        if mode == "pooled":
+            options["pool"] = {**settings.DB_POOL_OPTIONS, **({"max_size": max_size} if max_size else {})}
+        return settings_dict
+
+    def run(self, alias, options):
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(options["threads"])
+
+        def client():
+            connection = connections[alias]
+            samples = []
+            start_barrier.wait()
+            try:
+                for _ in range(options["requests"]):
+                    start = time.perf_counter()
+                    with connection.cursor() as cursor:
+                        for _ in range(options["queries"]):
+                            cursor.execute("SELECT 1")
+                            cursor.fetchone()
+                    # what request_finished does: close, or hand back to the pool
+                    connection.close_if_unusable_or_obsolete()
+                    samples.append((time.perf_counter() - start) * 1000)
+            except Exception as exc:
+                errors.append(repr(exc))
+            finally:
+                connection.close()
+                with lock:
+                    latencies.extend(samples)
+
+        threads = [threading.Thread(target=client) for _ in range(options["threads"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        result = {
+            "requests": len(latencies),
+            "requests_per_second": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50), 3) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95), 3) if latencies else None,
+            "errors": len(errors),
+        }
+        if errors:
+            result["first_error"] = errors[0]
+        stats = get_pool_stats(alias)
+        if stats["pooled"]:
+            result["pool"] = stats
+        return result
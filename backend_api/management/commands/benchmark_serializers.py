@@ -0,0 +1,76 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from backend_api.models import Contact, Expense, Income, Items, User
+from backend_api.serializers import ContactSerializer, ExpenseSerializer, IncomeSerializer, ItemSerializer
+from backend_api.serializers.values import get_values_serializer
+from backend_api.utils.query_plan import get_query_plan
+
+TARGETS = {
+    "contacts": (Contact, ContactSerializer),
+    "items": (Items, ItemSerializer),
+    "incomes": (Income, IncomeSerializer),
+    "expenses": (Expense, ExpenseSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = "Compares ModelSerializer and values()-based list serialization throughput on seeded data"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", help="Tenant to read (defaults to the first seeded bench admin)")
+        parser.add_argument("--limit", type=int, default=10000, help="Rows per list")
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--only", nargs="*", choices=sorted(TARGETS))
+
+    def handle(self, *args, **options):
+        if options["email"]:
+            user = User.objects.filter(email=options["email"]).first()
+        else:
+            user = User.objects.filter(email__startswith="bench", role="COMPANY_ADMIN").order_by("email").first()
+        if not user:
+            raise CommandError("No benchmark user found. Run `manage.py seed_bench_data` first or pass --email.")
+
+        renderer = JSONRenderer()
+        report = {}
+        for label in options["only"] or sorted(TARGETS):
+            model, serializer_class = TARGETS[label]
+            queryset = model.objects.filter(user__company=user.company).order_by("-created_at")
+            # Give the ModelSerializer its planned queryset so we compare serialization, not N+1s
+            planned = get_query_plan(serializer_class).apply(queryset)[: options["limit"]]
+            queryset = queryset[: options["limit"]]
+            values_serializer = get_values_serializer(serializer_class)
+
+            drf_time, drf_data = self.measure(
+                lambda: serializer_class(planned.all(), many=True).data, options["repeat"]
+            )
+            fast_time, fast_data = self.measure(
+                lambda: values_serializer.serialize(queryset.all()), options["repeat"]
+            )
+            render_time, fast_bytes = self.measure(lambda: renderer.render(fast_data), options["repeat"])
+            drf_bytes = renderer.render(drf_data)
+
+            rows = len(fast_data)
+            report[label] = {
+                "rows": rows,
+                "serializer_rows_per_s": round(rows / drf_time),
+                "values_rows_per_s": round(rows / fast_time),
+                "speedup": round(drf_time / fast_time, 2),
+                "speedup_with_render": round((drf_time + render_time) / (fast_time + render_time), 2),
+                "identical_json": drf_bytes == fast_bytes,
+            }
+
+        self.stdout.write(json.dumps(report, indent=2))
+
+    @staticmethod
+    def measure(render, repeat):
+        best, output = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = render()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,18 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from backend_api.utils.geo import build_index, get_config
+
+
+class Command(BaseCommand):
+    help = "Compiles INDIA_CITIES_FILE into the binary city index used by /api/geo/cities/"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Index file to write (defaults to CITY_INDEX_PATH)")
+
+    def handle(self, *args, **options):
+        path = options["output"] or get_config().get("PATH")
+        count = build_index(settings.INDIA_CITIES_FILE, path)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} cities into {path} ({os.path.getsize(path)} bytes)."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from backend_api.models import Invoice
+from backend_api.utils.contact_items import rebuild_contact_items
+
+
+class Command(BaseCommand):
+    help = "Recomputes the per-contact item usage behind suggested invoice lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company", help="Only this company id")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Lines read per batch")
+
+    def handle(self, *args, **options):
+        invoices = Invoice.objects.all()
+        if options["company"]:
+            invoices = invoices.filter(user__company_id=options["company"])
+        rows = rebuild_contact_items(invoices, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} contact item rows."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from backend_api.models import Invoice
+from backend_api.utils.item_sales import rebuild_item_sales
+
+
+class Command(BaseCommand):
+    help = "Recomputes the per-item monthly sales totals from invoice lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company", help="Only this company id")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Lines read per batch")
+
+    def handle(self, *args, **options):
+        invoices = Invoice.objects.all()
+        if options["company"]:
+            invoices = invoices.filter(user__company_id=options["company"])
+        rows = rebuild_item_sales(invoices, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} item sales rows."))
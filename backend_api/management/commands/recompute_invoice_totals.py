@@ -0,0 +1,101 @@
+import json
+import multiprocessing
+import os
+import signal
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from backend_api.models import Invoice
+from backend_api.utils.recompute import iter_id_chunks, recompute_chunk
+
+
+def _init_worker():
+    # the parent handles Ctrl+C; the checkpoint only covers chunks it has seen finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+
+def _recompute(args):
+    invoice_ids, dry_run = args
+    return recompute_chunk(invoice_ids, dry_run)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes stored line tax/total and invoice totals in primary-key chunks, "
+        "writing only the rows that changed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Invoices per chunk")
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes (1 runs in this process)")
+        parser.add_argument("--company", help="Only invoices of this company id")
+        parser.add_argument("--dry-run", action="store_true", help="Print the differences without writing them")
+        parser.add_argument(
+            "--checkpoint",
+            help="JSON file recording the last finished chunk; a rerun resumes after it, "
+            "and it is removed once every invoice is done",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+        dry_run = options["dry_run"]
+        checkpoint = options["checkpoint"]
+        state = self.load_checkpoint(checkpoint)
+        if state["last_pk"] is not None:
+            self.stdout.write(f"Resuming after invoice #{state['last_pk']}.")
+
+        queryset = Invoice.objects.all()
+        if options["company"]:
+            queryset = queryset.filter(user__company_id=options["company"])
+        chunks = ((ids, dry_run) for ids in iter_id_chunks(queryset, options["chunk_size"], state["last_pk"]))
+
+        processes = max(options["processes"], 1)
+        if processes == 1:
+            self.run(map(_recompute, chunks), state, checkpoint, dry_run)
+        else:
+            # children must open their own database connections
+            connections.close_all()
+            with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+                # imap keeps chunk order, so the checkpoint never skips an unfinished chunk
+                self.run(pool.imap(_recompute, chunks), state, checkpoint, dry_run)
+
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        verb = "Would update" if dry_run else "Updated"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {state['invoices']} invoices. {verb} {state['changed_invoices']} invoice totals "
+                f"and {state['changed_lines']} lines."
+            )
+        )
+
+    def run(self, results, state, checkpoint, dry_run):
+        for result in results:
+            for diff in result["diffs"] if dry_run else ():
+                self.stdout.write(diff)
+            for key in ("invoices", "changed_invoices", "changed_lines"):
+                state[key] += result[key]
+            state["last_pk"] = result["last_pk"]
+            if checkpoint:
+                self.save_checkpoint(checkpoint, state)
+
+    def load_checkpoint(self, path):
+        state = {"last_pk": None, "invoices": 0, "changed_invoices": 0, "changed_lines": 0}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    state.update(json.load(fh))
+            except ValueError:
+                raise CommandError(f"Checkpoint {path} is not valid JSON.")
+        return state
+
+    def save_checkpoint(self, path, state):
+        # write then rename, so an interrupted run never leaves half a file
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(temporary, path)
@@ -0,0 +1,71 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from backend_api.models import Contact, Invoice, User
+from backend_api.utils.benchmark import EndpointBenchmark, compare_results
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the main API endpoints in-process and reports p50/p95 latency and query counts as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", help="User to run as (defaults to the first seeded bench admin)")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--only", nargs="*", help="Only run these endpoint labels")
+        parser.add_argument("--output", help="Write the JSON report to this file")
+        parser.add_argument("--compare", help="Previous JSON report to diff against")
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["email"])
+        endpoints = self.get_endpoints(user)
+        if options["only"]:
+            endpoints = {label: path for label, path in endpoints.items() if label in options["only"]}
+
+        bench = EndpointBenchmark(user, iterations=options["iterations"], warmup=options["warmup"])
+        report = {"user": user.email, "iterations": options["iterations"], "results": bench.run(endpoints)}
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+            report["diff"] = compare_results(baseline.get("results", {}), report["results"])
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    def get_user(self, email):
+        if email:
+            user = User.objects.filter(email=email, is_active=True).first()
+        else:
+            user = User.objects.filter(email__startswith="bench", role="COMPANY_ADMIN").order_by("email").first()
+        if not user:
+            raise CommandError("No benchmark user found. Run `manage.py seed_bench_data` first or pass --email.")
+        return user
+
+    def get_endpoints(self, user):
+        endpoints = {
+            "contacts.list": reverse("contact-list"),
+            "items.list": reverse("items-list"),
+            "invoices.list": reverse("invoice-list"),
+            "accounts.list": reverse("account-list"),
+            "incomes.list": reverse("income-list"),
+            "expenses.list": reverse("expense-list"),
+            "taxes.list": reverse("tax-list"),
+            "roles.list": reverse("role-list"),
+            "users.list": reverse("user-list"),
+            "profile": reverse("user-profile"),
+        }
+
+        contact = Contact.objects.filter(user__company=user.company).first()
+        if contact:
+            endpoints["contacts.retrieve"] = reverse("contact-detail", kwargs={"pk": contact.pk})
+
+        invoice = Invoice.objects.filter(user__company=user.company).first()
+        if invoice:
+            endpoints["invoices.retrieve"] = reverse("invoice-detail", kwargs={"pk": invoice.pk})
+        return endpoints
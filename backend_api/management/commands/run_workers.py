@@ -0,0 +1,61 @@
+import multiprocessing
+import signal
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from backend_api.utils.jobs import get_worker_id, requeue_stale, work
+
+
+def _worker_main(number, stop_event, once):
+    # the parent handles Ctrl+C and tells workers to stop after their current job
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+    django.setup()
+    work(get_worker_id(number), should_stop=stop_event.is_set, once=once)
+
+
+class Command(BaseCommand):
+    help = "Runs background job workers (a pool of processes polling the Job table)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=getattr(settings, "JOBS", {}).get("WORKERS", 2),
+            help="Worker processes (1 runs in this process)",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due instead of polling")
+
+    def handle(self, *args, **options):
+        processes, once = max(options["processes"], 1), options["once"]
+        requeued = requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} jobs left running by stopped workers.")
+
+        if processes == 1:
+            processed = work(get_worker_id(), once=once)
+            self.stdout.write(self.style.SUCCESS(f"Ran {processed} jobs."))
+            return
+
+        # children must open their own database connections
+        connections.close_all()
+        stop_event = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(target=_worker_main, args=(number, stop_event, once), daemon=True)
+            for number in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {processes} workers.")
+
+        def stop(*args):
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
@@ -0,0 +1,234 @@
+import json
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from backend_api.models import (
+    Account,
+    Company,
+    Contact,
+    Expense,
+    Income,
+    Invoice,
+    InvoiceItem,
+    Items,
+    User,
+)
+from backend_api.utils.india_states import STATE_NAMES
+from backend_api.utils.contact_items import rebuild_contact_items
+from backend_api.utils.invoice_utils import get_invoice_prefix
+from backend_api.utils.item_sales import rebuild_item_sales
+from backend_api.utils.money import line_amounts_from_decimal, sum_amounts
+
+BENCH_PASSWORD = "bench-password"
+FIRST_NAMES = ["Aarav", "Diya", "Vihaan", "Ananya", "Kabir", "Isha", "Rohan", "Meera", "Arjun", "Sara"]
+LAST_NAMES = ["Patel", "Shah", "Sharma", "Iyer", "Reddy", "Gupta", "Nair", "Singh", "Mehta", "Das"]
+STREETS = ["MG Road", "Station Road", "Ring Road", "Market Yard", "Gandhi Chowk", "Nehru Nagar"]
+GST_RATES = [Decimal("0"), Decimal("5"), Decimal("12"), Decimal("18"), Decimal("28")]
+INCOME_CATEGORIES = ["Sales", "Services", "Interest", "Commission"]
+EXPENSE_CATEGORIES = ["Rent", "Salary", "Utilities", "Travel", "Supplies"]
+
+
+class Command(BaseCommand):
+    help = "Generates synthetic companies, contacts, items, invoices and transactions for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--companies", type=int, default=1)
+        parser.add_argument("--contacts", type=int, default=200, help="Contacts per company")
+        parser.add_argument("--items", type=int, default=100, help="Items per company")
+        parser.add_argument("--invoices", type=int, default=500, help="Invoices per company")
+        parser.add_argument("--lines", type=int, default=5, help="Maximum lines per invoice")
+        parser.add_argument("--accounts", type=int, default=5, help="Accounts per company")
+        parser.add_argument("--transactions", type=int, default=500, help="Incomes and expenses per company")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for repeatable data")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.password = make_password(BENCH_PASSWORD)
+
+        with open(settings.INDIA_CITIES_FILE, encoding="utf-8") as fh:
+            self.cities = json.load(fh)
+
+        start = Company.objects.filter(name__startswith="Bench Company").count()
+        for index in range(start, start + options["companies"]):
+            with transaction.atomic():
+                admin = self.seed_company(index, options)
+            self.stdout.write(f"Seeded company #{index} (login: {admin.email} / {BENCH_PASSWORD})")
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully seeded {options['companies']} companies!"))
+
+    # -------------------------------
+    # ONE COMPANY
+    # -------------------------------
+    def seed_company(self, index, options):
+        city = self.rng.choice(self.cities)
+        company = Company.objects.create(
+            name=f"Bench Company {index}",
+            address=f"{self.rng.randint(1, 999)}, {self.rng.choice(STREETS)}, {city['name']}",
+            email=f"bench{index}@example.com",
+        )
+        admin = User.objects.create(
+            email=f"bench{index}@example.com",
+            first_name="Bench",
+            last_name=f"Admin {index}",
+            company=company,
+            role="COMPANY_ADMIN",
+            is_active=True,
+            is_verified=True,
+            password=self.password,
+        )
+
+        contacts = self.seed_contacts(admin, options["contacts"])
+        items = self.seed_items(admin, options["items"])
+        self.seed_invoices(admin, contacts, items, options["invoices"], options["lines"])
+        accounts = self.seed_accounts(admin, options["accounts"])
+        self.seed_transactions(admin, accounts, options["transactions"])
+        return admin
+
+    def seed_contacts(self, user, count):
+        contacts = []
+        for n in range(count):
+            city = self.rng.choice(self.cities)
+            name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} {n}"
+            address = f"{self.rng.randint(1, 999)}, {self.rng.choice(STREETS)}"
+            state = STATE_NAMES.get(city["stateCode"], city["stateCode"])
+            pincode = str(self.rng.randint(110001, 855999))
+            contacts.append(
+                Contact(
+                    user=user,
+                    name=name,
+                    mobile=f"+91{self.rng.randint(6000000000, 9999999999)}",
+                    email=f"contact{n}@{user.company_id.hex[:8]}.example.com",
+                    billing_address=address,
+                    billing_city=city["name"],
+                    billing_state=state,
+                    billing_pincode=pincode,
+                    billing_country="India",
+                    # bulk_create skips Contact.save(), so copy the address here
+                    same_as_billing=True,
+                    shipping_address=address,
+                    shipping_city=city["name"],
+                    shipping_state=state,
+                    shipping_pincode=pincode,
+                    shipping_country="India",
+                    payment_type=self.rng.choice(["receivable", "payable"]),
+                )
+            )
+        return Contact.objects.bulk_create(contacts, batch_size=self.batch_size)
+
+    def seed_items(self, user, count):
+        tax_categories = [value for value, _ in Items.TAX_CATEGORY_CHOICES]
+        units = [value for value, _ in Items.ITEM_MEASURE_CHOICES]
+        items = []
+        for n in range(count):
+            rate = Decimal(self.rng.randint(100, 500000)) / 100
+            items.append(
+                Items(
+                    user=user,
+                    name=f"Item {n}",
+                    type=self.rng.choice(["service", "product", "charge"]),
+                    sac=self.rng.randint(1000, 999999),
+                    unit_type=self.rng.choice(units),
+                    tax_category=self.rng.choice(tax_categories),
+                    rate=rate,
+                    discount=Decimal("0"),
+                )
+            )
+        return Items.objects.bulk_create(items, batch_size=self.batch_size)
+
+    def seed_invoices(self, user, contacts, items, count, max_lines):
+        today = timezone.now().date()
+        sequence = {}
+        invoices = []
+        invoice_lines = []
+
+        for n in range(count):
+            invoice_date = today - timedelta(days=self.rng.randint(0, 364))
+            prefix = get_invoice_prefix(invoice_date)
+            sequence[prefix] = sequence.get(prefix, 0) + 1
+
+            lines = []
+            for _ in range(self.rng.randint(1, max_lines)):
+                item = self.rng.choice(items)
+                quantity = self.rng.randint(1, 20)
+                gst = self.rng.choice(GST_RATES)
+                _, tax_amount, total = line_amounts_from_decimal(quantity, item.rate, 0, gst)
+                lines.append(
+                    InvoiceItem(
+                        item_id=item,
+                        description=item.name,
+                        quantity=quantity,
+                        rate=item.rate,
+                        gst_percentage=gst,
+                        tax_amount=tax_amount,
+                        total=total,
+                    )
+                )
+
+            invoices.append(
+                Invoice(
+                    user=user,
+                    contact=self.rng.choice(contacts),
+                    bill_id=f"BENCH-{user.company_id.hex[:8]}-{n:06d}",
+                    invoice_number=f"{prefix}{sequence[prefix]:04d}",
+                    invoice_date=invoice_date,
+                    total_amount=sum_amounts(line.total for line in lines),
+                )
+            )
+            invoice_lines.append(lines)
+
+        invoices = Invoice.objects.bulk_create(invoices, batch_size=self.batch_size)
+        InvoiceItem.objects.bulk_create(
+            [line for lines in invoice_lines for line in lines], batch_size=self.batch_size
+        )
+
+        Through = Invoice.items.through
+        Through.objects.bulk_create(
+            [
+                Through(invoice_id=invoice.pk, invoiceitem_id=line.pk)
+                for invoice, lines in zip(invoices, invoice_lines)
+                for line in lines
+            ],
+            batch_size=self.batch_size,
+        )
+        # bulk_create skips the serializer that keeps item sales and contact usage current
+        invoices = Invoice.objects.filter(user__company_id=user.company_id)
+        rebuild_item_sales(invoices, self.batch_size)
+        rebuild_contact_items(invoices, self.batch_size)
+
+    def seed_accounts(self, user, count):
+        accounts = [
+            Account(user=user, name=f"Account {n}", initial_balance=Decimal(self.rng.randint(0, 100000)))
+            for n in range(count)
+        ]
+        return Account.objects.bulk_create(accounts, batch_size=self.batch_size)
+
+    def seed_transactions(self, user, accounts, count):
+        if not accounts:
+            return
+
+        today = timezone.now().date()
+        incomes, expenses = [], []
+        for n in range(count):
+            model, categories, bucket = (
+                (Income, INCOME_CATEGORIES, incomes) if n % 2 == 0 else (Expense, EXPENSE_CATEGORIES, expenses)
+            )
+            bucket.append(
+                model(
+                    user=user,
+                    account=self.rng.choice(accounts),
+                    date=today - timedelta(days=self.rng.randint(0, 364)),
+                    category=self.rng.choice(categories),
+                    amount=Decimal(self.rng.randint(100, 1000000)) / 100,
+                )
+            )
+        Income.objects.bulk_create(incomes, batch_size=self.batch_size)
+        Expense.objects.bulk_create(expenses, batch_size=self.batch_size)
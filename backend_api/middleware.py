@@ -0,0 +1,144 @@
+# backend_api/middleware.py
+import json
+import logging
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from backend_api.utils.db_routing import has_replica, stick_to_primary
+from backend_api.utils.request_metrics import (
+    RequestMetrics,
+    activate_metrics,
+    deactivate_metrics,
+)
+
+logger = logging.getLogger("backend_api.metrics")
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, DB time, serializer time and response size per request.
+    - Adds a `Server-Timing` header so the numbers show up in browser dev tools.
+    - Logs a structured JSON line for a sampled fraction of requests.
+    - Logs a warning when an endpoint goes over its budget in
+      settings.REQUEST_METRICS["BUDGETS"] (keyed by URL name, e.g. "invoice-list").
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, "REQUEST_METRICS", {})
+        self.enabled = config.get("ENABLED", True)
+        self.server_timing = config.get("SERVER_TIMING", True)
+        self.sample_rate = float(config.get("LOG_SAMPLE_RATE", 0.0))
+        self.budgets = config.get("BUDGETS", {})
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = activate_metrics(metrics)
+        try:
+            with ExitStack() as stack:
+                # the primary and, when configured, the read replica
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            deactivate_metrics(token)
+
+        endpoint = self.get_endpoint_name(request)
+        record = self.build_record(request, response, metrics, endpoint)
+
+        if self.server_timing:
+            response["Server-Timing"] = self.format_server_timing(record)
+
+        over_budget = self.check_budget(endpoint, record)
+        if over_budget:
+            logger.warning(
+                "Endpoint %s exceeded its budget: %s",
+                endpoint,
+                json.dumps({**record, "exceeded": over_budget}),
+            )
+        elif self.sample_rate and random.random() < self.sample_rate:
+            logger.info(json.dumps(record))
+
+        return response
+
+    # -------------------------------
+    # HELPERS
+    # -------------------------------
+    @staticmethod
+    def get_endpoint_name(request):
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.view_name:
+            return match.view_name
+        return request.path
+
+    @staticmethod
+    def build_record(request, response, metrics, endpoint):
+        if getattr(response, "streaming", False):
+            size = None
+        else:
+            size = len(response.content)
+
+        return {
+            "endpoint": endpoint,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": metrics.query_count,
+            "db_ms": round(metrics.db_time * 1000, 2),
+            "serializer_ms": round(metrics.timings.get("serializer", 0.0) * 1000, 2),
+            "total_ms": round(metrics.elapsed * 1000, 2),
+            "response_bytes": size,
+        }
+
+    @staticmethod
+    def format_server_timing(record):
+        return ", ".join(
+            [
+                f'db;dur={record["db_ms"]};desc="{record["queries"]} queries"',
+                f'ser;dur={record["serializer_ms"]};desc="Serializer"',
+                f'total;dur={record["total_ms"]}',
+            ]
+        )
+
+    def check_budget(self, endpoint, record):
+        """Return {metric: (actual, limit)} for every limit the request went over."""
+        budget = self.budgets.get(endpoint)
+        if not budget:
+            return {}
+
+        exceeded = {}
+        for key in ("queries", "db_ms", "total_ms", "response_bytes"):
+            limit = budget.get(key)
+            actual = record.get(key)
+            if limit is not None and actual is not None and actual > limit:
+                exceeded[key] = [actual, limit]
+        return exceeded
+
+
+class ReplicaStickyMiddleware:
+    """
+    After a successful write request, keep the user's tenant reading from the
+    primary for REPLICA["STICKY_SECONDS"] (see utils/db_routing.py).
+    DRF sets request.user on the Django request once the view authenticated it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+            and has_replica()
+            and getattr(request, "user", None) is not None
+            and request.user.is_authenticated
+        ):
+            stick_to_primary(request.user)
+        return response
@@ -10,3 +10,8 @@ from .tax import *
 from .account import *
 from .income import *
 from .expense import *
+from .change_log import *
+from .idempotency import *
+from .job import *
+from .item_sales import *
+from .contact_item_usage import *
@@ -2,6 +2,27 @@
 from django.db import models
 from .user import User
 
+
+class AccountQuerySet(models.QuerySet):
+    def with_balance(self):
+        """Annotate income/expense totals so `balance` needs no extra queries."""
+        return self.annotate(
+            incomes_total=self._related_total("incomes"),
+            expenses_total=self._related_total("expenses"),
+        )
+
+    def _related_total(self, related_name):
+        related_model = self.model._meta.get_field(related_name).related_model
+        totals = (
+            related_model.objects.filter(account=models.OuterRef("pk"))
+            .order_by()
+            .values("account")
+            .annotate(total=models.Sum("amount"))
+            .values("total")
+        )
+        return models.Subquery(totals, output_field=models.DecimalField(max_digits=12, decimal_places=2))
+
+
 class Account(models.Model):
     user = models.ForeignKey(
         User,
@@ -14,12 +35,16 @@ class Account(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AccountQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         unique_together = ("user", "name")
 
     @property
     def balance(self):
+        if hasattr(self, "incomes_total"):
+            return self.initial_balance + (self.incomes_total or 0) - (self.expenses_total or 0)
         incomes_sum = self.incomes.aggregate(total=models.Sum('amount'))['total'] or 0
         expenses_sum = self.expenses.aggregate(total=models.Sum('amount'))['total'] or 0
         return self.initial_balance + incomes_sum - expenses_sum
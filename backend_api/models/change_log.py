@@ -0,0 +1,27 @@
+# backend_api/models/change_log.py
+from django.db import models
+
+
+class ChangeLog(models.Model):
+    """
+    Append-only log of record writes, read by the delta sync API.
+    `id` is the sync cursor: it only ever grows, and clients ask for every
+    entry of their scope (see utils/response_cache.scope_for_user) after it.
+    """
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+    ACTION_CHOICES = [(UPSERT, "Upsert"), (DELETE, "Delete")]
+
+    id = models.BigAutoField(primary_key=True)
+    scope = models.CharField(max_length=64)
+    model = models.CharField(max_length=30)
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["scope", "id"], name="changelog_scope_id_idx")]
+
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.model}:{self.object_id}"
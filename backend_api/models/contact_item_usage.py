@@ -0,0 +1,30 @@
+# backend_api/models/contact_item_usage.py
+from django.db import models
+
+
+class ContactItemUsage(models.Model):
+    """
+    How often and how recently an item was billed to a contact, with the
+    terms of the latest line, kept up to date as invoices are written (see
+    utils/contact_items.py). `scope` is the tenant scope, as in ChangeLog.
+    """
+
+    scope = models.CharField(max_length=64)
+    contact = models.ForeignKey("backend_api.Contact", on_delete=models.CASCADE, related_name="item_usage")
+    item = models.ForeignKey("backend_api.Items", on_delete=models.CASCADE, related_name="contact_usage")
+    # invoices the item appears on
+    uses = models.IntegerField(default=0)
+    quantity = models.BigIntegerField(default=0)
+    last_used = models.DateField()
+    last_rate = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_discount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_gst_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["contact", "item"], name="unique_contact_item_usage")]
+        indexes = [
+            models.Index(fields=["scope", "contact", "-uses", "-last_used"], name="contact_usage_rank_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.contact_id}:{self.item_id} x{self.uses}"
@@ -0,0 +1,27 @@
+# backend_api/models/idempotency.py
+from django.conf import settings
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored outcome of a create request sent with an Idempotency-Key header
+    (see utils/idempotency.py). A retry with the same key gets this response
+    back instead of creating the record again.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    # hash of method, path and body: the same key with another request is an error
+    request_hash = models.CharField(max_length=64)
+    # null while the first request is still running
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content = models.BinaryField(null=True, blank=True)
+    locked_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "key"], name="unique_user_idempotency_key")]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
@@ -104,7 +104,9 @@ class Invoice(models.Model):
 
     def update_total(self):
         """Recalculate invoice total from all items."""
-        total = sum(item.total for item in self.items.all())
+        from backend_api.utils.money import sum_amounts
+
+        total = sum_amounts(item.total for item in self.items.all())
         if self.total_amount != total:
             self.total_amount = total
             super().save(update_fields=["total_amount"])
@@ -16,16 +16,12 @@ class InvoiceItem(models.Model):
     delivery_challan_no = models.CharField(max_length=50, blank=True, default="")
 
     def save(self, *args, **kwargs):
-        from decimal import Decimal
-        subtotal = (self.quantity * self.rate) - self.discount
-        if subtotal < 0:
-            subtotal = Decimal('0')
+        from backend_api.utils.money import line_amounts_from_decimal
 
-        # Calculate GST from gst_percentage field
-        gst_rate = self.gst_percentage or Decimal('0')
-        self.tax_amount = (subtotal * gst_rate) / Decimal('100')
-
-        self.total = subtotal + self.tax_amount
+        # GST from gst_percentage, rounded to the paisa (see utils/money.py)
+        _, self.tax_amount, self.total = line_amounts_from_decimal(
+            self.quantity, self.rate, self.discount, self.gst_percentage
+        )
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -0,0 +1,28 @@
+# backend_api/models/item_sales.py
+from django.db import models
+
+
+class ItemSales(models.Model):
+    """
+    Sales of one item in one calendar month, kept up to date as invoice lines
+    are written (see utils/item_sales.py). `scope` is the tenant scope of the
+    invoices, as in ChangeLog; `month` is the first day of the month.
+    """
+
+    scope = models.CharField(max_length=64)
+    item = models.ForeignKey("backend_api.Items", on_delete=models.CASCADE, related_name="monthly_sales")
+    month = models.DateField()
+    lines = models.IntegerField(default=0)
+    quantity = models.BigIntegerField(default=0)
+    # taxable value (after discount, before GST)
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    tax = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "item", "month"], name="unique_item_sales_month")
+        ]
+        indexes = [models.Index(fields=["scope", "month"], name="item_sales_scope_month_idx")]
+
+    def __str__(self):
+        return f"{self.item_id} {self.month:%Y-%m}"
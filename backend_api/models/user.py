@@ -59,6 +59,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     )
 
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
+    # {"sm": {"webp": path, "jpeg": path}, ...}, written by tasks.process_profile_image
+    profile_image_variants = models.JSONField(default=dict, blank=True)
 
     # Store dynamic permissions like {"invoices": {"create": True, "read": True}}
     permissions = models.JSONField(default=dict, blank=True)
@@ -1,8 +1,9 @@
 # backend_api/serializers/account.py
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models import Account
 
-class AccountSerializer(serializers.ModelSerializer):
+class AccountSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     balance = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
 
     class Meta:
@@ -1,10 +1,11 @@
 # backend_api/serializers/contact.py
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models import Contact
 import re
 
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Contact
         fields = "__all__"
@@ -1,8 +1,9 @@
 # backend_api/serializers/expense.py
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models import Expense, Account
 
-class ExpenseSerializer(serializers.ModelSerializer):
+class ExpenseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     account_name = serializers.ReadOnlyField(source="account.name")
 
     class Meta:
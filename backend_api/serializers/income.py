@@ -1,8 +1,9 @@
 # backend_api/serializers/income.py
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models import Income, Account
 
-class IncomeSerializer(serializers.ModelSerializer):
+class IncomeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     account_name = serializers.ReadOnlyField(source="account.name")
 
     class Meta:
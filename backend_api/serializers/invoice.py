@@ -1,17 +1,105 @@
 # backend_api/serializers/invoice.py
+import uuid
+
+from django.db import transaction
 from rest_framework import serializers
-from backend_api.models import Invoice, InvoiceItem, Items
+from backend_api.utils.request_metrics import TimedSerializerMixin
+from backend_api.models import Invoice, InvoiceItem, Items, Tax
+from backend_api.utils.gst import get_gst_summary, get_invoice_supply
+from backend_api.utils.contact_items import apply_usage, line_usage, record_contact_usage
+from backend_api.utils.item_catalog import lock_items, resolve_items
+from backend_api.utils.item_sales import apply_sales, invoice_sales, record_invoice_sales
+from backend_api.utils.response_cache import scope_for_instance
+from backend_api.utils.tax_rates import get_category_rate, get_tax_rates
 from backend_api.utils.invoice_utils import (
-    get_missing_invoice_numbers,
-    get_next_invoice_number,
+    get_invoice_prefix,
+    get_used_invoice_numbers,
+    missing_invoice_numbers,
+    next_invoice_number,
     validate_user_invoice_number,
 )
 
 
-class InvoiceItemSerializer(serializers.ModelSerializer):
-    item_id = serializers.PrimaryKeyRelatedField(
-        queryset=Items.objects.all(), required=False, allow_null=True
-    )
+class CompanyTaxField(serializers.PrimaryKeyRelatedField):
+    """
+    A Tax of the requesting user's company, checked against the cached rate
+    table (utils/tax_rates.py) instead of one query per line. The value is an
+    in-memory Tax carrying only its id, company and rate.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("queryset", Tax.objects.all())
+        super().__init__(**kwargs)
+
+    def get_company_id(self):
+        request = self.context.get("request")
+        return getattr(request.user, "company_id", None) if request else None
+
+    def get_rates(self):
+        # once per request, shared by every line
+        if "tax_rates" not in self.context:
+            self.context["tax_rates"] = get_tax_rates(self.get_company_id())
+        return self.context["tax_rates"]
+
+    def to_internal_value(self, data):
+        try:
+            pk = uuid.UUID(str(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        rates = self.get_rates()
+        if pk not in rates:
+            self.fail("does_not_exist", pk_value=data)
+        return Tax(pk=pk, company_id=self.get_company_id(), rate=rates[pk])
+
+
+class CatalogItemField(serializers.PrimaryKeyRelatedField):
+    """
+    An item of the requesting user's company (or the user's own items),
+    resolved through utils/item_catalog.py. InvoiceItemListSerializer resolves
+    every line's item up front into context["catalog_items"].
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("queryset", Items.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        items = self.context.setdefault("catalog_items", {})
+        if pk not in items:
+            items.update(resolve_items(self.context["request"].user, [pk]))
+        if pk not in items:
+            self.fail("does_not_exist", pk_value=data)
+        return items[pk]
+
+
+class InvoiceItemListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        # one lookup for the items of every line instead of one per line
+        if isinstance(data, list) and "request" in self.context:
+            ids = set()
+            for line in data:
+                value = line.get("item_id") if isinstance(line, dict) else None
+                if value is not None and not isinstance(value, bool):
+                    try:
+                        ids.add(int(value))
+                    except (TypeError, ValueError):
+                        pass
+            if ids:
+                self.context.setdefault("catalog_items", {}).update(
+                    resolve_items(self.context["request"].user, ids)
+                )
+        return super().to_internal_value(data)
+
+
+class InvoiceItemSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    item_id = CatalogItemField(required=False, allow_null=True)
+    tax = CompanyTaxField(required=False, allow_null=True)
 
     class Meta:
         model = InvoiceItem
@@ -29,10 +117,13 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
             "delivery_challan_no",
         ]
         read_only_fields = ["total", "tax_amount"]
+        list_serializer_class = InvoiceItemListSerializer
 
     def validate(self, data):
         """
-        Auto-fill description & rate from Item if not provided
+        Auto-fill description & rate from Item if not provided.
+        GST: the tax's rate, else the given gst_percentage, else the item's
+        tax category, else none.
         """
         item = data.get("item_id")
 
@@ -40,14 +131,15 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
             data.setdefault("description", item.name)
             data.setdefault("rate", item.rate)
 
-        # Default GST to 5% if not provided
-        if "gst_percentage" not in data:
-            data["gst_percentage"] = 5
+        if data.get("tax") is not None:
+            data["gst_percentage"] = data["tax"].rate
+        elif "gst_percentage" not in data:
+            data["gst_percentage"] = get_category_rate(item.tax_category) if item else 0
 
         return data
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     items = InvoiceItemSerializer(many=True)
     available_invoice_numbers = serializers.SerializerMethodField()
     next_invoice_number = serializers.SerializerMethodField()
@@ -74,38 +166,39 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "gst_summary",
         ]
         read_only_fields = ["bill_id", "total_amount", "user"]
+        # place of supply for gst_summary
+        select_related = ("contact", "user__company")
 
     # Return skipped/missing invoice numbers for UI dropdown
     def get_available_invoice_numbers(self, obj):
-        return get_missing_invoice_numbers(obj.user, obj.invoice_date)
+        base = get_invoice_prefix(obj.invoice_date)
+        return missing_invoice_numbers(base, self._used_invoice_numbers(obj, base))
 
     # Return automatically generated next invoice number
     def get_next_invoice_number(self, obj):
-        return get_next_invoice_number(obj.user, obj.invoice_date)
+        base = get_invoice_prefix(obj.invoice_date)
+        return next_invoice_number(base, self._used_invoice_numbers(obj, base))
+
+    def _used_invoice_numbers(self, obj, base):
+        """
+        Used numbers for the invoice's (user, prefix). When serializing a list,
+        every invoice on the page is loaded with one query on first use.
+        """
+        cache = self.context.setdefault("used_invoice_numbers", {})
+        key = (obj.user_id, base)
+        if key not in cache:
+            instances = [obj]
+            if isinstance(self.parent, serializers.ListSerializer) and self.parent.instance is not None:
+                instances = self.parent.instance
+            pairs = {(i.user_id, get_invoice_prefix(i.invoice_date)) for i in instances}
+            pairs.add(key)
+            cache.update(get_used_invoice_numbers(pairs - cache.keys()))
+        return cache[key]
 
     def get_gst_summary(self, obj):
-        """Calculate GST summary from all items."""
-        from decimal import Decimal
-        subtotal = Decimal('0')
-        total_gst = Decimal('0')
-
-        for item in obj.items.all():
-            taxable = (item.quantity * item.rate) - item.discount
-            if taxable < 0:
-                taxable = Decimal('0')
-            gst_rate = item.gst_percentage or Decimal('0')
-            gst_amt = (taxable * gst_rate) / Decimal('100')
-            subtotal += taxable
-            total_gst += gst_amt
-
-        return {
-            "subtotal": str(subtotal),
-            "total_gst": str(total_gst),
-            "cgst": str(total_gst / 2),
-            "sgst": str(total_gst / 2),
-            "igst": str(total_gst),
-            "grand_total": str(subtotal + total_gst),
-        }
+        """Subtotal and GST of all lines, split into CGST + SGST or IGST by place of supply."""
+        supply_type, place_of_supply = get_invoice_supply(obj)
+        return get_gst_summary(obj.items.all(), supply_type, place_of_supply)
 
     # --------------------------
     # VALIDATION
@@ -123,30 +216,61 @@ class InvoiceSerializer(serializers.ModelSerializer):
 
         return data
 
+    def _lock_items(self, items_data):
+        """
+        Lock the lines' items until the write commits. They were checked
+        against the item catalog, which cannot see a delete that is still
+        committing elsewhere.
+        """
+        ids = {line["item_id"].pk for line in items_data if line.get("item_id")}
+        missing = lock_items(self.context["request"].user, ids)
+        if missing:
+            raise serializers.ValidationError(
+                {"items": [f"Item {pk} no longer exists." for pk in sorted(missing)]}
+            )
+
     # --------------------------
     # CREATE LOGIC
     # --------------------------
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop("items", [])
         validated_data["user"] = self.context["request"].user
         user = self.context["request"].user
         validated_data["user"] = user
+        self._lock_items(items_data)
         invoice = Invoice.objects.create(**validated_data)
         # Create items
+        lines = []
         for item_data in items_data:
             item = InvoiceItem(**item_data)
             item.save()
             invoice.items.add(item)
+            lines.append(item)
 
         invoice.update_total()
-        invoice.refresh_from_db()
+        # invoice_date may still hold timezone.now()'s datetime; reloading only
+        # that keeps the cached user/contact that gst_summary reads
+        invoice.refresh_from_db(fields=["invoice_date"])
+        record_invoice_sales(invoice, lines)
+        record_contact_usage(invoice, lines)
         return invoice
 
     # --------------------------
     # UPDATE LOGIC
     # --------------------------
+    @transaction.atomic
     def update(self, instance, validated_data):
         items_data = validated_data.pop("items", None)
+        if items_data is not None:
+            self._lock_items(items_data)
+        # lines counted in item sales and contact usage before and after,
+        # when either can change
+        recount = items_data is not None or "invoice_date" in validated_data or "contact" in validated_data
+        if recount:
+            old_lines = list(instance.items.all())
+            old_contact_id = instance.contact_id
+            sales = invoice_sales(instance, old_lines, sign=-1)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -155,9 +279,17 @@ class InvoiceSerializer(serializers.ModelSerializer):
 
         if items_data is not None:
             instance.items.clear()
+            new_lines = []
             for item in items_data:
                 item_obj = InvoiceItem.objects.create(**item)
                 instance.items.add(item_obj)
+                new_lines.append(item_obj)
 
         instance.update_total()
+        if recount:
+            lines = new_lines if items_data is not None else old_lines
+            scope = scope_for_instance(instance)
+            apply_sales(scope, sales + invoice_sales(instance, lines))
+            apply_usage(scope, old_contact_id, None, line_usage(old_lines), sign=-1)
+            record_contact_usage(instance, lines)
         return instance
@@ -1,10 +1,29 @@
 # backend_api/serializers/items.py
 
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models import Items
 
 
-class ItemSerializer(serializers.ModelSerializer):
+def _max_amount(field_name):
+    field = Items._meta.get_field(field_name)
+    return 10 ** (field.max_digits - field.decimal_places)
+
+
+def item_price_errors(rate, discount):
+    """{field: message} for an item's rate and discount; empty when they are valid."""
+    if rate < 0:
+        return {"rate": "Rate cannot be negative."}
+    if rate >= _max_amount("rate"):
+        return {"rate": "Rate is too large."}
+    if discount < 0:
+        return {"discount": "Discount cannot be negative."}
+    if discount > rate:
+        return {"discount": "Discount cannot be greater than rate."}
+    return {}
+
+
+class ItemSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Items
         fields = "__all__"
@@ -41,13 +60,13 @@ class ItemSerializer(serializers.ModelSerializer):
     # OBJECT-LEVEL VALIDATION
     # -----------------------------
     def validate(self, attrs):
-        rate = attrs.get("rate", 0)
-        discount = attrs.get("discount", 0)
+        # a partial update is checked against the item's other stored value
+        rate = attrs.get("rate", getattr(self.instance, "rate", 0))
+        discount = attrs.get("discount", getattr(self.instance, "discount", 0))
 
-        if discount and discount > rate:
-            raise serializers.ValidationError(
-                {"discount": "Discount cannot be greater than rate."}
-            )
+        errors = item_price_errors(rate, discount)
+        if errors:
+            raise serializers.ValidationError(errors)
 
         return attrs
 
@@ -58,3 +77,61 @@ class ItemSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
         validated_data["user"] = user
         return super().create(validated_data)
+
+
+# -----------------------------
+# BULK UPDATE
+# -----------------------------
+class ItemChangeSerializer(serializers.Serializer):
+    """One item's new values in a bulk update; rate/discount rules are ItemSerializer's."""
+
+    id = serializers.IntegerField()
+    rate = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    discount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    tax_category = serializers.ChoiceField(choices=Items.TAX_CATEGORY_CHOICES, required=False)
+
+    validate_rate = ItemSerializer.validate_rate
+    validate_discount = ItemSerializer.validate_discount
+
+
+class ItemFilterSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    type = serializers.ChoiceField(choices=Items.ITEM_TYPE_CHOICES, required=False)
+    tax_category = serializers.ChoiceField(choices=Items.TAX_CATEGORY_CHOICES, required=False)
+    search = serializers.CharField(required=False)
+
+
+class ItemBulkUpdateSerializer(serializers.Serializer):
+    """
+    Either "items": [{"id", "rate"?, "discount"?, "tax_category"?}, ...], or
+    "filter" with a "percent" rate change and/or a new "tax_category" for
+    every matching item. An empty or missing filter matches every item and
+    needs "all": true. The view checks each item's resulting rate and
+    discount with item_price_errors().
+    """
+
+    items = ItemChangeSerializer(many=True, required=False, allow_empty=False, max_length=5000)
+    filter = ItemFilterSerializer(required=False)
+    percent = serializers.DecimalField(
+        max_digits=7, decimal_places=2, required=False, min_value=-100, max_value=1000
+    )
+    tax_category = serializers.ChoiceField(choices=Items.TAX_CATEGORY_CHOICES, required=False)
+    all = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if "items" in attrs:
+            if {"filter", "percent", "tax_category"} & set(attrs) or attrs["all"]:
+                raise serializers.ValidationError("Send either items, or filter with percent / tax_category.")
+            ids = [change["id"] for change in attrs["items"]]
+            if len(set(ids)) != len(ids):
+                raise serializers.ValidationError({"items": "Each item may appear only once."})
+            return attrs
+
+        if not attrs.get("filter") and not attrs["all"]:
+            raise serializers.ValidationError(
+                {"filter": 'Send a filter, or "all": true to change every item.'}
+            )
+        attrs.setdefault("filter", {})
+        if "percent" not in attrs and "tax_category" not in attrs:
+            raise serializers.ValidationError({"percent": "Send percent and/or tax_category with a filter."})
+        return attrs
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models.role import Role
 
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = ['id', 'name', 'permissions', 'created_at']
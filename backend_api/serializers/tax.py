@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models.tax import Tax
 
-class TaxSerializer(serializers.ModelSerializer):
+class TaxSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Tax
         fields = ['id', 'name', 'rate', 'description', 'is_active', 'created_at']
@@ -1,23 +1,25 @@
 # backend_api/serializers/user.py
 from rest_framework import serializers
+from backend_api.utils.request_metrics import TimedSerializerMixin
 from backend_api.models import User, Company
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Company
         fields = ['id', 'name', 'address', 'phone', 'email', 'gstin', 'pan', 'website', 'created_at']
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     company = CompanySerializer(read_only=True)
     custom_role_name = serializers.CharField(source='custom_role.name', read_only=True)
     profile_image_url = serializers.SerializerMethodField()
+    profile_image_urls = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = [
             'id', 'email', 'first_name', 'last_name', 'role', 
             'custom_role', 'custom_role_name', 'permissions', 
-            'is_active', 'company', 'profile_image', 'profile_image_url'
+            'is_active', 'company', 'profile_image', 'profile_image_url', 'profile_image_urls'
         ]
 
     def get_profile_image_url(self, obj):
@@ -28,6 +30,20 @@ class UserSerializer(serializers.ModelSerializer):
             return obj.profile_image.url
         return None
 
+    def get_profile_image_urls(self, obj):
+        """Per-size thumbnails: {"sm": {"webp": url, "jpeg": url}, ...}; empty until processed."""
+        if not obj.profile_image:
+            return {}
+        request = self.context.get('request')
+        storage = obj.profile_image.storage
+        urls = {}
+        for size, formats in (obj.profile_image_variants or {}).items():
+            urls[size] = {}
+            for image_format, path in formats.items():
+                url = storage.url(path)
+                urls[size][image_format] = request.build_absolute_uri(url) if request else url
+        return urls
+
 class CreateUserSerializer(serializers.Serializer):
     email = serializers.EmailField(required=True)
     first_name = serializers.CharField(max_length=50)
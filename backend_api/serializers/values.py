@@ -0,0 +1,340 @@
+# backend_api/serializers/values.py
+import datetime
+import decimal
+import inspect
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.sql.compiler import SQLCompiler
+from django.db.models.sql.constants import GET_ITERATOR_CHUNK_SIZE, MULTI
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from backend_api.utils.request_metrics import TimedSerializerMixin
+
+# to_representation() implementations whose output we know how to reproduce
+_STANDARD_TO_REPRESENTATION = {
+    serializers.Serializer.to_representation,
+    TimedSerializerMixin.to_representation,
+}
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+# iter_chunks() drives the SQL compiler directly. These are the private
+# signatures it was written against; on a Django whose compiler differs,
+# check_compiler() turns the fast path off (DRF serializes instead).
+_COMPILER_SIGNATURES = {
+    "execute_sql": ["self", "result_type", "chunked_fetch", "chunk_size"],
+    "get_converters": ["self", "expressions"],
+}
+
+
+def check_compiler():
+    """Raise UnsupportedField when SQLCompiler no longer has the internals iter_chunks() uses."""
+    for name, parameters in _COMPILER_SIGNATURES.items():
+        method = getattr(SQLCompiler, name, None)
+        if method is None or list(inspect.signature(method).parameters) != parameters:
+            raise UnsupportedField(f"SQLCompiler.{name}")
+
+
+# -----------------------------
+# PRECOMPILED FIELD CONVERTERS
+# Each returns exactly what the DRF field's to_representation() would,
+# for the raw value `.values_list()` gives back. None means "use as-is".
+# A converter that depends on request state (the active timezone) is
+# returned as a factory and bound once per serialize() call.
+# -----------------------------
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+
+    exponent = decimal.Decimal(1).scaleb(-field.decimal_places)
+    fallback = field.to_representation
+
+    def convert(value):
+        if isinstance(value, decimal.Decimal):
+            return format(value.quantize(exponent), "f")
+        return fallback(value)
+
+    convert.exponent = exponent
+    return convert
+
+
+def _choice_converter(field):
+    if all(isinstance(key, str) for key in field.choice_strings_to_values):
+        return None
+    return field.to_representation
+
+
+def _uuid_converter(field):
+    if field.uuid_format != "hex_verbose":
+        return field.to_representation
+    return str
+
+
+def _date_converter(field):
+    output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != "iso-8601":
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != "iso-8601" or not settings.USE_TZ:
+        return field.to_representation
+
+    fallback = field.to_representation
+
+    def factory():
+        field_timezone = field.timezone if hasattr(field, "timezone") else timezone.get_current_timezone()
+        is_utc = field_timezone is datetime.timezone.utc or getattr(field_timezone, "key", None) == "UTC"
+        zero = datetime.timedelta(0)
+
+        def convert(value):
+            if value.tzinfo is None:
+                return fallback(value)
+            if not (is_utc and value.utcoffset() == zero):
+                value = value.astimezone(field_timezone)
+            value = value.isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+
+        if is_utc:
+            convert.from_naive_utc = lambda value: value.isoformat() + "Z"
+        return convert
+
+    factory.bind_per_call = True
+    return factory
+
+
+def _converter_for(field):
+    if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+        raise UnsupportedField(field.field_name)
+    if isinstance(field, (serializers.FileField, serializers.ManyRelatedField)):
+        raise UnsupportedField(field.field_name)
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            raise UnsupportedField(field.field_name)
+        return None
+    if isinstance(field, serializers.RelatedField):
+        raise UnsupportedField(field.field_name)
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.ChoiceField):
+        return _choice_converter(field)
+    if isinstance(field, serializers.UUIDField):
+        return _uuid_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field)
+    if isinstance(field, (serializers.CharField, serializers.BooleanField, serializers.IntegerField,
+                          serializers.JSONField, serializers.ReadOnlyField)):
+        return None
+    raise UnsupportedField(field.field_name)
+
+
+def _lookup_for(field, model):
+    """`.values()` lookup for a field's source, following forward FKs only."""
+    if field.source == "*":
+        raise UnsupportedField(field.field_name)
+
+    parts = []
+    current = model
+    for index, attr in enumerate(field.source_attrs):
+        try:
+            model_field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise UnsupportedField(field.field_name)
+        if model_field.many_to_many or model_field.one_to_many:
+            raise UnsupportedField(field.field_name)
+        parts.append(attr)
+        if model_field.is_relation and index < len(field.source_attrs) - 1:
+            current = model_field.related_model
+    return "__".join(parts)
+
+
+class ValuesSerializer:
+    """
+    Read-only, list-only twin of a ModelSerializer that builds rows straight
+    from `.values_list()` tuples. Output is identical to the original
+    serializer's `.data`, without instantiating fields per row.
+    Build with get_values_serializer(); it returns None for serializers that
+    have nested / method / file fields.
+    """
+
+    def __init__(self, serializer_class):
+        if serializer_class.to_representation not in _STANDARD_TO_REPRESENTATION:
+            raise UnsupportedField("to_representation")
+        check_compiler()
+
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+        self.serializer_name = serializer_class.__name__
+
+        self.names = []
+        self.lookups = []
+        self.converters = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.names.append(name)
+            self.lookups.append(_lookup_for(field, model))
+            self.converters.append(_converter_for(field))
+
+    def get_row_converter(self, backend_converters, connection):
+        """
+        Function turning one raw cursor row into an output dict. Each column's
+        database converters (from the SQL compiler) and output converter are
+        inlined as nested calls in one generated dict literal: no per-field
+        loop or wrapper function at runtime.
+        """
+        namespace = {"connection": connection}
+        items = []
+        for index, (name, converter) in enumerate(zip(self.names, self.converters)):
+            if getattr(converter, "bind_per_call", False):
+                converter = converter()
+            db_converters, expression = backend_converters.get(index, ((), None))
+            value = f"row[{index}]"
+
+            if _already_quantized(converter, db_converters, expression, connection):
+                converter = _format_fixed
+            fused = _fuse(converter, db_converters, expression, connection)
+            if fused is not None:
+                namespace[f"convert_{index}"] = fused
+                value = f"convert_{index}({value})"
+            else:
+                namespace[f"expression_{index}"] = expression
+                for position, db_converter in enumerate(db_converters):
+                    namespace[f"db_{index}_{position}"] = db_converter
+                    value = f"db_{index}_{position}({value}, expression_{index}, connection)"
+                if converter is not None:
+                    namespace[f"convert_{index}"] = converter
+                    if db_converters:
+                        # a database converter may itself turn a value into None
+                        value = f"(None if (value_{index} := {value}) is None else convert_{index}(value_{index}))"
+                    else:
+                        value = f"convert_{index}({value})"
+
+            if value == f"row[{index}]":
+                items.append(f"{name!r}: row[{index}]")
+            else:
+                items.append(f"{name!r}: None if row[{index}] is None else {value}")
+
+        source = "def to_representation(row):\n    return {" + ", ".join(items) + "}\n"
+        exec(compile(source, f"<values serializer {self.serializer_name}>", "exec"), namespace)
+        return namespace["to_representation"]
+
+    def iter_rows(self, queryset, chunk_size=None):
+        """
+        Yield output dicts. With `chunk_size` the rows are fetched in chunks
+        from a server-side cursor where the database supports it.
+        """
+        for chunk in self.iter_chunks(queryset, chunk_size):
+            yield from chunk
+
+    def iter_chunks(self, queryset, chunk_size=None):
+        """Yield lists of output dicts, one per fetched cursor chunk."""
+        queryset = queryset.values_list(*self.lookups)
+        compiler = queryset.query.get_compiler(using=queryset.db)
+        results = compiler.execute_sql(
+            MULTI,
+            chunked_fetch=chunk_size is not None,
+            chunk_size=chunk_size or GET_ITERATOR_CHUNK_SIZE,
+        )
+
+        to_representation = None
+        for chunk in results:
+            if to_representation is None:
+                columns = [column for column, _, _ in compiler.select[: compiler.col_count]]
+                to_representation = self.get_row_converter(
+                    compiler.get_converters(columns), compiler.connection
+                )
+            yield [to_representation(row) for row in chunk]
+
+    def serialize(self, queryset):
+        return list(self.iter_rows(queryset))
+
+
+def _format_fixed(value):
+    return format(value, "f")
+
+
+def _already_quantized(converter, db_converters, expression, connection):
+    """
+    Whether a decimal column's database converters (SQLite's) already
+    quantize to the places the output needs, so the output can skip its own
+    quantize(). Probed once per query with a value that needs rounding.
+    """
+    exponent = getattr(converter, "exponent", None)
+    if exponent is None or not db_converters:
+        return False
+    value = 0.125
+    try:
+        for db_converter in db_converters:
+            value = db_converter(value, expression, connection)
+    except Exception:
+        return False
+    return (
+        isinstance(value, decimal.Decimal)
+        and value.as_tuple().exponent == exponent.as_tuple().exponent
+    )
+
+
+def _fuse(converter, db_converters, expression, connection):
+    """
+    A single function replacing a column's database converters and output
+    converter where a shortcut applies, else None (the generic inline path).
+    """
+    if not db_converters:
+        return None
+
+    internal_type = expression.output_field.get_internal_type()
+    if converter is None and internal_type == "UUIDField":
+        # The UUID only gets rendered as its hyphenated string; build that
+        # directly from the 32-char hex SQLite stores instead of a UUID object.
+        def convert_uuid(value):
+            if isinstance(value, str) and len(value) == 32:
+                return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+            for db_converter in db_converters:
+                value = db_converter(value, expression, connection)
+            return value
+
+        return convert_uuid
+
+    fast = getattr(converter, "from_naive_utc", None)
+    if fast is not None and internal_type == "DateTimeField" and (
+        connection.timezone_name == "UTC"
+    ):
+        # Backends without native timezone support (SQLite, MySQL) hand back
+        # naive UTC datetimes; skip make_aware() + astimezone() for those.
+        def convert_datetime(value):
+            if isinstance(value, datetime.datetime) and value.tzinfo is None:
+                return fast(value)
+            for db_converter in db_converters:
+                value = db_converter(value, expression, connection)
+            return converter(value)
+
+        return convert_datetime
+
+    return None
+
+
+_values_serializers = {}
+
+
+def get_values_serializer(serializer_class):
+    """Cached ValuesSerializer for `serializer_class`, or None if it can't be expressed with values()."""
+    if serializer_class not in _values_serializers:
+        try:
+            _values_serializers[serializer_class] = ValuesSerializer(serializer_class)
+        except UnsupportedField:
+            _values_serializers[serializer_class] = None
+    return _values_serializers[serializer_class]
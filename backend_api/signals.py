@@ -0,0 +1,133 @@
+# backend_api/signals.py
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from backend_api.models import (
+    Account,
+    ChangeLog,
+    Company,
+    Contact,
+    Expense,
+    Income,
+    Invoice,
+    Items,
+    Role,
+    Tax,
+    User,
+)
+from backend_api.utils.contact_items import remove_invoices_usage
+from backend_api.utils.item_catalog import invalidate_instance
+from backend_api.utils.item_sales import remove_invoices_sales
+from backend_api.utils.response_cache import SCOPE_LABEL, bump_instance_versions, remember_user_scope
+from backend_api.utils.sync import SYNC_KEYS, flush_deletes, queue_delete, record_change
+from backend_api.utils.tax_rates import invalidate_tax_rates
+
+# Models whose writes invalidate cached read responses of their tenant.
+# Invoice lines are always written together with an Invoice.save(); there is
+# deliberately no m2m_changed receiver, which would disable Django's fast
+# path for invoice.items.add().
+VERSIONED_MODELS = (User, Role, Tax, Contact, Items, Invoice, Account, Income, Expense)
+
+
+# -----------------------------
+# RESPONSE CACHE VERSIONS
+# -----------------------------
+def bump_model_version(sender, instance, **kwargs):
+    bump_instance_versions(instance, sender)
+
+
+def bump_scope_version(sender, instance, **kwargs):
+    """
+    A company changing (or a company id being reused) drops its whole scope,
+    and the detail ETags of views that show company fields.
+    """
+    bump_instance_versions(instance, SCOPE_LABEL, sender)
+
+
+def update_user_scope(sender, instance, created=False, **kwargs):
+    remember_user_scope(instance)
+    if created and not instance.company_id:
+        bump_instance_versions(instance)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model, dispatch_uid=f"version-save-{model.__name__}")
+    post_delete.connect(bump_model_version, sender=model, dispatch_uid=f"version-delete-{model.__name__}")
+
+post_save.connect(bump_scope_version, sender=Company, dispatch_uid="version-save-Company")
+post_delete.connect(bump_scope_version, sender=Company, dispatch_uid="version-delete-Company")
+post_save.connect(update_user_scope, sender=User, dispatch_uid="version-user-scope")
+
+
+# -----------------------------
+# SYNC CHANGE LOG
+# -----------------------------
+def log_upsert(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_change(instance, ChangeLog.UPSERT)
+
+
+def queue_tombstone(sender, instance, **kwargs):
+    queue_delete(instance)
+
+
+def write_tombstones(sender, instance, **kwargs):
+    flush_deletes()
+
+
+for model in SYNC_KEYS:
+    post_save.connect(log_upsert, sender=model, dispatch_uid=f"sync-save-{model.__name__}")
+    pre_delete.connect(queue_tombstone, sender=model, dispatch_uid=f"sync-pre-delete-{model.__name__}")
+    post_delete.connect(write_tombstones, sender=model, dispatch_uid=f"sync-delete-{model.__name__}")
+
+
+# -----------------------------
+# TAX RATE TABLES
+# -----------------------------
+def reload_tax_rates(sender, instance, **kwargs):
+    invalidate_tax_rates(instance.company_id)
+
+
+post_save.connect(reload_tax_rates, sender=Tax, dispatch_uid="tax-rates-save")
+post_delete.connect(reload_tax_rates, sender=Tax, dispatch_uid="tax-rates-delete")
+
+
+# -----------------------------
+# ITEM CATALOG
+# -----------------------------
+def reload_item_catalog(sender, instance, **kwargs):
+    invalidate_instance(instance)
+
+
+post_save.connect(reload_item_catalog, sender=Items, dispatch_uid="item-catalog-save")
+post_delete.connect(reload_item_catalog, sender=Items, dispatch_uid="item-catalog-delete")
+
+
+# -----------------------------
+# ITEM SALES / CONTACT ITEM USAGE
+# -----------------------------
+# The serializer counts lines as they are written. On delete, only the
+# instance the delete started from subtracts the invoices going with it, in
+# one batch; the receivers of the cascaded rows do nothing.
+def remove_invoice_sales(sender, instance, origin=None, **kwargs):
+    if origin is instance:
+        invoices = Invoice.objects.filter(pk=instance.pk)
+        remove_invoices_sales(invoices)
+        remove_invoices_usage(invoices)
+
+
+def remove_contact_sales(sender, instance, origin=None, **kwargs):
+    # the contact's usage rows are deleted with it
+    if origin is instance:
+        remove_invoices_sales(Invoice.objects.filter(contact=instance))
+
+
+def remove_user_sales(sender, instance, origin=None, **kwargs):
+    if origin is instance:
+        invoices = Invoice.objects.filter(user=instance)
+        remove_invoices_sales(invoices)
+        remove_invoices_usage(invoices)
+
+
+pre_delete.connect(remove_invoice_sales, sender=Invoice, dispatch_uid="item-sales-delete-Invoice")
+pre_delete.connect(remove_contact_sales, sender=Contact, dispatch_uid="item-sales-delete-Contact")
+pre_delete.connect(remove_user_sales, sender=User, dispatch_uid="item-sales-delete-User")
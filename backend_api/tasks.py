@@ -0,0 +1,55 @@
+# backend_api/tasks.py
+"""
+Background job tasks, queued with backend_api.utils.jobs.enqueue() and run
+by `manage.py run_workers`. Payloads are stored in the Job table, so pass
+ids rather than secrets or whole objects.
+"""
+import random
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from backend_api.models import User
+from backend_api.utils import images
+
+
+def send_staff_invite(user_id):
+    """Give a newly added staff user a temporary password and email it to them."""
+    user = User.objects.select_related("company").get(pk=user_id)
+    temp_password = str(random.randint(10000000, 99999999))
+    user.set_password(temp_password)
+    user.save(update_fields=["password"])
+
+    send_mail(
+        "You've been invited to Hisaab",
+        f"Hello {user.first_name},\n\nYou have been invited to join {user.company.name} on Hisaab.\n\nYour login email: {user.email}\nYour temporary password: {temp_password}\n\nPlease log in and change your password.",
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+        fail_silently=False,
+    )
+    return {"email": user.email}
+
+
+def process_profile_image(user_id, image_name):
+    """Strip EXIF, fix orientation and write the size variants of an uploaded profile image."""
+    user = User.objects.get(pk=user_id)
+    if user.profile_image.name != image_name:
+        # replaced or removed since; a newer upload has its own job
+        return {"skipped": True}
+
+    storage = user.profile_image.storage
+    old_variants = user.profile_image_variants
+    original_name, variants = images.process_profile_image(user, storage)
+    updated = User.objects.filter(pk=user.pk, profile_image=image_name).update(
+        profile_image=user.profile_image.name, profile_image_variants=variants
+    )
+    if not updated:
+        # the original belongs to whatever replaced it; only drop our copies
+        storage.delete(user.profile_image.name)
+        images.delete_variants(storage, variants)
+        return {"skipped": True}
+
+    # only now that the row points at the copy, so a retry never finds the file gone
+    storage.delete(original_name)
+    images.delete_variants(storage, old_variants)
+    return {"image": user.profile_image.name, "variants": variants}
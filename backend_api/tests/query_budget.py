@@ -0,0 +1,256 @@
+# backend_api/tests/query_budget.py
+"""
+Query-budget harness for the router-registered viewsets in urls/user_urls.py.
+
+Every action is called against one tenant seeded at two sizes. A correct
+endpoint runs the same number of queries at both sizes (no per-row queries),
+and never more than its ceiling in query_budgets.json.
+
+Run with UPDATE_QUERY_BUDGETS=1 to rewrite the budget file from the current counts.
+"""
+import difflib
+import json
+import os
+import re
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend_api.models import Account, Company, Contact, Invoice, Items, Role, Tax, User
+from backend_api.urls.user_urls import router
+
+BUDGET_FILE = Path(__file__).with_name("query_budgets.json")
+SMALL_SIZE = 2
+LARGE_SIZE = 6
+
+# (HTTP method, detail route?) for the standard ModelViewSet actions
+STANDARD_ACTIONS = {
+    "list": ("get", False),
+    "create": ("post", False),
+    "retrieve": ("get", True),
+    "update": ("put", True),
+    "partial_update": ("patch", True),
+    "destroy": ("delete", True),
+}
+
+# Request bodies / query params per basename and action. Values may be callables
+# taking the TenantFixture, for payloads that reference fixture rows.
+REQUEST_SPECS = {
+    "contact": {
+        "create": {"data": {"name": "Budget Contact", "mobile": "+919800000001"}},
+        "update": {"data": {"name": "Budget Contact", "mobile": "+919800000002"}},
+        "partial_update": {"data": {"notes": "patched"}},
+        "fill_locations": {
+            "data": lambda f: {
+                "contacts": [{"id": f.objects["contact"].pk, "lat": 18.5204, "lon": 73.8567}],
+                "overwrite": True,
+            }
+        },
+        "suggested_items": {"params": {"limit": 5}},
+    },
+    "items": {
+        "create": {"data": {"name": "Budget Item", "rate": 100}},
+        "update": {"data": {"name": "Budget Item", "rate": 120}},
+        "partial_update": {"data": {"rate": 130}},
+        "analytics": {"params": {"date_from": "2024-01-01", "order_by": "quantity"}},
+        "bulk_update": {"data": {"filter": {"type": "product"}, "percent": "5"}},
+    },
+    "invoice": {
+        "create": {
+            "data": lambda f: {
+                "contact": f.objects["invoice_contact"].pk,
+                "items": [
+                    {"description": "Line A", "quantity": 2, "rate": 100},
+                    {"description": "Line B", "quantity": 1, "rate": 50},
+                    {"item_id": f.objects["items"].pk, "quantity": 3},
+                ],
+            }
+        },
+        "update": {
+            "data": lambda f: {
+                "contact": f.objects["invoice_contact"].pk,
+                "items": [{"description": "Line A", "quantity": 3, "rate": 100}],
+            }
+        },
+        "partial_update": {"data": {"notes": "patched"}},
+        "invoice_number": {"params": {"date": "2025-01-15"}},
+        "gst_report": {"params": {"date_from": "2024-01-01"}},
+    },
+    "user": {
+        "create": {"data": {"email": "budget.staff@example.com", "first_name": "Budget", "last_name": "Staff"}},
+        "update": {"data": {"email": "staff0@example.com", "first_name": "Budget", "last_name": "Staff"}},
+        "partial_update": {"data": {"email": "staff0@example.com", "first_name": "Budget", "last_name": "Staff"}},
+    },
+    "role": {
+        "create": {"data": {"name": "Budget Role", "permissions": {"items": True}}},
+        "update": {"data": {"name": "Budget Role 2"}},
+        "partial_update": {"data": {"permissions": {"all": True}}},
+    },
+    "tax": {
+        "create": {"data": {"name": "Budget GST", "rate": "18.00"}},
+        "update": {"data": {"rate": "12.00"}},
+        "partial_update": {"data": {"is_active": False}},
+    },
+    "account": {
+        "create": {"data": {"name": "Budget Account", "initial_balance": "10.00"}},
+        "update": {"data": {"name": "Budget Account 2"}},
+        "partial_update": {"data": {"initial_balance": "20.00"}},
+    },
+    "income": {
+        "create": {"data": lambda f: {"account": f.objects["account"].pk, "category": "Sales", "amount": "10.00", "date": "2025-01-15"}},
+        "update": {"data": lambda f: {"account": f.objects["account"].pk, "category": "Sales", "amount": "20.00"}},
+        "partial_update": {"data": {"amount": "30.00"}},
+    },
+    "expense": {
+        "create": {"data": lambda f: {"account": f.objects["account"].pk, "category": "Rent", "amount": "10.00", "date": "2025-01-15"}},
+        "update": {"data": lambda f: {"account": f.objects["account"].pk, "category": "Rent", "amount": "20.00"}},
+        "partial_update": {"data": {"amount": "30.00"}},
+    },
+}
+
+
+class TenantFixture:
+    """One company with `size` rows of every model the viewsets expose."""
+
+    def __init__(self, size):
+        self.size = size
+        self.objects = {}
+
+    def build(self):
+        call_command(
+            "seed_bench_data",
+            companies=1,
+            contacts=self.size,
+            items=self.size,
+            invoices=self.size,
+            lines=2,
+            accounts=self.size,
+            transactions=self.size * 2,
+            seed=self.size,
+            stdout=StringIO(),
+        )
+        company = Company.objects.filter(name__startswith="Bench Company").latest("created_at")
+        self.admin = User.objects.get(company=company, role="COMPANY_ADMIN")
+
+        roles = [Role.objects.create(company=company, name=f"Role {n}") for n in range(self.size)]
+        for n in range(self.size):
+            Tax.objects.create(company=company, name=f"Tax {n}", rate=5 + n)
+            User.objects.create(
+                email=f"staff{n}@example.com",
+                company=company,
+                role="STAFF",
+                custom_role=roles[n],
+                is_active=True,
+            )
+
+        # Targets for detail routes (basename -> instance)
+        invoice = Invoice.objects.filter(user=self.admin).order_by("pk").first()
+        self.objects = {
+            "contact": Contact.objects.filter(user=self.admin).order_by("pk").first(),
+            "items": Items.objects.filter(user=self.admin).order_by("pk").first(),
+            "invoice": invoice,
+            "invoice_contact": invoice.contact,
+            "user": User.objects.filter(company=company, role="STAFF").order_by("email").first(),
+            "role": roles[0],
+            "tax": Tax.objects.filter(company=company).order_by("name").first(),
+            "account": Account.objects.filter(user=self.admin).order_by("pk").first(),
+            "income": self.admin.incomes.order_by("pk").first(),
+            "expense": self.admin.expenses.order_by("pk").first(),
+        }
+        return self
+
+
+def iter_viewset_actions():
+    """Yield (key, basename, action, method, detail, url_name) for every routed action."""
+    for _prefix, viewset, basename in router.registry:
+        for action, (method, detail) in STANDARD_ACTIONS.items():
+            if hasattr(viewset, action):
+                url_name = f"{basename}-{'detail' if detail else 'list'}"
+                yield f"{basename}.{action}", basename, action, method, detail, url_name
+        for extra in viewset.get_extra_actions():
+            for method in extra.mapping:
+                key = f"{basename}.{extra.__name__}"
+                if len(extra.mapping) > 1:
+                    key = f"{key}.{method}"
+                yield key, basename, extra.__name__, method, extra.detail, f"{basename}-{extra.url_name}"
+
+
+def normalize_sql(sql):
+    """Strip literal values so the same query with different ids compares equal."""
+    sql = re.sub(r"'[^']*'", "?", sql)
+    sql = re.sub(r"\b\d+(\.\d+)?\b", "?", sql)
+    # prefetch_related IN lists grow with the page size; that's expected
+    return re.sub(r"IN \((\?, )*\?\)", "IN (...)", sql)
+
+
+def measure_endpoints(size):
+    """
+    Seed a tenant at `size`, call every action once and return
+    {endpoint_key: [normalized sql, ...]}. Everything is rolled back afterwards.
+    The response cache is off so every call measures the database path.
+    """
+    results = {}
+    with override_settings(RESPONSE_CACHE={"ENABLED": False}), transaction.atomic():
+        fixture = TenantFixture(size).build()
+        client = APIClient()
+        client.force_authenticate(user=fixture.admin)
+
+        for key, basename, action, method, detail, url_name in iter_viewset_actions():
+            spec = REQUEST_SPECS.get(basename, {}).get(action, {})
+            if action not in STANDARD_ACTIONS and not spec:
+                raise AssertionError(
+                    f"No request spec for {basename}.{action}; add one to REQUEST_SPECS in {__name__}."
+                )
+
+            data = spec.get("data")
+            if callable(data):
+                data = data(fixture)
+            kwargs = {"pk": fixture.objects[basename].pk} if detail else {}
+            path = reverse(url_name, kwargs=kwargs)
+
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    if method == "get":
+                        response = client.get(path, spec.get("params"))
+                    else:
+                        response = getattr(client, method)(path, data, format="json")
+                transaction.set_rollback(True)
+
+            if response.status_code >= 400:
+                raise AssertionError(
+                    f"{method.upper()} {path} ({basename}.{action}) returned {response.status_code}: {response.content[:500]!r}"
+                )
+            results[key] = [
+                normalize_sql(query["sql"]) for query in captured.captured_queries
+            ]
+        transaction.set_rollback(True)
+    return results
+
+
+def query_diff(before, after):
+    return "\n".join(difflib.unified_diff(before, after, "small", "large", lineterm="", n=1))
+
+
+def load_budgets():
+    with open(BUDGET_FILE, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_budgets(counts, budgets):
+    updated = {}
+    for key, count in sorted(counts.items()):
+        entry = dict(budgets.get(key, {}))
+        entry["max_queries"] = count
+        updated[key] = entry
+    with open(BUDGET_FILE, "w", encoding="utf-8") as fh:
+        json.dump(updated, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def should_update_budgets():
+    return os.getenv("UPDATE_QUERY_BUDGETS") == "1"
@@ -0,0 +1,102 @@
+# backend_api/tests/test_batch_api.py
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api.models import Contact, Expense, Invoice, Items, User
+
+
+class BatchAPITestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_bench_data",
+            companies=1, contacts=2, items=2, invoices=1, accounts=1, transactions=2,
+            stdout=StringIO(),
+        )
+        cls.user = User.objects.get(email="bench0@example.com")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def batch(self, operations):
+        return self.client.post("/api/batch/", {"operations": operations}, format="json")
+
+    def test_temporary_ids_link_operations(self):
+        response = self.batch([
+            {
+                "ref": "c1",
+                "method": "POST",
+                "resource": "contacts",
+                "data": {"name": "Offline Contact", "mobile": "+919800000011"},
+            },
+            {"ref": "i1", "method": "POST", "resource": "items", "data": {"name": "Offline Item", "rate": 40}},
+            {"method": "PATCH", "resource": "contacts", "id": "$c1", "data": {"notes": "edited offline"}},
+            {
+                "ref": "inv1",
+                "method": "POST",
+                "resource": "invoices",
+                "data": {"contact": "$c1", "items": [{"item_id": "$i1", "quantity": 3}]},
+            },
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        results = response.data["data"]["results"]
+        self.assertEqual([result["status"] for result in results], [201, 201, 200, 201])
+
+        contact = Contact.objects.get(pk=response.data["data"]["refs"]["c1"])
+        self.assertEqual(contact.notes, "edited offline")
+        invoice = Invoice.objects.get(pk=results[3]["data"]["id"])
+        self.assertEqual(invoice.contact, contact)
+        line = invoice.items.get()
+        self.assertEqual(line.item_id.name, "Offline Item")
+        self.assertEqual(line.description, "Offline Item")
+
+    def test_failure_rolls_back_everything(self):
+        expense = Expense.objects.filter(user=self.user).first()
+        contacts = Contact.objects.count()
+        response = self.batch([
+            {"method": "POST", "resource": "contacts", "data": {"name": "Never Saved", "mobile": "+919800000012"}},
+            {"method": "DELETE", "resource": "expenses", "id": expense.pk},
+            {"method": "POST", "resource": "items", "data": {"name": "Bad", "rate": -1}},
+            {"method": "POST", "resource": "contacts", "data": {"name": "Never Run", "mobile": "+919800000013"}},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        results = response.data["errors"]["results"]
+        self.assertEqual([result["status"] for result in results], [201, 204, 400])
+        self.assertIn("rate", results[2]["errors"])
+
+        self.assertEqual(Contact.objects.count(), contacts)
+        self.assertTrue(Expense.objects.filter(pk=expense.pk).exists())
+
+    def test_operations_keep_module_permissions(self):
+        staff = User.objects.create(
+            email="staff@example.com", company=self.user.company, role="STAFF", permissions={"contacts": True}
+        )
+        self.client.force_authenticate(user=staff)
+        response = self.batch([
+            {"method": "POST", "resource": "contacts", "data": {"name": "Allowed", "mobile": "+919800000014"}},
+            {"method": "PATCH", "resource": "items", "id": Items.objects.first().pk, "data": {"rate": 1}},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"]["results"][1]["status"], status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Contact.objects.filter(name="Allowed").exists())
+
+    def test_other_tenants_records_are_not_found(self):
+        other = User.objects.create_user(email="other@example.com", password="x")
+        contact = Contact.objects.create(user=other, name="Not Yours", mobile="+919800000015")
+        response = self.batch([{"method": "DELETE", "resource": "contacts", "id": contact.pk}])
+        self.assertEqual(response.data["errors"]["results"][0]["status"], status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Contact.objects.filter(pk=contact.pk).exists())
+
+    def test_invalid_operations_are_rejected_up_front(self):
+        for operations in (
+            [],
+            [{"method": "GET", "resource": "contacts"}],
+            [{"method": "POST", "resource": "roles", "data": {}}],
+            [{"method": "PATCH", "resource": "contacts", "data": {}}],
+            [{"ref": "x", "method": "DELETE", "resource": "contacts", "id": 1}],
+        ):
+            with self.subTest(operations=operations):
+                self.assertEqual(self.batch(operations).status_code, status.HTTP_400_BAD_REQUEST)
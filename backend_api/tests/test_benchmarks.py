@@ -0,0 +1,44 @@
+# backend_api/tests/test_benchmarks.py
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from backend_api.models import Contact, Invoice, InvoiceItem, Items, Income, Expense
+from backend_api.utils.benchmark import percentile
+
+
+class SeedBenchDataTestCase(TestCase):
+    def test_seed_creates_linked_rows(self):
+        call_command(
+            "seed_bench_data",
+            companies=1, contacts=5, items=4, invoices=3, lines=2, accounts=2, transactions=4, seed=1,
+            stdout=StringIO(),
+        )
+        self.assertEqual(Contact.objects.count(), 5)
+        self.assertEqual(Items.objects.count(), 4)
+        self.assertEqual(Invoice.objects.count(), 3)
+        self.assertEqual(Income.objects.count() + Expense.objects.count(), 4)
+
+        for invoice in Invoice.objects.all():
+            lines = list(invoice.items.all())
+            self.assertTrue(lines)
+            self.assertEqual(invoice.total_amount, sum(line.total for line in lines))
+        self.assertEqual(InvoiceItem.objects.filter(invoice_items__isnull=True).count(), 0)
+
+    def test_run_benchmarks_reports_json(self):
+        call_command("seed_bench_data", contacts=3, items=2, invoices=2, transactions=2, stdout=StringIO())
+        out = StringIO()
+        call_command("run_benchmarks", iterations=2, warmup=0, only=["items.list"], stdout=out)
+        report = json.loads(out.getvalue())
+        result = report["results"]["items.list"]
+        self.assertEqual(result["status"], 200)
+        self.assertEqual(result["runs"], 2)
+        self.assertIn("p95_ms", result)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile([7], 95), 7)
@@ -0,0 +1,115 @@
+# backend_api/tests/test_conditional_requests.py
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api.models import Contact, Tax, User
+from backend_api.utils import versions
+
+
+class ConditionalRequestTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_bench_data", companies=1, contacts=3, items=2, invoices=2, stdout=StringIO())
+        cls.user = User.objects.get(email="bench0@example.com")
+        cls.contact = Contact.objects.filter(user=cls.user).first()
+        cls.tax = Tax.objects.create(company=cls.user.company, name="GST 5", rate=5)
+
+    def setUp(self):
+        caches["responses"].clear()
+        self.client.force_authenticate(user=self.user)
+
+    def assert_polling_is_free(self, url, queries=0):
+        etag = self.client.get(url)["ETag"]
+        self.assertTrue(etag)
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        return etag
+
+    def test_list_not_modified(self):
+        for url in ("/api/contacts/", "/api/items/", "/api/invoices/"):
+            with self.subTest(url=url):
+                self.assert_polling_is_free(url)
+
+    def test_list_etag_changes_after_write(self):
+        etag = self.client.get("/api/contacts/")["ETag"]
+        Contact.objects.filter(pk=self.contact.pk).first().save()
+        response = self.client.get("/api/contacts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def bump_in_another_worker(self, label):
+        versions.get_cache().incr(f"version:c{self.user.company_id}:{label}")
+
+    def test_etags_follow_writes_in_other_workers(self):
+        etag = self.client.get("/api/contacts/")["ETag"]
+        Contact.objects.filter(pk=self.contact.pk).update(name="Renamed Elsewhere")
+        self.bump_in_another_worker("backend_api.contact")
+        response = self.client.get("/api/contacts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # no updated_at on Tax: If-Match is checked against the shared counters
+        tax_url = f"/api/taxes/{self.tax.pk}/"
+        tax_etag = self.client.get(tax_url)["ETag"]
+        Tax.objects.filter(pk=self.tax.pk).update(rate=7)
+        self.bump_in_another_worker("backend_api.tax")
+        stale = self.client.patch(tax_url, {"rate": "12.00"}, format="json", HTTP_IF_MATCH=tax_etag)
+        self.assertEqual(stale.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_detail_not_modified(self):
+        # one single-column lookup of updated_at, no serialization
+        self.assert_polling_is_free(f"/api/contacts/{self.contact.pk}/", queries=1)
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": False})
+    def test_etags_without_version_counters(self):
+        url = "/api/contacts/"
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # no updated_at on Tax: the ETag comes from the serialized data
+        tax_url = f"/api/taxes/{self.tax.pk}/"
+        tax_etag = self.client.get(tax_url)["ETag"]
+        self.assertEqual(self.client.get(tax_url, HTTP_IF_NONE_MATCH=tax_etag).status_code, 304)
+        update = self.client.patch(tax_url, {"rate": "12.00"}, format="json", HTTP_IF_MATCH=tax_etag)
+        self.assertEqual(update.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(tax_url)["ETag"], update["ETag"])
+
+    def test_if_match_on_update(self):
+        url = f"/api/contacts/{self.contact.pk}/"
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.patch(url, {"notes": "first"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # a second client still holding the old ETag loses
+        stale = self.client.patch(url, {"notes": "second"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(stale.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertFalse(stale.data["success"])
+        self.contact.refresh_from_db()
+        self.assertEqual(self.contact.notes, "first")
+
+        fresh = self.client.patch(url, {"notes": "third"}, format="json", HTTP_IF_MATCH=response["ETag"])
+        self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url)["ETag"], fresh["ETag"])
+
+    def test_if_match_checks_under_a_row_lock(self):
+        url = f"/api/contacts/{self.contact.pk}/"
+        etag = self.client.get(url)["ETag"]
+        original = QuerySet.select_for_update
+        with mock.patch.object(QuerySet, "select_for_update", autospec=True, side_effect=original) as lock:
+            response = self.client.patch(url, {"notes": "locked"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(lock.call_args.args[0].model, Contact)
+        self.assertEqual(lock.call_args.kwargs, {"of": ("self",)})
@@ -0,0 +1,88 @@
+# backend_api/tests/test_contact_items.py
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend_api.models import Company, Contact, ContactItemUsage, Invoice, Items, User
+from backend_api.utils.contact_items import rebuild_contact_items
+
+
+class ContactItemSuggestionsTestCase(APITestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Acme")
+        self.user = User.objects.create(email="usage@example.com", company=company, role="COMPANY_ADMIN")
+        self.client.force_authenticate(user=self.user)
+        self.contact = Contact.objects.create(user=self.user, name="Buyer", mobile="9000000001")
+        self.pen = Items.objects.create(user=self.user, name="Pen", rate=Decimal("10.00"), tax_category="gst-18")
+        self.ink = Items.objects.create(user=self.user, name="Ink", rate=Decimal("99.99"), tax_category="gst-5")
+
+    def create_invoice(self, date, *lines, contact=None):
+        payload = {
+            "contact": (contact or self.contact).pk,
+            "invoice_date": date,
+            "invoice_type": "default",
+            "supply_type": "regular",
+            "items": list(lines),
+        }
+        response = self.client.post(reverse("invoice-list"), payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data["data"]["id"]
+
+    def usage(self, contact=None):
+        return {
+            row.item_id: (row.uses, row.quantity, row.last_used.isoformat(), row.last_rate)
+            for row in ContactItemUsage.objects.filter(contact=contact or self.contact)
+        }
+
+    def suggest(self, **params):
+        response = self.client.get(reverse("contact-suggested-items", kwargs={"pk": self.contact.pk}), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(row["name"], row["rate"]) for row in response.data["data"]]
+
+    def test_usage_follows_invoice_writes(self):
+        self.create_invoice("2025-01-05", {"item_id": self.pen.pk, "quantity": 2, "rate": 9}, {"item_id": self.pen.pk, "quantity": 1})
+        self.create_invoice("2025-03-01", {"item_id": self.pen.pk, "quantity": 4, "rate": 12})
+        # an older invoice adds uses but keeps the latest terms
+        invoice_id = self.create_invoice("2025-02-01", {"item_id": self.pen.pk, "rate": 11}, {"item_id": self.ink.pk})
+        self.assertEqual(
+            self.usage(),
+            {
+                self.pen.pk: (3, 8, "2025-03-01", Decimal("12.00")),
+                self.ink.pk: (1, 1, "2025-02-01", Decimal("99.99")),
+            },
+        )
+
+        other = Contact.objects.create(user=self.user, name="Other", mobile="9000000002")
+        response = self.client.patch(
+            reverse("invoice-detail", kwargs={"pk": invoice_id}), {"contact": other.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(set(self.usage()), {self.pen.pk})
+        self.assertEqual(set(self.usage(other)), {self.pen.pk, self.ink.pk})
+
+        self.client.delete(reverse("invoice-detail", kwargs={"pk": invoice_id}))
+        self.assertEqual(self.usage(other), {})
+
+        incremental = self.usage()
+        self.assertEqual(rebuild_contact_items(Invoice.objects.filter(user=self.user)), 1)
+        self.assertEqual(self.usage(), incremental)
+
+    def test_suggestions(self):
+        self.create_invoice("2025-01-05", {"item_id": self.pen.pk, "rate": 9})
+        self.create_invoice("2025-01-06", {"item_id": self.pen.pk, "rate": 8})
+        self.create_invoice("2025-02-01", {"item_id": self.ink.pk, "rate": 95})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.suggest(), [("Pen", "8.00"), ("Ink", "95.00")])
+        self.assertEqual(self.suggest(order_by="recent", limit=1), [("Ink", "95.00")])
+
+        url = reverse("contact-suggested-items", kwargs={"pk": self.contact.pk})
+        for params in ({"order_by": "cheapest"}, {"limit": 100}, {"limit": "x"}):
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+
+    def test_other_tenant_contact_has_no_suggestions(self):
+        self.create_invoice("2025-01-05", {"item_id": self.pen.pk})
+        stranger = User.objects.create(email="x@example.com", company=Company.objects.create(name="Other"))
+        self.client.force_authenticate(user=stranger)
+        self.assertEqual(self.suggest(), [])
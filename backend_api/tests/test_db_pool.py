@@ -0,0 +1,53 @@
+# backend_api/tests/test_db_pool.py
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api.models import User
+from backend_api.utils import db_pool
+
+
+class PoolStatsTestCase(TestCase):
+    def test_unpooled_database(self):
+        self.assertEqual(db_pool.get_pool_stats(), {"alias": "default", "pooled": False})
+
+    def test_pooled_stats_are_summarized(self):
+        pool = SimpleNamespace(
+            min_size=2,
+            max_size=10,
+            get_stats=lambda: {
+                "pool_size": 6,
+                "pool_available": 2,
+                "requests_waiting": 3,
+                "requests_num": 40,
+                "requests_wait_ms": 100,
+            },
+        )
+        with mock.patch.object(db_pool, "is_pooled", return_value=True), \
+                mock.patch.object(db_pool, "connections", {"default": SimpleNamespace(pool=pool)}):
+            stats = db_pool.get_pool_stats()
+        self.assertEqual(stats["in_use"], 4)
+        self.assertEqual(stats["waiting"], 3)
+        self.assertEqual(stats["avg_wait_ms"], 2.5)
+        self.assertEqual(stats["timeouts"], 0)
+
+    def test_benchmark_needs_postgres(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_db_pool", threads=1, requests=1)
+
+
+class PoolStatsAPITestCase(APITestCase):
+    def test_staff_only(self):
+        user = User.objects.create(email="user@example.com")
+        self.client.force_authenticate(user=user)
+        self.assertEqual(self.client.get("/api/metrics/db-pool/").status_code, status.HTTP_403_FORBIDDEN)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get("/api/metrics/db-pool/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], [{"alias": "default", "pooled": False}])
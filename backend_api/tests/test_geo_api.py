@@ -0,0 +1,152 @@
+# backend_api/tests/test_geo_api.py
+import json
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api.models import ChangeLog, Contact, User
+from backend_api.utils import geo
+
+INDEX_DIR = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    geo.reset_city_index()
+    shutil.rmtree(INDEX_DIR, ignore_errors=True)
+
+
+@override_settings(CITY_INDEX={"PATH": os.path.join(INDEX_DIR, "city_index.bin")})
+class CityIndexTestCase(TestCase):
+    def setUp(self):
+        geo.reset_city_index()
+        self.addCleanup(geo.reset_city_index)
+
+    def test_index_is_built_on_first_use(self):
+        index = geo.get_city_index()
+        self.assertTrue(os.path.exists(os.path.join(INDEX_DIR, "city_index.bin")))
+        with open(geo.settings.INDIA_CITIES_FILE, encoding="utf-8") as fh:
+            self.assertEqual(len(index), len(json.load(fh)))
+
+    def test_prefix_search_ignores_case_and_accents(self):
+        names = [city["name"] for city in geo.get_city_index().search("  MAHE", limit=50)]
+        self.assertIn("Mahē", names)
+        self.assertIn("Mahe", names)
+        self.assertEqual(names, sorted(names, key=geo.normalize))
+        self.assertTrue(all(geo.normalize(name).startswith("mahe") for name in names))
+
+    def test_stale_index_is_rebuilt(self):
+        source = os.path.join(INDEX_DIR, "cities.json")
+        path = os.path.join(INDEX_DIR, "small.bin")
+        with open(source, "w", encoding="utf-8") as fh:
+            json.dump([{"name": "Pune", "stateCode": "MH"}], fh)
+        geo.build_index(source, path)
+        self.assertFalse(geo.is_stale(path, source))
+
+        os.utime(source, (os.path.getmtime(path) + 10,) * 2)
+        self.assertTrue(geo.is_stale(path, source))
+        self.assertTrue(geo.is_stale(os.path.join(INDEX_DIR, "missing.bin"), source))
+
+
+@override_settings(CITY_INDEX={"PATH": os.path.join(INDEX_DIR, "city_index.bin")})
+class CitySearchAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="geo@example.com")
+        self.client.force_authenticate(user=self.user)
+
+    def test_search(self):
+        response = self.client.get("/api/geo/cities/", {"q": "new d"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], [{"name": "New Delhi", "state_code": "DL", "state": "Delhi"}])
+
+    def test_state_filter_and_limit(self):
+        response = self.client.get("/api/geo/cities/", {"q": "ma", "state": "mh", "limit": 3})
+        self.assertEqual(len(response.data["data"]), 3)
+        self.assertTrue(all(city["state_code"] == "MH" for city in response.data["data"]))
+
+    def test_empty_query(self):
+        response = self.client.get("/api/geo/cities/", {"q": " "})
+        self.assertEqual(response.data["data"], [])
+
+    def test_invalid_limit(self):
+        response = self.client.get("/api/geo/cities/", {"q": "a", "limit": 500})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get("/api/geo/cities/", {"q": "a"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(CITY_INDEX={"PATH": os.path.join(INDEX_DIR, "city_index.bin")})
+class NearestCityTestCase(TestCase):
+    def test_matches_brute_force(self):
+        with open(geo.settings.INDIA_CITIES_FILE, encoding="utf-8") as fh:
+            cities = json.load(fh)
+        index = geo.get_city_index()
+        for latitude, longitude in [(19.07, 72.88), (28.61, 77.2), (8.3, 77.1), (34.9, 76.2), (23.0, 92.5)]:
+            expected = sorted(
+                geo.haversine_km(latitude, longitude, float(city["latitude"]), float(city["longitude"]))
+                for city in cities
+            )[:3]
+            found = [distance for distance, _ in index.nearest(latitude, longitude, 3)]
+            # stored in microdegrees: equal to about a metre
+            self.assertEqual([round(d, 2) for d in found], [round(d, 2) for d in expected])
+
+    def test_max_km(self):
+        index = geo.get_city_index()
+        self.assertEqual(index.nearest(0.0, 0.0, 1, max_km=100), [])
+        self.assertEqual(len(index.nearest(0.0, 0.0, 1)), 1)
+
+
+@override_settings(CITY_INDEX={"PATH": os.path.join(INDEX_DIR, "city_index.bin")})
+class NearestCityAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="geo@example.com")
+        self.client.force_authenticate(user=self.user)
+
+    def test_nearest(self):
+        response = self.client.get("/api/geo/nearest/", {"lat": 19.076, "lon": 72.8777, "limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"][0]["name"], "Mumbai")
+        self.assertEqual(len(response.data["data"]), 2)
+
+    def test_invalid_point(self):
+        response = self.client.get("/api/geo/nearest/", {"lat": 95, "lon": 72})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch(self):
+        points = [{"lat": 28.6139, "lon": 77.209}, {"lat": 0, "lon": 0}]
+        response = self.client.post("/api/geo/nearest/", {"points": points, "max_km": 50}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"][0]["state_code"], "DL")
+        self.assertIsNone(response.data["data"][1])
+
+    def test_fill_contact_locations(self):
+        filled = Contact.objects.create(user=self.user, name="A", mobile="9000000001", same_as_billing=True)
+        kept = Contact.objects.create(user=self.user, name="B", mobile="9000000002", billing_city="Nagpur")
+        other = Contact.objects.create(
+            user=User.objects.create(email="other@example.com"), name="C", mobile="9000000003"
+        )
+        cursor = ChangeLog.objects.count()
+        payload = {
+            "contacts": [
+                {"id": filled.pk, "lat": 18.5204, "lon": 73.8567},
+                {"id": kept.pk, "lat": 18.5204, "lon": 73.8567},
+                {"id": other.pk, "lat": 18.5204, "lon": 73.8567},
+            ]
+        }
+        response = self.client.post("/api/contacts/fill-locations/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["skipped"], [kept.pk, other.pk])
+
+        filled.refresh_from_db()
+        self.assertEqual((filled.billing_city, filled.billing_state), ("Pune", "Maharashtra"))
+        self.assertEqual(filled.shipping_city, "Pune")
+        self.assertEqual(Contact.objects.get(pk=kept.pk).billing_city, "Nagpur")
+        self.assertEqual(
+            list(ChangeLog.objects.filter(pk__gt=cursor).values_list("object_id", flat=True)), [str(filled.pk)]
+        )
@@ -0,0 +1,117 @@
+# backend_api/tests/test_gst.py
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend_api.models import Company, Contact, Invoice, InvoiceItem, User
+from backend_api.utils import gst
+
+
+class ResolveStateTestCase(SimpleTestCase):
+    def test_resolves_codes_gstins_and_names(self):
+        self.assertEqual(gst.resolve_state("27AADCA1154K1Z5"), "MH")
+        self.assertEqual(gst.resolve_state("29"), "KA")
+        self.assertEqual(gst.resolve_state("tn"), "TN")
+        self.assertEqual(gst.resolve_state("  tamil   NADU "), "TN")
+        self.assertEqual(gst.resolve_state("Orissa"), "OR")
+        self.assertIsNone(gst.resolve_state("27-not-a-gstin"))
+        self.assertIsNone(gst.resolve_state("Atlantis"))
+        self.assertIsNone(gst.resolve_state(None))
+
+    def test_supply_type(self):
+        self.assertEqual(gst.resolve_supply("27AADCA1154K1Z5", None, "Karnataka"), (gst.INTER_STATE, "KA"))
+        self.assertEqual(gst.resolve_supply("27AADCA1154K1Z5", "", "Maharashtra"), (gst.INTRA_STATE, "MH"))
+        # the contact's GSTIN wins over its billing address
+        self.assertEqual(gst.resolve_supply("27AADCA1154K1Z5", "29ABCDE1234F1Z5", "Maharashtra")[0], gst.INTER_STATE)
+        # unknown supplier state: intra-state
+        self.assertEqual(gst.resolve_supply(None, None, "Karnataka"), (gst.INTRA_STATE, "KA"))
+
+    def test_intra_state_halves_add_up(self):
+        # paise
+        self.assertEqual(gst.split_tax(5, gst.INTRA_STATE), (2, 3, 0))
+        self.assertEqual(gst.split_tax(900, gst.INTER_STATE), (0, 0, 900))
+
+
+class GSTSummaryTestCase(APITestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Acme", gstin="27AADCA1154K1Z5")
+        self.user = User.objects.create(email="gst@example.com", company=company, role="COMPANY_ADMIN")
+        self.client.force_authenticate(user=self.user)
+        self.local = Contact.objects.create(user=self.user, name="Local", mobile="9000000001", billing_state="Maharashtra")
+        self.remote = Contact.objects.create(user=self.user, name="Remote", mobile="9000000002", billing_state="Karnataka")
+
+    def create_invoice(self, contact):
+        invoice = Invoice.objects.create(user=self.user, contact=contact)
+        for quantity, rate, gst_percentage in ((3, "33.33", 18), (1, "10.00", 5)):
+            line = InvoiceItem(quantity=quantity, rate=Decimal(rate), gst_percentage=gst_percentage)
+            line.save()
+            invoice.items.add(line)
+        return invoice
+
+    def test_intra_state_invoice(self):
+        invoice = self.create_invoice(self.local)
+        summary = self.client.get(reverse("invoice-detail", kwargs={"pk": invoice.pk})).data["data"]["gst_summary"]
+        self.assertEqual(summary["supply_type"], gst.INTRA_STATE)
+        # 99.99 * 18% = 18.00 (17.9982), 10.00 * 5% = 0.50
+        self.assertEqual((summary["cgst"], summary["sgst"], summary["igst"]), ("9.25", "9.25", "0.00"))
+        self.assertEqual(summary["total_gst"], "18.50")
+        self.assertEqual(summary["grand_total"], "128.49")
+
+    def test_inter_state_invoice(self):
+        invoice = self.create_invoice(self.remote)
+        summary = self.client.get(reverse("invoice-detail", kwargs={"pk": invoice.pk})).data["data"]["gst_summary"]
+        self.assertEqual((summary["supply_type"], summary["place_of_supply"]), (gst.INTER_STATE, "KA"))
+        self.assertEqual((summary["cgst"], summary["sgst"], summary["igst"]), ("0.00", "0.00", "18.50"))
+
+    def test_contact_and_company_edits_refresh_cached_invoice(self):
+        invoice = self.create_invoice(self.local)
+        url = reverse("invoice-detail", kwargs={"pk": invoice.pk})
+        etag = self.client.get(url)["ETag"]
+        self.client.get(reverse("invoice-list"))
+
+        response = self.client.patch(
+            reverse("contact-detail", kwargs={"pk": self.local.pk}), {"billing_state": "Gujarat"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        summary = response.data["data"]["gst_summary"]
+        self.assertEqual((summary["supply_type"], summary["igst"]), (gst.INTER_STATE, "18.50"))
+        listed = self.client.get(reverse("invoice-list")).data["data"]
+        self.assertEqual(listed[0]["gst_summary"]["supply_type"], gst.INTER_STATE)
+
+        # now supplied from Gujarat too
+        etag = response["ETag"]
+        self.user.company.gstin = "24AADCA1154K1Z5"
+        self.user.company.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["gst_summary"]["supply_type"], gst.INTRA_STATE)
+
+    def test_batch_matches_serializer(self):
+        invoices = [self.create_invoice(self.local), self.create_invoice(self.remote)]
+        with self.assertNumQueries(2):
+            summaries = gst.summarize_invoices(Invoice.objects.filter(user=self.user))
+        for invoice in invoices:
+            expected = gst.get_gst_summary(invoice.items.all(), *gst.get_invoice_supply(invoice))
+            self.assertEqual(summaries[invoice.pk], expected)
+
+    def test_report(self):
+        self.create_invoice(self.local)
+        self.create_invoice(self.remote)
+        self.create_invoice(self.remote)
+        response = self.client.get(reverse("invoice-gst-report"))
+        report = response.data["data"]
+        self.assertEqual(report["totals"]["invoices"], 3)
+        self.assertEqual(report["totals"]["igst"], "37.00")
+        self.assertEqual(
+            [(row["supply_type"], row["place_of_supply"], row["invoices"]) for row in report["by_place_of_supply"]],
+            [(gst.INTER_STATE, "KA", 2), (gst.INTRA_STATE, "MH", 1)],
+        )
+
+    def test_report_invalid_date(self):
+        response = self.client.get(reverse("invoice-gst-report"), {"date_from": "yesterday"})
+        self.assertEqual(response.status_code, 400)
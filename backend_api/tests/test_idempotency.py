@@ -0,0 +1,132 @@
+# backend_api/tests/test_idempotency.py
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api.models import Account, Contact, IdempotencyKey, Income, Invoice, User
+from backend_api.utils import idempotency
+
+
+class IdempotencyKeyTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_bench_data", companies=1, contacts=1, items=1, invoices=1, accounts=1, stdout=StringIO())
+        cls.user = User.objects.get(email="bench0@example.com")
+        cls.account = Account.objects.filter(user=cls.user).first()
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def income_payload(self, amount="25.00"):
+        return {"account": self.account.pk, "category": "Sales", "amount": amount, "date": "2025-02-01"}
+
+    def post_income(self, key, amount="25.00"):
+        return self.client.post("/api/incomes/", self.income_payload(amount), format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_without_creating_again(self):
+        first = self.post_income("retry-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED, first.content)
+        count = Income.objects.count()
+
+        second = self.post_income("retry-1")
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(Income.objects.count(), count)
+
+    def test_invoice_retry_does_not_use_another_number(self):
+        payload = {
+            "contact": Contact.objects.filter(user=self.user).first().pk,
+            "invoice_date": "2025-02-01",
+            "items": [{"description": "Line", "quantity": 1, "rate": 10}],
+        }
+        first = self.client.post("/api/invoices/", payload, format="json", HTTP_IDEMPOTENCY_KEY="inv-1")
+        second = self.client.post("/api/invoices/", payload, format="json", HTTP_IDEMPOTENCY_KEY="inv-1")
+        self.assertEqual(first.data["data"]["invoice_number"], second.data["data"]["invoice_number"])
+        self.assertEqual(Invoice.objects.filter(invoice_number=first.data["data"]["invoice_number"]).count(), 1)
+
+    def test_without_key_every_request_creates(self):
+        count = Income.objects.count()
+        self.client.post("/api/incomes/", self.income_payload(), format="json")
+        self.client.post("/api/incomes/", self.income_payload(), format="json")
+        self.assertEqual(Income.objects.count(), count + 2)
+
+    def test_same_key_different_body_is_rejected(self):
+        self.post_income("reused")
+        response = self.post_income("reused", amount="99.00")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_keys_are_per_user(self):
+        self.post_income("shared")
+        other = User.objects.create(email="second@example.com", company=self.user.company, role="COMPANY_ADMIN")
+        self.client.force_authenticate(user=other)
+        response = self.post_income("shared")
+        self.assertNotIn("Idempotent-Replayed", response)
+
+    def test_concurrent_duplicate_waits_for_the_first(self):
+        now = timezone.now()
+        request_hash = "same-request"
+        pending = IdempotencyKey.objects.create(
+            user=self.user, key="in-flight", request_hash=request_hash, locked_at=now, expires_at=now + timedelta(days=1)
+        )
+
+        def first_request_finishes(seconds):
+            IdempotencyKey.objects.filter(pk=pending.pk).update(status_code=201, content=b'{"success":true}')
+
+        with mock.patch.object(idempotency, "get_request_hash", return_value=request_hash), \
+                mock.patch.object(idempotency.time, "sleep", side_effect=first_request_finishes) as sleep:
+            response = self.post_income("in-flight")
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Idempotent-Replayed"], "true")
+
+    @override_settings(IDEMPOTENCY={"WAIT_SECONDS": 0})
+    def test_still_running_duplicate_gets_conflict(self):
+        now = timezone.now()
+        IdempotencyKey.objects.create(
+            user=self.user, key="slow", request_hash="x", locked_at=now, expires_at=now + timedelta(days=1)
+        )
+        with mock.patch.object(idempotency, "get_request_hash", return_value="x"):
+            response = self.post_income("slow")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_validation_errors_are_replayed_and_expired_keys_reused(self):
+        bad = self.client.post("/api/incomes/", {"amount": "-1"}, format="json", HTTP_IDEMPOTENCY_KEY="bad")
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+        IdempotencyKey.objects.filter(key="bad").update(expires_at=timezone.now() - timedelta(seconds=1))
+        again = self.client.post("/api/incomes/", {"amount": "-1"}, format="json", HTTP_IDEMPOTENCY_KEY="bad")
+        self.assertNotIn("Idempotent-Replayed", again)
+
+        call_command("purge_idempotency_keys", stdout=StringIO())
+        self.assertTrue(IdempotencyKey.objects.filter(key="bad").exists())
+
+    def test_server_errors_release_the_key(self):
+        with mock.patch("backend_api.views.account_views.IncomeSerializer.save", side_effect=RuntimeError):
+            self.assertEqual(self.post_income("crash").status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(IdempotencyKey.objects.filter(key="crash").exists())
+        self.assertEqual(self.post_income("crash").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Income.objects.filter(amount=Decimal("25.00"), date="2025-02-01").count(), 1)
+
+    def test_create_and_stored_response_commit_together(self):
+        count = Income.objects.count()
+        with mock.patch.object(idempotency, "store_response", side_effect=RuntimeError), \
+                mock.patch.object(QuerySet, "select_for_update", autospec=True,
+                                  side_effect=QuerySet.select_for_update) as select_for_update:
+            self.assertEqual(self.post_income("store").status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertTrue(any(call.args[0].model is IdempotencyKey for call in select_for_update.call_args_list))
+        # the failed store rolled the create back with it
+        self.assertEqual(Income.objects.count(), count)
+        self.assertFalse(IdempotencyKey.objects.filter(key="store").exists())
+
+    def test_taken_over_key_does_not_run_the_view(self):
+        record, response = idempotency.claim_key(self.user, "taken", "x")
+        IdempotencyKey.objects.filter(pk=record.pk).update(locked_at=timezone.now() + timedelta(seconds=1))
+        self.assertIsNone(idempotency.lock_key(record))
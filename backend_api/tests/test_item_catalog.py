@@ -0,0 +1,69 @@
+# backend_api/tests/test_item_catalog.py
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend_api.models import Company, Contact, Invoice, InvoiceItem, Items, User
+from backend_api.utils.item_catalog import resolve_items
+
+
+class ItemCatalogTestCase(APITestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Acme")
+        self.user = User.objects.create(email="cat@example.com", company=company, role="COMPANY_ADMIN")
+        colleague = User.objects.create(email="cat2@example.com", company=company, role="STAFF")
+        self.client.force_authenticate(user=self.user)
+        self.contact = Contact.objects.create(user=self.user, name="Buyer", mobile="9000000001")
+        self.items = [
+            Items.objects.create(user=owner, name=f"Item {n}", rate=10 * (n + 1), tax_category="gst-5")
+            for n, owner in enumerate([self.user, colleague] * 3)
+        ]
+
+    def create_invoice(self, *lines):
+        payload = {"contact": self.contact.pk, "invoice_type": "default", "supply_type": "regular", "items": list(lines)}
+        return self.client.post(reverse("invoice-list"), payload, format="json")
+
+    def item_queries(self, lines):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.create_invoice(*lines)
+        self.assertEqual(response.status_code, 201, response.data)
+        return [q["sql"] for q in queries.captured_queries if 'FROM "backend_api_items"' in q["sql"]]
+
+    def test_items_resolved_in_one_query_then_cached(self):
+        lines = [{"item_id": item.pk, "quantity": 1} for item in self.items]
+        # resolved in one query, then cached; each write still locks the rows once
+        self.assertEqual(len(self.item_queries(lines)), 2)
+        self.assertEqual(len(self.item_queries(lines)), 1)
+
+        descriptions = sorted(InvoiceItem.objects.values_list("description", "rate").distinct())
+        self.assertEqual(descriptions, sorted((item.name, Decimal(item.rate)) for item in self.items))
+
+    def test_item_change_reloads(self):
+        item = self.items[0]
+        self.create_invoice({"item_id": item.pk})
+        self.client.patch(reverse("items-detail", kwargs={"pk": item.pk}), {"name": "Renamed"}, format="json")
+        self.create_invoice({"item_id": item.pk})
+        self.assertEqual(InvoiceItem.objects.order_by("-pk").first().description, "Renamed")
+
+    def test_other_tenant_item_rejected(self):
+        stranger = User.objects.create(email="x@example.com", company=Company.objects.create(name="Other"))
+        foreign = Items.objects.create(user=stranger, name="Foreign", rate=1)
+        for value in (foreign.pk, "abc"):
+            response = self.create_invoice({"item_id": value})
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(InvoiceItem.objects.exists())
+
+    def test_item_deleted_elsewhere_rejected_at_save(self):
+        item = self.items[0]
+        self.assertIn(item.pk, resolve_items(self.user, [item.pk]))
+        # deleted by another worker whose invalidation has not landed yet
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM "backend_api_items" WHERE "id" = %s', [item.pk])
+
+        response = self.create_invoice({"item_id": item.pk})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Invoice.objects.exists())
+        self.assertEqual(resolve_items(self.user, [item.pk]), {})
@@ -0,0 +1,96 @@
+# backend_api/tests/test_item_sales.py
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend_api.models import Company, Contact, Invoice, Items, ItemSales, User
+from backend_api.utils.item_sales import rebuild_item_sales
+
+
+class ItemSalesTestCase(APITestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Acme")
+        self.user = User.objects.create(email="sales@example.com", company=company, role="COMPANY_ADMIN")
+        self.client.force_authenticate(user=self.user)
+        self.contact = Contact.objects.create(user=self.user, name="Buyer", mobile="9000000001")
+        self.pen = Items.objects.create(user=self.user, name="Pen", rate=Decimal("10.00"), tax_category="gst-18")
+        self.ink = Items.objects.create(user=self.user, name="Ink", rate=Decimal("99.99"), tax_category="gst-5")
+        self.scope = f"c{company.pk}"
+
+    def create_invoice(self, date, *lines):
+        payload = {
+            "contact": self.contact.pk,
+            "invoice_date": date,
+            "invoice_type": "default",
+            "supply_type": "regular",
+            "items": list(lines),
+        }
+        response = self.client.post(reverse("invoice-list"), payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data["data"]["id"]
+
+    def sales(self):
+        return {
+            (row.item_id, row.month.strftime("%Y-%m")): (row.lines, row.quantity, row.revenue, row.tax)
+            for row in ItemSales.objects.filter(scope=self.scope)
+        }
+
+    def test_lines_update_monthly_totals(self):
+        self.create_invoice("2025-01-05", {"item_id": self.pen.pk, "quantity": 3}, {"description": "Freight", "rate": 5})
+        self.create_invoice("2025-01-20", {"item_id": self.pen.pk, "quantity": 2, "discount": 5})
+        invoice_id = self.create_invoice("2025-02-01", {"item_id": self.ink.pk, "quantity": 1})
+        self.assertEqual(
+            self.sales(),
+            {
+                (self.pen.pk, "2025-01"): (2, 5, Decimal("45.00"), Decimal("8.10")),
+                (self.ink.pk, "2025-02"): (1, 1, Decimal("99.99"), Decimal("5.00")),
+            },
+        )
+
+        # new lines and a new date move the invoice's sales
+        response = self.client.patch(
+            reverse("invoice-detail", kwargs={"pk": invoice_id}),
+            {"invoice_date": "2025-03-10", "items": [{"item_id": self.pen.pk, "quantity": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.sales()[(self.pen.pk, "2025-03")], (1, 1, Decimal("10.00"), Decimal("1.80")))
+        self.assertNotIn((self.ink.pk, "2025-02"), self.sales())
+
+        self.client.delete(reverse("invoice-detail", kwargs={"pk": invoice_id}))
+        incremental = self.sales()
+        self.assertEqual(set(incremental), {(self.pen.pk, "2025-01")})
+
+        self.assertEqual(rebuild_item_sales(Invoice.objects.filter(user=self.user)), 1)
+        self.assertEqual(self.sales(), incremental)
+
+    def test_contact_delete_removes_its_invoices(self):
+        other = Contact.objects.create(user=self.user, name="Other", mobile="9000000002")
+        self.create_invoice("2025-01-05", {"item_id": self.pen.pk, "quantity": 1})
+        self.create_invoice("2025-01-06", {"item_id": self.pen.pk, "quantity": 2})
+        self.contact, keep = other, self.contact
+        self.create_invoice("2025-01-07", {"item_id": self.pen.pk, "quantity": 4})
+
+        keep.delete()
+        self.assertEqual(self.sales(), {(self.pen.pk, "2025-01"): (1, 4, Decimal("40.00"), Decimal("7.20"))})
+
+    def test_analytics(self):
+        self.create_invoice("2025-01-05", {"item_id": self.pen.pk, "quantity": 30})
+        self.create_invoice("2025-02-05", {"item_id": self.ink.pk, "quantity": 1}, {"item_id": self.pen.pk, "quantity": 1})
+        url = reverse("items-analytics")
+
+        with self.assertNumQueries(2):
+            data = self.client.get(url).data["data"]
+        self.assertEqual([row["name"] for row in data["ranking"]], ["Pen", "Ink"])
+        self.assertEqual(data["ranking"][0]["revenue"], "310.00")
+        self.assertEqual([(row["month"], row["lines"]) for row in data["trend"]], [("2025-01", 1), ("2025-02", 2)])
+
+        data = self.client.get(url, {"order_by": "tax", "date_from": "2025-02-28", "limit": 1}).data["data"]
+        self.assertEqual([(row["name"], row["tax"]) for row in data["ranking"]], [("Ink", "5.00")])
+
+        data = self.client.get(url, {"item": self.ink.pk}).data["data"]
+        self.assertEqual([row["month"] for row in data["trend"]], ["2025-02"])
+
+        for params in ({"order_by": "name"}, {"limit": 0}, {"date_to": "soon"}, {"item": "x"}):
+            self.assertEqual(self.client.get(url, params).status_code, 400)
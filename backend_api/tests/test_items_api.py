@@ -1,10 +1,12 @@
 # backend_api/tests/test_items_api.py
 
+from decimal import Decimal
+
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from backend_api.models import Items
+from backend_api.models import ChangeLog, Items
 
 User = get_user_model()
 
@@ -118,6 +120,13 @@ class ItemsAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("Discount cannot be greater than rate", str(response.data))
 
+    def test_partial_update_checks_discount_against_stored_rate(self):
+        url = self.url_detail(self.item1.id)
+        self.assertEqual(self.client.patch(url, {"discount": 40}, format="json").status_code, 200)
+        response = self.client.patch(url, {"rate": 30}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Discount cannot be greater than rate", str(response.data))
+
     # -----------------------------
     # SEARCH / ORDERING
     # -----------------------------
@@ -133,3 +142,69 @@ class ItemsAPITestCase(APITestCase):
         self.assertEqual(response.status_code, 200)
         rates = [float(i["rate"]) for i in response.data["data"]]
         self.assertEqual(rates, sorted(rates))
+
+    # -----------------------------
+    # BULK UPDATE
+    # -----------------------------
+    def test_bulk_update_pairs(self):
+        payload = {
+            "items": [
+                {"id": self.item1.id, "rate": "120.50", "tax_category": "gst-18"},
+                {"id": self.item2.id, "discount": 20},
+            ]
+        }
+        logged = ChangeLog.objects.count()
+        response = self.client.post(reverse("items-bulk-update"), payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["data"]["updated"], 2)
+        # no signals: the view logs the sync changes itself
+        self.assertEqual(ChangeLog.objects.count(), logged + 2)
+        self.item1.refresh_from_db()
+        self.item2.refresh_from_db()
+        self.assertEqual((float(self.item1.rate), self.item1.tax_category), (120.5, "gst-18"))
+        self.assertEqual(float(self.item2.discount), 20)
+
+    def test_bulk_update_percentage(self):
+        Items.objects.filter(pk=self.item2.pk).update(type="product")
+        payload = {"filter": {"type": "service"}, "percent": "-12.5"}
+        response = self.client.post(reverse("items-bulk-update"), payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        rates = dict(Items.objects.values_list("id", "rate"))
+        self.assertEqual(float(rates[self.item1.id]), 87.5)
+        self.assertEqual(float(rates[self.item2.id]), 200)
+        self.assertEqual(float(rates[self.item_other.id]), 300)
+
+    def test_bulk_update_is_all_or_nothing(self):
+        Items.objects.filter(pk=self.item2.pk).update(discount=150)
+        url = reverse("items-bulk-update")
+        for payload in (
+            {"all": True, "percent": -50},  # item 2 would end below its discount
+            {"items": [{"id": self.item1.id, "rate": 10}, {"id": self.item_other.id, "rate": 10}]},
+            {"items": [{"id": self.item1.id, "rate": -1}]},
+            {"filter": {}},
+        ):
+            response = self.client.post(url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(sorted(float(rate) for rate in Items.objects.values_list("rate", flat=True)), [100, 200, 300])
+
+    def test_bulk_update_rejects_rates_the_column_cannot_hold(self):
+        url = reverse("items-bulk-update")
+        response = self.client.post(url, {"all": True, "percent": "99999.99"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        Items.objects.filter(pk=self.item1.pk).update(rate=Decimal("9999999000.00"))
+        response = self.client.post(url, {"all": True, "percent": 10}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Items.objects.get(pk=self.item1.pk).rate, Decimal("9999999000.00"))
+
+    def test_bulk_update_every_item_needs_all(self):
+        url = reverse("items-bulk-update")
+        for payload in ({"filter": {}, "percent": 10}, {"percent": 10}):
+            response = self.client.post(url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(float(Items.objects.get(pk=self.item1.pk).rate), 100)
+
+        response = self.client.post(url, {"all": True, "percent": 10}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        rates = dict(Items.objects.values_list("id", "rate"))
+        self.assertEqual((float(rates[self.item1.id]), float(rates[self.item_other.id])), (110, 300))
@@ -0,0 +1,126 @@
+# backend_api/tests/test_jobs.py
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api.models import Company, Job, User
+from backend_api.utils.jobs import claim_jobs, enqueue, requeue_stale, run_job, work
+
+CALLS = []
+
+
+def add(a, b):
+    CALLS.append((a, b))
+    return {"sum": a + b}
+
+
+def always_fails():
+    raise ValueError("boom")
+
+
+@override_settings(JOBS={"ASYNC": True, "MAX_ATTEMPTS": 3, "BACKOFF_SECONDS": 10, "POLL_SECONDS": 0})
+class JobRunnerTestCase(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_worker_runs_queued_jobs(self):
+        job = enqueue(add, {"a": 1, "b": 2})
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.name, "backend_api.tests.test_jobs.add")
+
+        self.assertEqual(work("test-worker", once=True), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {"sum": 3})
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    @override_settings(JOBS={"ASYNC": False})
+    def test_without_workers_jobs_run_inline(self):
+        job = enqueue(add, {"a": 2, "b": 2})
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(CALLS, [(2, 2)])
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        enqueue(add, {"a": 1, "b": 1})
+        self.assertEqual(len(claim_jobs("worker-a")), 1)
+        self.assertEqual(claim_jobs("worker-b"), [])
+
+    def test_future_jobs_wait(self):
+        enqueue(add, {"a": 1, "b": 1}, run_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(claim_jobs("worker-a"), [])
+
+    def test_failures_retry_with_backoff_then_fail(self):
+        job = enqueue(always_fails)
+        delays = []
+        for attempt in range(1, 4):
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+            [job] = claim_jobs("worker-a")
+            before = timezone.now()
+            with self.assertLogs("backend_api.jobs", "ERROR") as logs:
+                run_job(job)
+            self.assertEqual(job.attempts, attempt)
+            # the traceback is logged, not stored where the API shows it
+            self.assertIn("Traceback", logs.output[0])
+            self.assertEqual(job.last_error, "ValueError: boom")
+            if attempt < 3:
+                self.assertEqual(job.status, Job.QUEUED)
+                delays.append((job.run_at - before).total_seconds())
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertGreaterEqual(delays[0], 10)
+        self.assertGreaterEqual(delays[1], 20)
+
+    def test_jobs_of_dead_workers_are_requeued(self):
+        job = enqueue(add, {"a": 1, "b": 1})
+        claim_jobs("dead-worker")
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+
+    def test_run_workers_command(self):
+        enqueue(add, {"a": 1, "b": 1})
+        enqueue(add, {"a": 2, "b": 3})
+        out = StringIO()
+        call_command("run_workers", processes=1, once=True, stdout=out)
+        self.assertIn("Ran 2 jobs.", out.getvalue())
+        self.assertEqual(sorted(CALLS), [(1, 1), (2, 3)])
+
+
+class JobStatusAPITestCase(APITestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Jobs Co")
+        self.user = User.objects.create(email="admin@example.com", company=company, role="COMPANY_ADMIN")
+        self.client.force_authenticate(user=self.user)
+
+    def test_owner_reads_job_status(self):
+        job = enqueue(add, {"a": 1, "b": 1}, user=self.user)
+        response = self.client.get(f"/api/jobs/{job.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["status"], Job.SUCCEEDED)
+        self.assertEqual(response.data["data"]["result"], {"sum": 2})
+        self.assertEqual(len(self.client.get("/api/jobs/").data["data"]), 1)
+
+    def test_other_users_jobs_are_hidden(self):
+        other = User.objects.create(email="other@example.com")
+        job = enqueue(add, {"a": 1, "b": 1}, user=other)
+        self.assertEqual(self.client.get(f"/api/jobs/{job.pk}/").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_staff_invite_is_sent_by_a_job(self):
+        response = self.client.post(
+            "/api/users/",
+            {"email": "staff@example.com", "first_name": "New", "last_name": "Staff", "role": "STAFF"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        job = Job.objects.get(user=self.user)
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.payload, {"user_id": str(response.data["data"]["id"])})
+        self.assertEqual(mail.outbox[0].to, ["staff@example.com"])
+        self.assertTrue(User.objects.get(email="staff@example.com").has_usable_password())
@@ -0,0 +1,69 @@
+# backend_api/tests/test_money.py
+import random
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+
+from backend_api.models import Contact, Invoice, InvoiceItem, User
+from backend_api.utils import money
+
+
+class MoneyTestCase(SimpleTestCase):
+    def test_conversions_round_half_up(self):
+        self.assertEqual(money.to_paise(Decimal("10.005")), 1001)
+        self.assertEqual(money.to_paise("0.004"), 0)
+        self.assertEqual(money.to_paise(-Decimal("1.005")), -101)
+        self.assertEqual(money.to_paise(None), 0)
+        self.assertEqual(money.to_basis_points(Decimal("18.00")), 1800)
+        self.assertEqual(money.from_paise(12345), Decimal("123.45"))
+        self.assertEqual(str(money.from_paise(500)), "5.00")
+
+    def test_divide_half_up(self):
+        self.assertEqual(money.divide_half_up(15, 10), 2)
+        self.assertEqual(money.divide_half_up(14, 10), 1)
+        self.assertEqual(money.divide_half_up(-15, 10), -2)
+
+    def test_change_by_percentage(self):
+        self.assertEqual(money.change_by_percentage(Decimal("99.99"), 10), Decimal("109.99"))
+        # 0.05 * 0.9 = 0.045 -> 0.05
+        self.assertEqual(money.change_by_percentage(Decimal("0.05"), Decimal("-10")), Decimal("0.05"))
+        self.assertEqual(money.change_by_percentage(Decimal("12.34"), -100), Decimal("0.00"))
+
+    def test_line_amounts(self):
+        # 3 x 33.33 at 18% = 99.99 + 17.9982 -> 18.00
+        self.assertEqual(money.line_amounts(3, 3333, 0, 1800), (9999, 1800, 11799))
+        # discount above the line value: nothing taxable
+        self.assertEqual(money.line_amounts(1, 100, 500, 1800), (0, 0, 0))
+        self.assertEqual(money.split_tax(5), (2, 3))
+
+    def test_batch_matches_scalar(self):
+        rng = random.Random(7)
+        lines = [
+            (
+                rng.randint(1, 50),
+                rng.randint(0, 1_000_000),
+                rng.randint(0, 5000),
+                rng.choice([-500, 0, 500, 1200, 1800, 2800]),
+            )
+            for _ in range(500)
+        ]
+        taxable, tax, total = money.line_amounts_batch(*zip(*lines))
+        self.assertEqual(list(zip(taxable, tax, total)), [money.line_amounts(*line) for line in lines])
+        self.assertEqual(money.sum_by_key(["a", "b", "a"], [1, 2, 3]), {"a": 4, "b": 2})
+
+
+class InvoiceTotalsTestCase(TestCase):
+    def test_line_and_invoice_totals_agree(self):
+        user = User.objects.create(email="money@example.com")
+        contact = Contact.objects.create(user=user, name="A", mobile="9000000001")
+        invoice = Invoice.objects.create(user=user, contact=contact)
+        for rate, gst_percentage in (("33.33", 18), ("0.05", 5), ("19.99", 12)):
+            line = InvoiceItem(quantity=3, rate=Decimal(rate), gst_percentage=gst_percentage)
+            line.save()
+            self.assertEqual(line.total, (3 * line.rate) + line.tax_amount)
+            invoice.items.add(line)
+        invoice.update_total()
+
+        invoice.refresh_from_db()
+        # 117.99 + 0.16 (0.1575) + 67.17 (59.97 + 7.1964)
+        self.assertEqual(invoice.total_amount, Decimal("185.32"))
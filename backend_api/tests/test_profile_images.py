@@ -0,0 +1,106 @@
+# backend_api/tests/test_profile_images.py
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api import tasks
+from backend_api.models import Job, User
+from backend_api.utils import images
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_jpeg(width=400, height=200, orientation=6):
+    image = Image.new("RGB", (width, height), (200, 30, 30))
+    exif = Image.Exif()
+    exif[0x0112] = orientation  # rotate 90° when displayed
+    exif[0x010F] = "Test Camera"
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile("avatar.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, JOBS={"ASYNC": False})
+class ProfileImageTestCase(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create(email="avatar@example.com")
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, file):
+        return self.client.post("/api/profile/image/", {"profile_image": file}, format="multipart")
+
+    def test_upload_is_sanitized_and_resized(self):
+        response = self.upload(make_jpeg())
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(Job.objects.get(user=self.user).status, Job.SUCCEEDED)
+
+        self.user.refresh_from_db()
+        with default_storage.open(self.user.profile_image.name) as file, Image.open(file) as original:
+            # orientation applied to the pixels, metadata gone
+            self.assertEqual(original.size, (200, 400))
+            self.assertEqual(dict(original.getexif()), {})
+
+        urls = response.data["data"]["profile_image_urls"]
+        self.assertEqual(set(urls), {"sm", "md", "lg"})
+        self.assertTrue(urls["sm"]["webp"].endswith(".webp"))
+        for size, pixels in (("sm", 48), ("lg", 256)):
+            for path in self.user.profile_image_variants[size].values():
+                with default_storage.open(path) as file, Image.open(file) as variant:
+                    self.assertEqual(variant.size, (pixels, pixels))
+
+    def test_new_upload_and_delete_remove_old_files(self):
+        self.upload(make_jpeg())
+        self.user.refresh_from_db()
+        old_files = [self.user.profile_image.name] + [
+            path for formats in self.user.profile_image_variants.values() for path in formats.values()
+        ]
+
+        self.upload(make_jpeg(orientation=1))
+        for name in old_files:
+            self.assertFalse(default_storage.exists(name), name)
+
+        self.user.refresh_from_db()
+        variant = self.user.profile_image_variants["md"]["jpeg"]
+        response = self.client.delete("/api/profile/image/")
+        self.assertEqual(response.data["data"]["profile_image_urls"], {})
+        self.assertFalse(default_storage.exists(variant))
+
+    def test_retry_after_a_crash_before_the_row_update(self):
+        with override_settings(JOBS={"ASYNC": True}):
+            self.upload(make_jpeg())
+        self.user.refresh_from_db()
+        original = self.user.profile_image.name
+
+        # an attempt that dies after processing leaves the original in place
+        images.process_profile_image(self.user, default_storage)
+        self.assertTrue(default_storage.exists(original))
+
+        result = tasks.process_profile_image(self.user.pk, original)
+        self.assertNotIn("skipped", result)
+        self.assertFalse(default_storage.exists(original))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, result["image"])
+
+    def test_png_with_transparency(self):
+        image = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        response = self.upload(SimpleUploadedFile("avatar.png", buffer.getvalue(), content_type="image/png"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("jpeg", response.data["data"]["profile_image_urls"]["md"])
+
+    def test_not_an_image(self):
+        response = self.upload(SimpleUploadedFile("avatar.jpg", b"not really a jpeg", content_type="image/jpeg"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
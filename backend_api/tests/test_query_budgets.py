@@ -0,0 +1,63 @@
+# backend_api/tests/test_query_budgets.py
+from django.test import TestCase
+
+from backend_api.tests.query_budget import (
+    LARGE_SIZE,
+    SMALL_SIZE,
+    iter_viewset_actions,
+    load_budgets,
+    measure_endpoints,
+    query_diff,
+    save_budgets,
+    should_update_budgets,
+)
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Calls every action of every router-registered viewset for a tenant at two
+    sizes. Query counts must not grow with the data and must stay within the
+    ceilings checked into query_budgets.json.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.small = measure_endpoints(SMALL_SIZE)
+        cls.large = measure_endpoints(LARGE_SIZE)
+        cls.budgets = load_budgets()
+        if should_update_budgets():
+            save_budgets({key: len(queries) for key, queries in cls.large.items()}, cls.budgets)
+            cls.budgets = load_budgets()
+
+    def test_every_action_has_a_budget(self):
+        keys = {key for key, *_ in iter_viewset_actions()}
+        missing = sorted(keys - set(self.budgets))
+        self.assertEqual(missing, [], "Run with UPDATE_QUERY_BUDGETS=1 to record budgets for new endpoints.")
+
+    def test_query_count_does_not_grow_with_data(self):
+        for key, small_queries in self.small.items():
+            large_queries = self.large[key]
+            with self.subTest(endpoint=key):
+                if self.budgets.get(key, {}).get("allow_growth"):
+                    continue
+                self.assertEqual(
+                    len(small_queries),
+                    len(large_queries),
+                    f"{key} ran {len(small_queries)} queries at size {SMALL_SIZE} "
+                    f"but {len(large_queries)} at size {LARGE_SIZE}:\n"
+                    f"{query_diff(small_queries, large_queries)}",
+                )
+
+    def test_query_count_within_budget(self):
+        for key, queries in self.large.items():
+            budget = self.budgets.get(key)
+            if not budget:
+                continue
+            with self.subTest(endpoint=key):
+                self.assertLessEqual(
+                    len(queries),
+                    budget["max_queries"],
+                    f"{key} ran {len(queries)} queries, budget is {budget['max_queries']}:\n"
+                    + "\n".join(queries),
+                )
@@ -0,0 +1,73 @@
+# backend_api/tests/test_recompute.py
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from backend_api.models import ChangeLog, Invoice, InvoiceItem
+
+
+class RecomputeInvoiceTotalsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_bench_data",
+            companies=1,
+            contacts=5,
+            items=5,
+            invoices=12,
+            accounts=1,
+            transactions=0,
+            seed=3,
+            stdout=StringIO(),
+        )
+
+    def setUp(self):
+        self.invoices = list(Invoice.objects.order_by("pk"))
+        self.expected = {invoice.pk: invoice.total_amount for invoice in self.invoices}
+        # corrupt the first and last invoice, and one line of the second
+        Invoice.objects.filter(pk__in=[self.invoices[0].pk, self.invoices[-1].pk]).update(total_amount=0)
+        self.line = self.invoices[1].items.order_by("pk").first()
+        self.line_total = self.line.total
+        InvoiceItem.objects.filter(pk=self.line.pk).update(total=Decimal("1.00"), tax_amount=Decimal("0.50"))
+
+    def recompute(self, **options):
+        out = StringIO()
+        call_command("recompute_invoice_totals", stdout=out, **options)
+        return out.getvalue()
+
+    def test_dry_run_reports_without_writing(self):
+        output = self.recompute(dry_run=True, chunk_size=5)
+        self.assertIn(f"(#{self.invoices[0].pk}): total 0.00 -> {self.expected[self.invoices[0].pk]}", output)
+        self.assertIn(f"line {self.line.pk}: tax 0.50", output)
+        self.assertIn("Would update 2 invoice totals and 1 lines.", output)
+        self.assertEqual(Invoice.objects.get(pk=self.invoices[0].pk).total_amount, 0)
+
+    def test_recompute_writes_changes_and_logs_them(self):
+        cursor = ChangeLog.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        output = self.recompute(chunk_size=5)
+        self.assertIn("Updated 2 invoice totals and 1 lines.", output)
+        totals = dict(Invoice.objects.values_list("pk", "total_amount"))
+        self.assertEqual(totals, self.expected)
+        self.assertEqual(InvoiceItem.objects.get(pk=self.line.pk).total, self.line_total)
+        self.assertEqual(
+            sorted(ChangeLog.objects.filter(pk__gt=cursor).values_list("object_id", flat=True)),
+            sorted(str(invoice.pk) for invoice in self.invoices[:2] + self.invoices[-1:]),
+        )
+        self.assertIn("Updated 0 invoice totals and 0 lines.", self.recompute())
+
+    def test_resumes_from_checkpoint(self):
+        path = os.path.join(tempfile.mkdtemp(), "checkpoint.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"last_pk": self.invoices[5].pk, "invoices": 6, "changed_invoices": 0, "changed_lines": 0}, fh)
+
+        output = self.recompute(checkpoint=path, chunk_size=4)
+        self.assertIn(f"Resuming after invoice #{self.invoices[5].pk}.", output)
+        self.assertIn("Checked 12 invoices. Updated 1 invoice totals and 0 lines.", output)
+        # the first invoice was before the checkpoint
+        self.assertEqual(Invoice.objects.get(pk=self.invoices[0].pk).total_amount, 0)
+        self.assertFalse(os.path.exists(path))
@@ -0,0 +1,108 @@
+# backend_api/tests/test_replica_routing.py
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from backend_api.models import Contact, User
+from backend_api.utils import db_routing
+from backend_api.utils.db_routing import (
+    ReplicaRouter,
+    check_sticky_shared,
+    get_sticky_cache,
+    replica_active,
+    replica_reads,
+)
+from backend_api.views import ContactViewSet
+
+
+class ReplicaRouterTestCase(SimpleTestCase):
+    def test_reads_use_replica_only_when_asked(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Contact))
+        with mock.patch.object(db_routing, "has_replica", return_value=True):
+            with replica_reads():
+                self.assertEqual(router.db_for_read(Contact), "replica")
+        self.assertIsNone(router.db_for_read(Contact))
+
+    def test_without_replica_nothing_changes(self):
+        with replica_reads():
+            self.assertFalse(replica_active())
+
+    def test_sticky_pins_need_a_shared_cache(self):
+        locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "sticky-test"}
+        with override_settings(CACHES={"sticky": locmem}, REPLICA={"CACHE_ALIAS": "sticky"}):
+            check_sticky_shared()  # no replica configured
+            with mock.patch.object(db_routing, "has_replica", return_value=True):
+                with self.assertRaises(ImproperlyConfigured):
+                    check_sticky_shared()
+
+    def test_writes_and_migrations_stay_on_primary(self):
+        router = ReplicaRouter()
+        with mock.patch.object(db_routing, "has_replica", return_value=True), replica_reads():
+            self.assertEqual(router.db_for_write(Contact), "default")
+        self.assertFalse(router.allow_migrate("replica", "backend_api"))
+        self.assertTrue(router.allow_migrate("default", "backend_api"))
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": False})
+@mock.patch.object(ReplicaRouter, "db_for_read", return_value=None)
+@mock.patch("backend_api.middleware.has_replica", return_value=True)
+@mock.patch.object(db_routing, "has_replica", return_value=True)
+class ReplicaReadMixinTestCase(APITestCase):
+    def setUp(self):
+        get_sticky_cache().clear()
+        self.user = User.objects.create(email="admin@example.com")
+        Contact.objects.create(user=self.user, name="Asha", mobile="+919800000001")
+        self.client.force_authenticate(user=self.user)
+
+    def reads_from_replica(self, method="get", path="/api/contacts/", **kwargs):
+        seen = []
+        original = ContactViewSet.get_queryset
+
+        def get_queryset(view):
+            seen.append(replica_active())
+            return original(view)
+
+        with mock.patch.object(ContactViewSet, "get_queryset", get_queryset):
+            getattr(self.client, method)(path, **kwargs)
+        self.assertFalse(replica_active())
+        return any(seen)
+
+    def test_list_reads_from_replica(self, *mocks):
+        self.assertTrue(self.reads_from_replica())
+
+    def test_writes_read_from_primary(self, *mocks):
+        self.assertFalse(
+            self.reads_from_replica("post", data={"name": "Ravi", "mobile": "+919800000002"}, format="json")
+        )
+
+    def test_tenant_sticks_to_primary_after_a_write(self, *mocks):
+        self.client.post("/api/contacts/", {"name": "Ravi", "mobile": "+919800000002"}, format="json")
+        self.assertFalse(self.reads_from_replica())
+
+        get_sticky_cache().clear()  # the sticky window ran out
+        self.assertTrue(self.reads_from_replica())
+
+    def test_failed_writes_do_not_stick(self, *mocks):
+        self.client.post("/api/contacts/", {"name": "No Contact Details"}, format="json")
+        self.assertTrue(self.reads_from_replica())
+
+    def test_report_actions_read_from_replica(self, has_replica, middleware_has_replica, db_for_read):
+        for path in ("/api/invoices/gst-report/", "/api/items/analytics/"):
+            with self.subTest(path=path):
+                seen = []
+                db_for_read.side_effect = lambda model, **hints: seen.append(replica_active())
+                self.assertEqual(self.client.get(path).status_code, 200)
+                self.assertTrue(any(seen))
+
+    def test_streamed_list_body_reads_from_replica(self, has_replica, middleware_has_replica, db_for_read):
+        seen = []
+        db_for_read.side_effect = lambda model, **hints: seen.append(replica_active())
+        response = self.client.get("/api/contacts/", {"stream": "true"})
+        view_reads = len(seen)
+        b"".join(response.streaming_content)
+        self.assertGreater(len(seen), view_reads)
+        self.assertTrue(all(seen[view_reads:]))
+        self.assertFalse(replica_active())
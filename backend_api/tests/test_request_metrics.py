@@ -0,0 +1,46 @@
+# backend_api/tests/test_request_metrics.py
+from django.test import override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from backend_api.models import Items
+
+User = get_user_model()
+
+
+class RequestMetricsMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="metrics@example.com", password="1234")
+        self.client.force_authenticate(user=self.user)
+        Items.objects.create(user=self.user, name="Item 1", rate=100)
+        self.url_list = reverse("items-list")
+
+    def test_server_timing_header(self):
+        response = self.client.get(self.url_list)
+        self.assertEqual(response.status_code, 200)
+        header = response["Server-Timing"]
+        self.assertIn("db;dur=", header)
+        self.assertIn("queries", header)
+        self.assertIn("ser;dur=", header)
+        self.assertIn("total;dur=", header)
+
+    @override_settings(
+        REQUEST_METRICS={"LOG_SAMPLE_RATE": 0, "BUDGETS": {"items-list": {"queries": 0}}}
+    )
+    def test_budget_exceeded_logs_warning(self):
+        with self.assertLogs("backend_api.metrics", level="WARNING") as logs:
+            self.client.get(self.url_list)
+        self.assertIn("items-list", logs.output[0])
+        self.assertIn('"exceeded"', logs.output[0])
+
+    @override_settings(REQUEST_METRICS={"LOG_SAMPLE_RATE": 1})
+    def test_sampled_log_line(self):
+        with self.assertLogs("backend_api.metrics", level="INFO") as logs:
+            self.client.get(self.url_list)
+        self.assertIn('"endpoint": "items-list"', logs.output[0])
+
+    @override_settings(REQUEST_METRICS={"ENABLED": False})
+    def test_disabled(self):
+        response = self.client.get(self.url_list)
+        self.assertFalse(response.has_header("Server-Timing"))
@@ -0,0 +1,142 @@
+# backend_api/tests/test_response_cache.py
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from backend_api.models import Contact, Tax, User
+from backend_api.utils import versions
+from backend_api.utils.cache_backends import CounterFileBasedCache, LRUFileBasedCache, LRULocMemCache
+
+
+class ResponseCacheTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_bench_data", companies=2, contacts=3, items=2, invoices=1, stdout=StringIO())
+        cls.user = User.objects.get(email="bench0@example.com")
+        cls.other_user = User.objects.get(email="bench1@example.com")
+
+    def setUp(self):
+        caches["responses"].clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_repeat_read_skips_database(self):
+        first = self.client.get("/api/contacts/")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/contacts/")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(len(second.data["data"]), 3)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get("/api/contacts/", {"ordering": "name"})
+        with self.assertNumQueries(0):
+            self.client.get("/api/contacts/", {"ordering": "name"})
+        response = self.client.get("/api/contacts/", {"ordering": "name", "search": "zzz-no-match"})
+        self.assertEqual(response.data["data"], [])
+
+    def test_write_invalidates_company_entries(self):
+        self.client.get("/api/contacts/")
+        contact = Contact.objects.filter(user=self.user).first()
+        detail = self.client.get(f"/api/contacts/{contact.pk}/")
+        self.assertEqual(detail.status_code, 200)
+
+        contact.name = "Renamed Contact"
+        contact.save()
+
+        self.assertEqual(self.client.get(f"/api/contacts/{contact.pk}/").data["data"]["name"], "Renamed Contact")
+        names = [row["name"] for row in self.client.get("/api/contacts/").data["data"]]
+        self.assertIn("Renamed Contact", names)
+
+    def test_writes_in_other_models_keep_entries(self):
+        self.client.get("/api/contacts/")
+        Tax.objects.create(company=self.user.company, name="GST 18", rate=18)
+        with self.assertNumQueries(0):
+            self.client.get("/api/contacts/")
+
+    def test_companies_do_not_share_entries(self):
+        own = self.client.get("/api/contacts/")
+        self.client.force_authenticate(user=self.other_user)
+        other = self.client.get("/api/contacts/")
+        own_ids = {row["id"] for row in own.data["data"]}
+        other_ids = {row["id"] for row in other.data["data"]}
+        self.assertFalse(own_ids & other_ids)
+
+    def test_write_in_another_worker_invalidates_entries(self):
+        self.client.get("/api/contacts/")
+        contact = Contact.objects.filter(user=self.user).first()
+        Contact.objects.filter(pk=contact.pk).update(name="Renamed Elsewhere")
+        # another process bumps the shared counter; this one's entries go stale
+        versions.get_cache().incr(f"version:c{self.user.company_id}:backend_api.contact")
+
+        names = [row["name"] for row in self.client.get("/api/contacts/").data["data"]]
+        self.assertIn("Renamed Elsewhere", names)
+
+    def test_streamed_lists_are_not_cached(self):
+        self.client.get("/api/contacts/")
+        self.assertTrue(self.client.get("/api/contacts/", {"stream": "true"}).streaming)
+
+
+class LRUCacheBackendTestCase(SimpleTestCase):
+    def assert_evicts_least_recently_used(self, cache):
+        cache.set("a", "x" * 10)
+        cache.set("b", "x" * 10)
+        cache.set("c", "x" * 10)
+        cache.get("a")  # "b" is now the least recently used
+        cache.set("d", "x" * 10)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("d"))
+
+    def test_locmem_entry_limit(self):
+        cache = LRULocMemCache("lru-entries", {"OPTIONS": {"MAX_ENTRIES": 3}})
+        cache.clear()
+        self.assert_evicts_least_recently_used(cache)
+
+    def test_locmem_byte_limit(self):
+        cache = LRULocMemCache("lru-bytes", {"OPTIONS": {"MAX_ENTRIES": 100, "MAX_BYTES": 200}})
+        cache.clear()
+        for n in range(10):
+            cache.set(f"key-{n}", "x" * 50)
+        self.assertLessEqual(cache.size_bytes(), 200)
+        self.assertIsNotNone(cache.get("key-9"))
+        self.assertIsNone(cache.get("key-0"))
+
+    def test_file_entry_limit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = LRUFileBasedCache(directory, {"OPTIONS": {"MAX_ENTRIES": 3}})
+            # filesystem mtimes can be coarse: age the entries explicitly
+            cache.set("a", "x" * 10)
+            cache.set("b", "x" * 10)
+            cache.set("c", "x" * 10)
+            for offset, key in enumerate(("a", "b", "c")):
+                os.utime(cache._key_to_file(key), (1000 + offset, 1000 + offset))
+            cache.get("a")
+            cache.set("d", "x" * 10)
+            self.assertIsNotNone(cache.get("a"))
+            self.assertIsNone(cache.get("b"))
+            self.assertIsNotNone(cache.get("d"))
+
+
+class VersionStoreTestCase(SimpleTestCase):
+    def test_file_counters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = CounterFileBasedCache(directory, {})
+            self.assertTrue(cache.add("v", 1))
+            self.assertFalse(cache.add("v", 5))
+            self.assertEqual(cache.incr("v"), 2)
+            self.assertEqual(CounterFileBasedCache(directory, {}).get("v"), 2)
+            with self.assertRaises(ValueError):
+                cache.incr("missing")
+
+    def test_per_process_store_refused_with_several_workers(self):
+        locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "versions-test"}
+        with override_settings(CACHES={"versions": locmem}, VERSIONS={"CACHE_ALIAS": "versions", "WORKERS": 4}):
+            with self.assertRaises(ImproperlyConfigured):
+                versions.check_shared()
+        with override_settings(CACHES={"versions": locmem}, VERSIONS={"CACHE_ALIAS": "versions", "WORKERS": 1}):
+            versions.check_shared()
@@ -0,0 +1,48 @@
+# backend_api/tests/test_streaming_list.py
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from backend_api.models import User
+
+
+@override_settings(STREAMING_LIST_CHUNK_SIZE=3)
+class StreamingListTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_bench_data",
+            companies=1, contacts=7, items=4, invoices=5, lines=2, accounts=1, transactions=2, seed=5,
+            stdout=StringIO(),
+        )
+        cls.user = User.objects.get(email="bench0@example.com")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def test_streamed_body_matches_buffered_body(self):
+        for url in ("/api/contacts/", "/api/invoices/", "/api/items/", "/api/roles/"):
+            with self.subTest(url=url):
+                buffered = self.client.get(url)
+                streamed = self.client.get(url, {"stream": "true"})
+                self.assertFalse(buffered.streaming)
+                self.assertTrue(streamed.streaming)
+                self.assertEqual(streamed["Content-Type"], "application/json")
+                self.assertEqual(b"".join(streamed.streaming_content), buffered.content)
+
+    def test_rows_are_sent_in_chunks(self):
+        response = self.client.get("/api/contacts/", {"stream": "1"})
+        parts = list(response.streaming_content)
+        # envelope, three chunks of at most 3 rows, closing bracket
+        self.assertEqual(len(parts), 5)
+        self.assertTrue(parts[0].startswith(b'{"success":true'))
+        body = json.loads(b"".join(parts))
+        self.assertEqual(len(body["data"]), 7)
+
+    @override_settings(STREAMING_LIST_RESPONSES=True)
+    def test_setting_streams_by_default(self):
+        self.assertTrue(self.client.get("/api/contacts/").streaming)
+        self.assertFalse(self.client.get("/api/contacts/", {"stream": "false"}).streaming)
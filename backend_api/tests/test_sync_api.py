@@ -0,0 +1,128 @@
+# backend_api/tests/test_sync_api.py
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend_api.models import Account, ChangeLog, Contact, Income, Invoice, Items, User
+
+
+@override_settings(SYNC={"PAGE_SIZE": 500, "SETTLE_SECONDS": 0})
+class SyncAPITestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_bench_data",
+            companies=2, contacts=3, items=2, invoices=2, lines=2, accounts=1, transactions=2,
+            stdout=StringIO(),
+        )
+        cls.user = User.objects.get(email="bench0@example.com")
+        cls.other_user = User.objects.get(email="bench1@example.com")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def sync(self, **params):
+        response = self.client.get("/api/sync/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.data["data"]
+
+    def test_snapshot_without_cursor(self):
+        data = self.sync()
+        self.assertEqual(len(data["changes"]["contacts"]["upserted"]), 3)
+        self.assertEqual(len(data["changes"]["invoices"]["upserted"]), 2)
+        self.assertTrue(data["changes"]["invoices"]["upserted"][0]["items"])
+        self.assertEqual(data["changes"]["contacts"]["deleted"], [])
+
+    def test_only_changes_after_cursor_are_sent(self):
+        cursor = self.sync()["cursor"]
+        self.assertEqual(self.sync(cursor=cursor)["changes"], {})
+
+        contact = Contact.objects.filter(user=self.user).first()
+        contact.name = "Changed Name"
+        contact.save()
+        item = Items.objects.filter(user=self.user).first()
+        item_id = item.pk
+        item.delete()
+
+        data = self.sync(cursor=cursor)
+        self.assertEqual(list(data["changes"]), ["contacts", "items"])
+        self.assertEqual([row["name"] for row in data["changes"]["contacts"]["upserted"]], ["Changed Name"])
+        self.assertEqual(data["changes"]["items"], {"upserted": [], "deleted": [str(item_id)]})
+        self.assertGreater(data["cursor"], cursor)
+
+        self.assertEqual(self.sync(cursor=data["cursor"])["changes"], {})
+
+    def test_transactions_resend_their_account(self):
+        cursor = self.sync()["cursor"]
+        account = Account.objects.filter(user=self.user).first()
+        Income.objects.create(user=self.user, account=account, category="Sales", amount=Decimal("10.00"), date="2025-01-15")
+
+        changes = self.sync(cursor=cursor)["changes"]
+        self.assertEqual(len(changes["incomes"]["upserted"]), 1)
+        self.assertEqual(changes["accounts"]["upserted"][0]["id"], account.pk)
+
+    def test_deleting_a_contact_tombstones_its_invoices(self):
+        cursor = self.sync()["cursor"]
+        invoice = Invoice.objects.filter(user=self.user).first()
+        invoice.contact.delete()
+
+        changes = self.sync(cursor=cursor)["changes"]
+        self.assertIn(str(invoice.pk), changes["invoices"]["deleted"])
+        self.assertIn(str(invoice.contact_id), changes["contacts"]["deleted"])
+
+    def test_paging_with_limit(self):
+        cursor = self.sync()["cursor"]
+        for contact in Contact.objects.filter(user=self.user):
+            contact.save()
+
+        first = self.sync(cursor=cursor, limit=2)
+        self.assertTrue(first["has_more"])
+        second = self.sync(cursor=first["cursor"], limit=2)
+        self.assertFalse(second["has_more"])
+        synced = first["changes"]["contacts"]["upserted"] + second["changes"]["contacts"]["upserted"]
+        self.assertEqual(len(synced), 3)
+
+    def test_full_page_only_acknowledges_settled_entries(self):
+        cursor = self.sync()["cursor"]
+        contacts = list(Contact.objects.filter(user=self.user).order_by("pk"))
+        for contact in contacts:
+            contact.save()
+        entries = list(ChangeLog.objects.filter(id__gt=cursor).order_by("id").values_list("id", flat=True))
+        # the page's tail is still unsettled: a lower id could yet commit before it
+        ChangeLog.objects.filter(id=entries[1]).update(created_at=timezone.now() + timedelta(minutes=1))
+
+        with override_settings(SYNC={"PAGE_SIZE": 500, "SETTLE_SECONDS": 5}):
+            ChangeLog.objects.filter(id=entries[0]).update(created_at=timezone.now() - timedelta(minutes=1))
+            page = self.sync(cursor=cursor, limit=2)
+            self.assertTrue(page["has_more"])
+            self.assertEqual(page["cursor"], entries[0])
+
+            # nothing settled on the page: same cursor, still more to come
+            ChangeLog.objects.filter(id=entries[0]).update(created_at=timezone.now())
+            page = self.sync(cursor=cursor, limit=2)
+            self.assertTrue(page["has_more"])
+            self.assertEqual(page["cursor"], cursor)
+            self.assertEqual(len(page["changes"]["contacts"]["upserted"]), 2)
+
+    def test_tenants_are_isolated(self):
+        cursor = self.sync()["cursor"]
+        Contact.objects.filter(user=self.other_user).first().save()
+        self.assertEqual(self.sync(cursor=cursor)["changes"], {})
+        self.assertTrue(ChangeLog.objects.exclude(scope=f"c{self.user.company_id}").exists())
+
+    def test_module_permissions_limit_models(self):
+        staff = User.objects.create(
+            email="staff@example.com", company=self.user.company, role="STAFF", permissions={"contacts": True}
+        )
+        self.client.force_authenticate(user=staff)
+        self.assertEqual(list(self.sync()["changes"]), ["contacts"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/sync/", {"cursor": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
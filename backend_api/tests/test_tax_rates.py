@@ -0,0 +1,67 @@
+# backend_api/tests/test_tax_rates.py
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend_api.models import Company, Contact, InvoiceItem, Items, Tax, User
+from backend_api.utils import tax_rates, versions
+
+
+class InvoiceTaxRateTestCase(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Acme")
+        self.user = User.objects.create(email="tax@example.com", company=self.company, role="COMPANY_ADMIN")
+        self.client.force_authenticate(user=self.user)
+        self.contact = Contact.objects.create(user=self.user, name="Buyer", mobile="9000000001")
+        self.gst12 = Tax.objects.create(company=self.company, name="GST 12%", rate=Decimal("12.00"))
+        self.item = Items.objects.create(user=self.user, name="Widget", rate=Decimal("100.00"), tax_category="gst-18")
+
+    def create_invoice(self, *lines):
+        payload = {"contact": self.contact.pk, "invoice_type": "default", "supply_type": "regular", "items": list(lines)}
+        return self.client.post(reverse("invoice-list"), payload, format="json")
+
+    def test_tax_rate_wins(self):
+        response = self.create_invoice({"description": "A", "rate": 100, "tax": str(self.gst12.pk), "gst_percentage": 5})
+        self.assertEqual(response.status_code, 201, response.data)
+        line = InvoiceItem.objects.get()
+        self.assertEqual((line.tax_id, line.gst_percentage, line.tax_amount), (self.gst12.pk, Decimal("12.00"), Decimal("12.00")))
+
+    def test_item_category_fallback(self):
+        response = self.create_invoice({"item_id": self.item.pk}, {"description": "Untaxed", "rate": 10})
+        self.assertEqual(response.status_code, 201, response.data)
+        rates = sorted(InvoiceItem.objects.values_list("gst_percentage", flat=True))
+        self.assertEqual(rates, [Decimal("0"), Decimal("18")])
+
+    def test_other_company_tax_rejected(self):
+        other = Tax.objects.create(company=Company.objects.create(name="Other"), name="GST 28%", rate=28)
+        for value in (str(other.pk), "not-a-uuid"):
+            response = self.create_invoice({"description": "A", "rate": 100, "tax": value})
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(InvoiceItem.objects.exists())
+
+    def test_no_tax_query_per_line(self):
+        tax_rates.get_tax_rates(self.company.pk)
+        line = {"description": "A", "rate": 100, "tax": str(self.gst12.pk)}
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.create_invoice(*[line] * 5).status_code, 201)
+        tax_queries = [q["sql"] for q in queries.captured_queries if 'FROM "backend_api_tax"' in q["sql"]]
+        self.assertEqual(tax_queries, [])
+
+    def test_tax_change_reloads_table(self):
+        self.assertEqual(tax_rates.get_tax_rates(self.company.pk)[self.gst12.pk], Decimal("12.00"))
+        response = self.client.patch(reverse("tax-detail", kwargs={"pk": self.gst12.pk}), {"rate": "15.00"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(tax_rates.get_tax_rates(self.company.pk)[self.gst12.pk], Decimal("15.00"))
+
+        self.client.delete(reverse("tax-detail", kwargs={"pk": self.gst12.pk}))
+        self.assertNotIn(self.gst12.pk, tax_rates.get_tax_rates(self.company.pk))
+
+    def test_change_in_another_worker_reloads_table(self):
+        tax_rates.get_tax_rates(self.company.pk)
+        Tax.objects.filter(pk=self.gst12.pk).update(rate=Decimal("15.00"))
+        # the other worker's signal only reaches this process through the shared counter
+        versions.get_cache().incr(f"tax_rates:version:{self.company.pk}")
+        self.assertEqual(tax_rates.get_tax_rates(self.company.pk)[self.gst12.pk], Decimal("15.00"))
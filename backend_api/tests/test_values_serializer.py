@@ -0,0 +1,83 @@
+# backend_api/tests/test_values_serializer.py
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import DecimalField
+from django.db.models.sql.compiler import SQLCompiler
+from django.db.models.sql.constants import MULTI
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from backend_api.models import Contact, Expense, Income, Invoice, Items
+from backend_api.serializers import (
+    ContactSerializer,
+    ExpenseSerializer,
+    IncomeSerializer,
+    InvoiceSerializer,
+    ItemSerializer,
+)
+from backend_api.serializers import values
+from backend_api.serializers.values import check_compiler, get_values_serializer
+
+
+class ValuesSerializerTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_bench_data",
+            companies=1, contacts=6, items=5, invoices=2, lines=2, accounts=2, transactions=6, seed=3,
+            stdout=StringIO(),
+        )
+
+    def test_output_matches_model_serializer(self):
+        for serializer_class, model in (
+            (ContactSerializer, Contact),
+            (ItemSerializer, Items),
+            (IncomeSerializer, Income),
+            (ExpenseSerializer, Expense),
+        ):
+            with self.subTest(serializer=serializer_class.__name__):
+                queryset = model.objects.order_by("pk")
+                values_serializer = get_values_serializer(serializer_class)
+                self.assertIsNotNone(values_serializer)
+                self.assertEqual(
+                    JSONRenderer().render(values_serializer.serialize(queryset)),
+                    JSONRenderer().render(serializer_class(queryset, many=True).data),
+                )
+
+    def test_nested_serializer_is_not_supported(self):
+        self.assertIsNone(get_values_serializer(InvoiceSerializer))
+        self.assertTrue(Invoice.objects.exists())
+
+    def test_compiler_internals_are_as_expected(self):
+        # iter_chunks() relies on private SQLCompiler API: fail here, not in
+        # production, when a Django upgrade changes it
+        check_compiler()
+        queryset = Items.objects.values_list("rate", "name")
+        compiler = queryset.query.get_compiler(using=queryset.db)
+        chunks = compiler.execute_sql(MULTI, chunked_fetch=False, chunk_size=100)
+        self.assertTrue(list(chunks))
+        self.assertEqual(compiler.col_count, 2)
+        self.assertTrue(all(len(entry) == 3 for entry in compiler.select))
+
+        columns = [column for column, _, _ in compiler.select[: compiler.col_count]]
+        converters = compiler.get_converters(columns)
+        self.assertIsInstance(converters, dict)
+        for index, (functions, expression) in converters.items():
+            self.assertIn(index, (0, 1))
+            self.assertIsInstance(functions, list)
+            self.assertTrue(all(callable(function) for function in functions))
+            self.assertIs(expression, columns[index])
+        if 0 in converters:
+            self.assertIsInstance(converters[0][1].output_field, DecimalField)
+
+    def test_changed_compiler_falls_back_to_drf(self):
+        def get_converters(self, expressions, extra):
+            return {}
+
+        with (
+            mock.patch.dict(values._values_serializers, clear=True),
+            mock.patch.object(SQLCompiler, "get_converters", get_converters),
+        ):
+            self.assertIsNone(get_values_serializer(ItemSerializer))
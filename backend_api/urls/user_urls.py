@@ -8,6 +8,11 @@ from backend_api.views.role_views import RoleViewSet
 from backend_api.views.tax_views import TaxViewSet
 
 from backend_api.views.profile_views import UserProfileView, ChangePasswordView, CompanyProfileView, ProfileImageView
+from backend_api.views.sync_views import SyncView
+from backend_api.views.batch_views import BatchView
+from backend_api.views.job_views import JobStatusView
+from backend_api.views.monitoring_views import DatabasePoolStatsView
+from backend_api.views.geo_views import CitySearchView, NearestCityView
 
 router = DefaultRouter()
 
@@ -35,4 +40,11 @@ urlpatterns = [
     path("profile/image/", ProfileImageView.as_view(), name="profile-image"),
     path("profile/change-password/", ChangePasswordView.as_view(), name="change-password"),
     path("company/", CompanyProfileView.as_view(), name="company-profile"),
+    path("sync/", SyncView.as_view(), name="sync"),
+    path("batch/", BatchView.as_view(), name="batch"),
+    path("jobs/", JobStatusView.as_view(), name="job-status-list"),
+    path("jobs/<int:pk>/", JobStatusView.as_view(), name="job-status"),
+    path("metrics/db-pool/", DatabasePoolStatsView.as_view(), name="db-pool-stats"),
+    path("geo/cities/", CitySearchView.as_view(), name="city-search"),
+    path("geo/nearest/", NearestCityView.as_view(), name="nearest-city"),
 ]
@@ -0,0 +1,86 @@
+# backend_api/utils/benchmark.py
+import math
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (pct in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms, query_counts):
+    return {
+        "runs": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "max_ms": round(max(samples_ms), 3),
+        "queries": max(query_counts),
+    }
+
+
+class EndpointBenchmark:
+    """
+    Drives API endpoints in-process through the DRF test client as `user`.
+    - Each endpoint is called `warmup` times unmeasured, then `iterations` times.
+    - Reports p50/p95 latency and the query count per endpoint.
+    """
+
+    def __init__(self, user, iterations=20, warmup=2):
+        self.user = user
+        self.iterations = iterations
+        self.warmup = warmup
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+    def measure(self, path, method="get", data=None):
+        call = getattr(self.client, method)
+        samples, queries = [], []
+        status_code = None
+
+        for _ in range(self.warmup):
+            call(path, data, format="json")
+
+        for _ in range(self.iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = call(path, data, format="json")
+                samples.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured.captured_queries))
+            status_code = response.status_code
+
+        return {"path": path, "method": method.upper(), "status": status_code, **summarize(samples, queries)}
+
+    def run(self, endpoints):
+        """`endpoints` maps a label to a path (or a (method, path, data) tuple)."""
+        results = {}
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for label, target in endpoints.items():
+                if isinstance(target, str):
+                    results[label] = self.measure(target)
+                else:
+                    method, path, data = target
+                    results[label] = self.measure(path, method, data)
+        return results
+
+
+def compare_results(baseline, current):
+    """Per-endpoint change in p50/p95/queries between two benchmark runs."""
+    diff = {}
+    for label, result in current.items():
+        before = baseline.get(label)
+        if not before:
+            continue
+        diff[label] = {
+            key: round(result[key] - before[key], 3)
+            for key in ("p50_ms", "p95_ms", "queries")
+            if result.get(key) is not None and before.get(key) is not None
+        }
+    return diff
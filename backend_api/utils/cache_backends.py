@@ -0,0 +1,166 @@
+# backend_api/utils/cache_backends.py
+"""
+Django cache backends with least-recently-used eviction and a byte budget.
+
+The LRU backends accept the usual MAX_ENTRIES option plus MAX_BYTES (0 = no
+byte limit):
+
+    "BACKEND": "backend_api.utils.cache_backends.LRULocMemCache",
+    "OPTIONS": {"MAX_ENTRIES": 5000, "MAX_BYTES": 64 * 1024 * 1024},
+"""
+import os
+import pickle
+import zlib
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files import locks
+
+# Bytes held per named LocMem cache, shared like LocMemCache's own stores
+_sizes = {}
+
+
+class LRULocMemCache(LocMemCache):
+    """
+    LocMemCache keeps entries most-recent-first already; this evicts strictly
+    from the least recently used end, one entry at a time, until both
+    MAX_ENTRIES and MAX_BYTES are respected.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get("OPTIONS", {})
+        self._max_bytes = int(options.get("MAX_BYTES", 0))
+        self._sizes = _sizes.setdefault(name, {"total": 0, "entries": {}})
+
+    def size_bytes(self):
+        return self._sizes["total"]
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._delete(key)
+        while self._cache and (
+            len(self._cache) >= self._max_entries
+            or (self._max_bytes and self._sizes["total"] + len(value) > self._max_bytes)
+        ):
+            self._pop_lru()
+        self._cache[key] = value
+        self._cache.move_to_end(key, last=False)
+        self._expire_info[key] = self.get_backend_timeout(timeout)
+        self._sizes["entries"][key] = len(value)
+        self._sizes["total"] += len(value)
+
+    def incr(self, key, delta=1, version=None):
+        value = super().incr(key, delta, version)
+        full_key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if full_key in self._cache:
+                size = len(self._cache[full_key])
+                self._sizes["total"] += size - self._sizes["entries"].get(full_key, 0)
+                self._sizes["entries"][full_key] = size
+        return value
+
+    def _pop_lru(self):
+        key, _ = self._cache.popitem()
+        self._expire_info.pop(key, None)
+        self._sizes["total"] -= self._sizes["entries"].pop(key, 0)
+
+    def _delete(self, key):
+        if not super()._delete(key):
+            return False
+        self._sizes["total"] -= self._sizes["entries"].pop(key, 0)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._expire_info.clear()
+            self._sizes["entries"].clear()
+            self._sizes["total"] = 0
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache that culls by last access instead of at random. A hit
+    touches the file's mtime; culling removes the oldest files until there is
+    room for one more entry under MAX_ENTRIES and the directory is under
+    MAX_BYTES. Safe to share between worker processes on one host.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        options = params.get("OPTIONS", {})
+        self._max_bytes = int(options.get("MAX_BYTES", 0))
+
+    def get(self, key, default=None, version=None):
+        fname = self._key_to_file(key, version)
+        try:
+            with open(fname, "rb") as f:
+                if self._is_expired(f):
+                    return default
+                value = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return default
+        try:
+            os.utime(fname)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def _cull(self):
+        entries = []
+        for fname in self._list_cache_files():
+            try:
+                stat = os.stat(fname)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, fname))
+
+        total = sum(size for _, size, _ in entries)
+        if len(entries) < self._max_entries and (not self._max_bytes or total < self._max_bytes):
+            return
+
+        entries.sort()
+        count = len(entries)
+        for _, size, fname in entries:
+            if count < self._max_entries and (not self._max_bytes or total < self._max_bytes):
+                break
+            if self._delete(fname):
+                count -= 1
+                total -= size
+
+    def size_bytes(self):
+        total = 0
+        for fname in self._list_cache_files():
+            try:
+                total += os.path.getsize(fname)
+            except FileNotFoundError:
+                pass
+        return total
+
+
+class CounterFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache for counters shared by the worker processes of one host:
+    add() and incr() hold an exclusive lock on the cache directory, so two
+    workers never both create a key or lose one of two increments.
+    """
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self._dir, 0o700, exist_ok=True)
+        with open(os.path.join(self._dir, "counters.lock"), "ab") as lock_file:
+            locks.lock(lock_file, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(lock_file)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._locked():
+            return super().add(key, value, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        with self._locked():
+            return super().incr(key, delta, version)
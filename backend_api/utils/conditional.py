@@ -0,0 +1,222 @@
+# backend_api/utils/conditional.py
+"""
+ETags and conditional requests for the router viewsets.
+
+ETags are computed before the view runs whenever that is cheap, so a matching
+If-None-Match returns 304 without touching the serializer:
+- list: the response-cache fingerprint (tenant version counters, shared by
+  all workers, see versions.py), or max(updated_at) + count of the filtered
+  queryset when the cache is off
+- detail: the row's updated_at (+ versions of other models it shows), or the
+  fingerprint for models without updated_at
+Otherwise the ETag is a hash of the serialized data, set after the view.
+
+If-Match on PUT/PATCH is checked against the same detail ETag (412 on
+mismatch), with the row locked from the check through the write.
+"""
+import hashlib
+from functools import wraps
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from backend_api.utils.response_cache import (
+    get_cache_models,
+    get_request_fingerprint,
+    get_versions,
+    is_enabled,
+    scope_for_user,
+)
+from backend_api.utils.response_utils import error_response
+
+
+def make_etag(parts):
+    return '"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def content_etag(data):
+    return '"%s"' % hashlib.sha1(JSONRenderer().render(data)).hexdigest()
+
+
+def etag_matches(etag, header):
+    """Weak comparison, as If-None-Match requires."""
+    if header.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in parse_etags(header)}
+
+
+def _has_updated_at(model):
+    try:
+        model._meta.get_field("updated_at")
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _payload(response):
+    """The `data` part of a success_response envelope."""
+    if isinstance(response.data, dict) and "data" in response.data:
+        return response.data["data"]
+    return response.data
+
+
+# -----------------------------
+# PRECOMPUTED ETAGS
+# -----------------------------
+def get_list_etag(view, request):
+    if getattr(view, "cache_per_user", False):
+        return None
+
+    fingerprint = get_request_fingerprint(view, request)
+    if fingerprint is not None:
+        return make_etag(["list", fingerprint, request.accepted_media_type])
+
+    model = view.get_queryset().model
+    if get_cache_models(view) != (model,) or not _has_updated_at(model):
+        return None
+    queryset = view.filter_queryset(view.get_queryset()).order_by()
+    summary = queryset.aggregate(last_updated=Max("updated_at"), count=Count("pk"))
+    params = sorted((key, request.query_params.getlist(key)) for key in request.query_params)
+    return make_etag([
+        "list",
+        model._meta.label_lower,
+        summary["count"],
+        summary["last_updated"].isoformat() if summary["last_updated"] else None,
+        params,
+        request.accepted_media_type,
+    ])
+
+
+def get_detail_etag(view, request, kwargs):
+    if getattr(view, "cache_per_user", False):
+        return None
+
+    queryset = view.get_queryset()
+    model = queryset.model
+    if not _has_updated_at(model):
+        fingerprint = get_request_fingerprint(view, request)
+        if fingerprint is None:
+            return None
+        # identical for retrieve and update, so If-Match sees GET's ETag
+        fingerprint[3] = "detail"
+        return make_etag(["detail", fingerprint, request.accepted_media_type])
+
+    lookup = kwargs.get(view.lookup_url_kwarg or view.lookup_field)
+    try:
+        updated_at = (
+            queryset.filter(**{view.lookup_field: lookup})
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+    except (ValueError, ValidationError):
+        return None
+    if updated_at is None:
+        return None
+
+    versions = ()
+    if is_enabled():
+        others = getattr(view, "detail_etag_models", None)
+        if others is None:
+            others = [other for other in get_cache_models(view) if other is not model]
+        versions = get_versions(scope_for_user(request.user), others, include_scope=False)
+    return make_etag([
+        "detail",
+        model._meta.label_lower,
+        str(lookup),
+        updated_at.isoformat(),
+        versions,
+        request.accepted_media_type,
+    ])
+
+
+# -----------------------------
+# VIEW DECORATORS
+# -----------------------------
+def conditional_response(view_method):
+    """
+    ETag + If-None-Match for list/retrieve. Apply outside @cache_response so
+    a 304 skips the cache lookup too.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return view_method(self, request, *args, **kwargs)
+
+        header = request.META.get("HTTP_IF_NONE_MATCH")
+        if self.action == "list":
+            etag = get_list_etag(self, request)
+        else:
+            etag = get_detail_etag(self, request, kwargs)
+        if etag and header and etag_matches(etag, header):
+            return not_modified(etag)
+
+        response = view_method(self, request, *args, **kwargs)
+        if not isinstance(response, Response) or response.status_code != 200:
+            return response
+        if etag is None:
+            etag = content_etag(_payload(response))
+            if header and etag_matches(etag, header):
+                return not_modified(etag)
+        response["ETag"] = etag
+        return response
+
+    return wrapper
+
+
+def check_if_match(view_method):
+    """
+    Optimistic concurrency for update (PUT and PATCH): when the request has an
+    If-Match header, the object's current ETag must be listed in it, and the
+    response carries the updated object's ETag.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        header = request.META.get("HTTP_IF_MATCH")
+        if header is None:
+            return view_method(self, request, *args, **kwargs)
+
+        # check and write under the row lock, so two writers holding the same
+        # ETag cannot both pass the check
+        with transaction.atomic():
+            _lock_object(self, kwargs)
+            current = get_detail_etag(self, request, kwargs)
+            if current is None:
+                current = content_etag(self.get_serializer(self.get_object()).data)
+            if header.strip() != "*" and current not in parse_etags(header):
+                return error_response(
+                    "This record was changed by someone else. Reload it and try again.",
+                    status.HTTP_412_PRECONDITION_FAILED,
+                )
+            response = view_method(self, request, *args, **kwargs)
+
+        if isinstance(response, Response) and response.status_code == 200:
+            # the new ETag, so the client can chain its next conditional write
+            etag = get_detail_etag(self, request, kwargs)
+            response["ETag"] = etag or content_etag(_payload(response))
+        return response
+
+    return wrapper
+
+
+def _lock_object(view, kwargs):
+    """Lock the object's row (only its own table) until the transaction ends."""
+    lookup = kwargs.get(view.lookup_url_kwarg or view.lookup_field)
+    queryset = view.get_queryset().filter(**{view.lookup_field: lookup}).order_by()
+    try:
+        list(queryset.select_for_update(of=("self",)).values_list("pk", flat=True))
+    except (ValueError, ValidationError):
+        # not a valid key: the view answers 404
+        pass
+
+
+def not_modified(etag):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,210 @@
+# backend_api/utils/contact_items.py
+"""
+Items billed to each contact (ContactItemUsage), for pre-filling invoice lines.
+
+Every invoice written for a contact counts once for each item on it (`uses`),
+adds the lines' quantity and, when it is the contact's latest invoice with
+the item, records the rate, discount and GST of its last line of that item.
+Replacing the lines or deleting the invoice takes the uses and quantity back;
+the remembered terms stay those of the latest invoice seen.
+
+Writes lock the affected rows with one query and write them back with at most
+one bulk update, one bulk create and one delete. Queryset deletes and other
+bulk writes are followed by rebuild_contact_items().
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+
+from backend_api.models import ContactItemUsage, Invoice
+from backend_api.utils.response_cache import scope_for_instance
+
+TERMS = ("last_rate", "last_discount", "last_gst_percentage")
+
+
+# -----------------------------
+# INCREMENTAL UPDATES
+# -----------------------------
+def line_usage(lines):
+    """{item id: [uses, quantity, rate, discount, gst_percentage]} of one invoice's lines."""
+    usage = {}
+    for line in lines:
+        if not line.item_id_id:
+            continue
+        quantity = usage[line.item_id_id][1] if line.item_id_id in usage else 0
+        usage[line.item_id_id] = [1, quantity + line.quantity, line.rate, line.discount, line.gst_percentage]
+    return usage
+
+
+def _write(scope, contact_id, day, usage, sign):
+    existing = {
+        row.item_id: row
+        for row in ContactItemUsage.objects.select_for_update().filter(contact_id=contact_id, item_id__in=usage)
+    }
+    changed, created, emptied = [], [], []
+    for item_id, (uses, quantity, *terms) in usage.items():
+        row = existing.get(item_id)
+        if sign < 0:
+            if row is None:
+                continue
+            if row.uses <= uses:
+                emptied.append(row.pk)
+                continue
+            row.uses -= uses
+            row.quantity -= quantity
+            changed.append(row)
+            continue
+
+        if row is None:
+            row = ContactItemUsage(scope=scope, contact_id=contact_id, item_id=item_id, last_used=day)
+            created.append(row)
+        else:
+            changed.append(row)
+        row.uses += uses
+        row.quantity += quantity
+        if day >= row.last_used:
+            row.last_used = day
+            row.last_rate, row.last_discount, row.last_gst_percentage = terms
+
+    if changed:
+        ContactItemUsage.objects.bulk_update(changed, ["uses", "quantity", "last_used", *TERMS])
+    if created:
+        ContactItemUsage.objects.bulk_create(created)
+    if emptied:
+        ContactItemUsage.objects.filter(pk__in=emptied).delete()
+
+
+def apply_usage(scope, contact_id, day, usage, sign=1):
+    """Add (sign=1) or take back (sign=-1) one invoice's line_usage() for the contact."""
+    if scope is None or not usage:
+        return
+    try:
+        with transaction.atomic():
+            _write(scope, contact_id, day, usage, sign)
+    except IntegrityError:
+        # a concurrent write created one of the rows first; it is visible now
+        with transaction.atomic():
+            _write(scope, contact_id, day, usage, sign)
+
+
+def record_contact_usage(invoice, lines, sign=1):
+    apply_usage(scope_for_instance(invoice), invoice.contact_id, invoice.invoice_date, line_usage(lines), sign)
+
+
+# -----------------------------
+# WHOLE INVOICES
+# -----------------------------
+def iter_invoice_lines(invoices, chunk_size=2000):
+    """
+    (scope, contact id, invoice id, invoice date, item id, quantity, rate,
+    discount, gst_percentage) of every line with an item on the `invoices`
+    queryset, oldest invoice first, from one streamed query.
+    """
+    line_values = (
+        Invoice.items.through.objects.filter(invoice__in=invoices.values("pk"), invoiceitem__item_id__isnull=False)
+        .order_by("invoice__invoice_date", "invoice_id", "invoiceitem_id")
+        .values_list(
+            "invoice__user_id",
+            "invoice__user__company_id",
+            "invoice__contact_id",
+            "invoice_id",
+            "invoice__invoice_date",
+            "invoiceitem__item_id",
+            "invoiceitem__quantity",
+            "invoiceitem__rate",
+            "invoiceitem__discount",
+            "invoiceitem__gst_percentage",
+        )
+    )
+    for user_id, company_id, *values in line_values.iterator(chunk_size=chunk_size):
+        yield (f"c{company_id}" if company_id else f"u{user_id}", *values)
+
+
+def _sum_usage(invoices, chunk_size=2000):
+    """{(scope, contact id, item id): [uses, quantity, last used, rate, discount, gst_percentage]}."""
+    totals = {}
+    last_invoice = {}
+    for scope, contact_id, invoice_id, day, item_id, quantity, *terms in iter_invoice_lines(invoices, chunk_size):
+        key = (scope, contact_id, item_id)
+        total = totals.setdefault(key, [0, 0, day, *terms])
+        if last_invoice.get(key) != invoice_id:
+            last_invoice[key] = invoice_id
+            total[0] += 1
+        total[1] += quantity
+        total[2:] = [day, *terms]
+    return totals
+
+
+def remove_invoices_usage(invoices):
+    """Take back the uses and quantities of the `invoices` queryset, e.g. before deleting them."""
+    by_contact = defaultdict(dict)
+    for (scope, contact_id, item_id), (uses, quantity, day, *terms) in _sum_usage(invoices).items():
+        by_contact[(scope, contact_id)][item_id] = [uses, quantity, *terms]
+    for (scope, contact_id), usage in by_contact.items():
+        apply_usage(scope, contact_id, None, usage, sign=-1)
+
+
+def rebuild_contact_items(invoices, chunk_size=2000):
+    """
+    Replace the ContactItemUsage of every scope with an invoice in `invoices`
+    by totals recomputed from those invoices, which must therefore be all of
+    each scope's invoices. Returns the number of rows written.
+    """
+    totals = _sum_usage(invoices, chunk_size)
+    scopes = {
+        f"c{company_id}" if company_id else f"u{user_id}"
+        for user_id, company_id in invoices.values_list("user_id", "user__company_id").distinct()
+    }
+    with transaction.atomic():
+        ContactItemUsage.objects.filter(scope__in=scopes).delete()
+        ContactItemUsage.objects.bulk_create(
+            (
+                ContactItemUsage(
+                    scope=scope,
+                    contact_id=contact_id,
+                    item_id=item_id,
+                    uses=uses,
+                    quantity=quantity,
+                    last_used=day,
+                    last_rate=rate,
+                    last_discount=discount,
+                    last_gst_percentage=gst_percentage,
+                )
+                for (scope, contact_id, item_id), (uses, quantity, day, rate, discount, gst_percentage) in totals.items()
+            ),
+            batch_size=chunk_size,
+        )
+    return len(totals)
+
+
+# -----------------------------
+# READS
+# -----------------------------
+def get_suggestions(scope, contact_id, limit=10, order_by="frequent"):
+    """
+    The contact's most billed ("frequent") or most recently billed ("recent")
+    items with their last terms, from one indexed query.
+    """
+    ordering = ("-uses", "-last_used") if order_by == "frequent" else ("-last_used", "-uses")
+    rows = (
+        ContactItemUsage.objects.filter(scope=scope, contact_id=contact_id)
+        .order_by(*ordering, "item_id")
+        .values(
+            "item_id", "item__name", "item__rate", "item__tax_category", "uses", "quantity", "last_used", *TERMS
+        )[:limit]
+    )
+    return [
+        {
+            "item_id": row["item_id"],
+            "name": row["item__name"],
+            "item_rate": str(row["item__rate"]),
+            "tax_category": row["item__tax_category"],
+            "uses": row["uses"],
+            "quantity": row["quantity"],
+            "last_used": row["last_used"].isoformat(),
+            "rate": str(row["last_rate"]),
+            "discount": str(row["last_discount"]),
+            "gst_percentage": str(row["last_gst_percentage"]),
+        }
+        for row in rows
+    ]
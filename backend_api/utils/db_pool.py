@@ -0,0 +1,42 @@
+# backend_api/utils/db_pool.py
+"""
+Connection pool introspection for DB_POOL deployments (PostgreSQL + psycopg 3).
+Stats are per process: each gunicorn worker has its own pool.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def is_pooled(alias=DEFAULT_DB_ALIAS):
+    connection = connections[alias]
+    return connection.vendor == "postgresql" and bool(connection.settings_dict.get("OPTIONS", {}).get("pool"))
+
+
+def get_pool_stats(alias=DEFAULT_DB_ALIAS):
+    """
+    in_use / available / waiting connections and the time requests spent
+    waiting for one, from psycopg_pool's counters.
+    """
+    if not is_pooled(alias):
+        return {"alias": alias, "pooled": False}
+
+    pool = connections[alias].pool
+    stats = pool.get_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    requests = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    return {
+        "alias": alias,
+        "pooled": True,
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "size": size,
+        "in_use": size - available,
+        "available": available,
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "wait_ms": wait_ms,
+        "avg_wait_ms": round(wait_ms / requests, 3) if requests else 0,
+        "timeouts": stats.get("requests_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
@@ -0,0 +1,119 @@
+# backend_api/utils/db_routing.py
+"""
+Read-replica routing.
+
+When REPLICA_DATABASE_URL configures a "replica" database, reads run there
+only inside replica_reads(), which ReplicaReadMixin enters for safe viewset
+actions (list and retrieve by default). Everything else, and every write,
+uses the primary.
+
+After a successful write request, ReplicaStickyMiddleware pins the writer's
+tenant (see response_cache.scope_for_user) to the primary for
+REPLICA["STICKY_SECONDS"], so users read their own writes even while the
+replica lags. Pinning the whole tenant also keeps responses cached in that
+window from being built from stale replica rows. The pin is kept in a cache
+every worker sees (check_sticky_shared()).
+
+Streamed list bodies run their queries after the view has returned; they
+read through iter_on_replica() so they stay on the replica too.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+
+from backend_api.utils.response_cache import scope_for_user
+from backend_api.utils.versions import is_shared
+
+REPLICA_ALIAS = "replica"
+
+_use_replica = ContextVar("use_replica", default=False)
+_DONE = object()
+
+
+def get_config():
+    return getattr(settings, "REPLICA", {})
+
+
+def has_replica():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_active():
+    return _use_replica.get()
+
+
+@contextmanager
+def replica_reads():
+    token = _use_replica.set(has_replica())
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def iter_on_replica(iterable):
+    """
+    Iterate `iterable` with replica reads on around each step only, for a
+    response body consumed after the view (and its replica_reads()) ended.
+    """
+    iterator = iter(iterable)
+    while True:
+        with replica_reads():
+            item = next(iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
+
+
+# -----------------------------
+# STICKY PRIMARY AFTER WRITES
+# -----------------------------
+def _sticky_key(scope):
+    return f"replica:sticky:{scope}"
+
+
+def get_sticky_cache():
+    return caches[get_config().get("CACHE_ALIAS", "versions")]
+
+
+def check_sticky_shared():
+    """Raise ImproperlyConfigured when a replica is set up but pins would stay in one process."""
+    if has_replica() and not is_shared(get_sticky_cache()):
+        raise ImproperlyConfigured(
+            "REPLICA_DATABASE_URL is set but REPLICA[\"CACHE_ALIAS\"] is a per-process cache: "
+            "use a cache shared by all workers (REPLICA_CACHE_ALIAS)."
+        )
+
+
+def stick_to_primary(user):
+    seconds = get_config().get("STICKY_SECONDS", 5)
+    if seconds:
+        get_sticky_cache().set(_sticky_key(scope_for_user(user)), True, seconds)
+
+
+def can_read_replica(user):
+    return has_replica() and not get_sticky_cache().get(_sticky_key(scope_for_user(user)), False)
+
+
+class ReplicaRouter:
+    """Reads go to the replica inside replica_reads(); writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # also for rows that were read from the replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
@@ -0,0 +1,330 @@
+# backend_api/utils/geo.py
+"""
+City lookups over `india cities.json` (settings.INDIA_CITIES_FILE).
+
+The JSON is compiled once into a compact binary index (`manage.py
+build_city_index`, or on first use when the file is missing or older than the
+JSON) which is then memory-mapped read-only. Lookups never parse JSON, and
+every worker process reads the same pages from the OS page cache instead of
+holding its own copy.
+
+File layout (little-endian):
+    header    magic b"HCIX", version u16, state count u16, city count u32
+    states    2-byte ASCII state code per state
+    keys      u32 offsets[count + 1], then the normalized names (UTF-8)
+    names     u32 offsets[count + 1], then the display names (UTF-8)
+    state_ids u8 index into states, per city
+    coords    i32 latitude, i32 longitude per city, in microdegrees
+    grid      i32 min latitude, i32 min longitude, i32 cell size (microdegrees),
+              u16 rows, u16 columns; u32 offsets[rows * columns + 1] into
+              the u32 city positions that follow, grouped by cell
+
+Cities are stored sorted by key, so all names starting with a prefix form one
+contiguous range, found with two bisects. Reverse lookups search the uniform
+grid ring by ring outward from the query's cell.
+"""
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import unicodedata
+
+from django.conf import settings
+
+from backend_api.utils.india_states import STATE_NAMES
+
+MAGIC = b"HCIX"
+VERSION = 2
+HEADER = struct.Struct("<4sHHI")
+OFFSET = struct.Struct("<I")
+COORDS = struct.Struct("<ii")
+GRID_HEADER = struct.Struct("<iiiHH")
+MICRO = 1_000_000
+CELL_DEGREES = 0.5
+EARTH_RADIUS_KM = 6371.0088
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_config():
+    return getattr(settings, "CITY_INDEX", {})
+
+
+def normalize(text):
+    """Case-folded, accent-free, single-spaced: "  Mahē " -> "mahe"."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().split())
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# -----------------------------
+# BUILDING
+# -----------------------------
+def _pack_strings(strings):
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(encoded)
+
+
+def _micro(value):
+    return round(float(value) * MICRO)
+
+
+def _pack_grid(coordinates):
+    """Bucket city positions into CELL_DEGREES cells over the cities' bounding box."""
+    located = [(position, lat, lon) for position, (lat, lon) in enumerate(coordinates) if lat is not None]
+    cell = round(CELL_DEGREES * MICRO)
+    if not located:
+        return GRID_HEADER.pack(0, 0, cell, 0, 0)
+    min_lat = min(lat for _, lat, _ in located)
+    min_lon = min(lon for _, _, lon in located)
+    rows = (max(lat for _, lat, _ in located) - min_lat) // cell + 1
+    columns = (max(lon for _, _, lon in located) - min_lon) // cell + 1
+
+    cells = [[] for _ in range(rows * columns)]
+    for position, lat, lon in located:
+        cells[(lat - min_lat) // cell * columns + (lon - min_lon) // cell].append(position)
+    offsets = [0]
+    for members in cells:
+        offsets.append(offsets[-1] + len(members))
+    members = [position for members in cells for position in members]
+    return b"".join(
+        [
+            GRID_HEADER.pack(min_lat, min_lon, cell, rows, columns),
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            struct.pack(f"<{len(members)}I", *members),
+        ]
+    )
+
+
+def build_index(source, path):
+    """Compile the cities JSON at `source` into the index file `path`. Returns the city count."""
+    with open(source, encoding="utf-8") as fh:
+        cities = json.load(fh)
+
+    rows = sorted(
+        (normalize(city["name"]), city["name"], city["stateCode"], city.get("latitude"), city.get("longitude"))
+        for city in cities
+        if city.get("name") and len(city.get("stateCode", "")) == 2
+    )
+    states = sorted({row[2] for row in rows})
+    state_ids = {state: position for position, state in enumerate(states)}
+    # cities without coordinates are stored at (0, 0) and left out of the grid
+    coordinates = [
+        (_micro(lat), _micro(lon)) if lat not in (None, "") and lon not in (None, "") else (None, None)
+        for _, _, _, lat, lon in rows
+    ]
+
+    data = b"".join(
+        [
+            HEADER.pack(MAGIC, VERSION, len(states), len(rows)),
+            "".join(states).encode("ascii"),
+            _pack_strings(row[0] for row in rows),
+            _pack_strings(row[1] for row in rows),
+            bytes(state_ids[row[2]] for row in rows),
+            b"".join(COORDS.pack(lat or 0, lon or 0) for lat, lon in coordinates),
+            _pack_grid(coordinates),
+        ]
+    )
+
+    # write then rename, so a process mapping the old file never sees a partial one
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as fh:
+        fh.write(data)
+    os.replace(fh.name, path)
+    return len(rows)
+
+
+def is_stale(path, source):
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(source):
+            return True
+        with open(path, "rb") as fh:
+            header = fh.read(HEADER.size)
+    except OSError:
+        return True
+    return len(header) < HEADER.size or HEADER.unpack(header)[:2] != (MAGIC, VERSION)
+
+
+# -----------------------------
+# READING
+# -----------------------------
+class PackedStrings:
+    """Read-only sequence over one packed string table, so `bisect` can search it in place."""
+
+    def __init__(self, buffer, start, count):
+        self.buffer = buffer
+        self.start = start
+        self.count = count
+        self.data_start = start + OFFSET.size * (count + 1)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        begin = OFFSET.unpack_from(self.buffer, self.start + OFFSET.size * position)[0]
+        end = OFFSET.unpack_from(self.buffer, self.start + OFFSET.size * (position + 1))[0]
+        return self.buffer[self.data_start + begin : self.data_start + end]
+
+    @property
+    def end(self):
+        return self.data_start + OFFSET.unpack_from(self.buffer, self.start + OFFSET.size * self.count)[0]
+
+
+class CityIndex:
+    def __init__(self, buffer):
+        magic, version, state_count, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Unsupported city index file.")
+        position = HEADER.size
+        self.buffer = buffer
+        self.count = count
+        self.states = [buffer[position + 2 * i : position + 2 * i + 2].decode("ascii") for i in range(state_count)]
+        self.keys = PackedStrings(buffer, position + 2 * state_count, count)
+        self.names = PackedStrings(buffer, self.keys.end, count)
+        self.state_ids_start = self.names.end
+        self.coords_start = self.state_ids_start + count
+
+        grid_start = self.coords_start + COORDS.size * count
+        self.min_lat, self.min_lon, self.cell, self.rows, self.columns = GRID_HEADER.unpack_from(buffer, grid_start)
+        self.cells_start = grid_start + GRID_HEADER.size
+        self.members_start = self.cells_start + OFFSET.size * (self.rows * self.columns + 1)
+        # shortest distance across one cell anywhere in the grid: east-west
+        # at the latitude furthest from the equator, less 5% because a great
+        # circle between two points is shorter than the parallel through them
+        widest = max(abs(self.min_lat), abs(self.min_lat + self.rows * self.cell)) / MICRO
+        self.cell_km = math.radians(self.cell / MICRO) * EARTH_RADIUS_KM * math.cos(math.radians(min(widest, 89))) * 0.95
+
+    def __len__(self):
+        return self.count
+
+    def state_code(self, position):
+        return self.states[self.buffer[self.state_ids_start + position]]
+
+    def city(self, position):
+        state_code = self.state_code(position)
+        return {
+            "name": self.names[position].decode("utf-8"),
+            "state_code": state_code,
+            "state": STATE_NAMES.get(state_code, state_code),
+        }
+
+    def coordinates(self, position):
+        lat, lon = COORDS.unpack_from(self.buffer, self.coords_start + COORDS.size * position)
+        return lat / MICRO, lon / MICRO
+
+    def prefix_range(self, prefix):
+        """(start, stop) positions of the cities whose normalized name starts with `prefix`."""
+        key = normalize(prefix).encode("utf-8")
+        start = bisect.bisect_left(self.keys, key)
+        # 0xff never occurs in UTF-8, so it sorts after every key with this prefix
+        return start, bisect.bisect_left(self.keys, key + b"\xff", start)
+
+    def search(self, prefix, limit=10, state_code=None):
+        if not normalize(prefix):
+            return []
+        start, stop = self.prefix_range(prefix)
+        results = []
+        for position in range(start, stop):
+            if state_code and self.state_code(position) != state_code:
+                continue
+            results.append(self.city(position))
+            if len(results) >= limit:
+                break
+        return results
+
+    # -----------------------------
+    # REVERSE LOOKUP
+    # -----------------------------
+    def cell_members(self, row, column):
+        cell = row * self.columns + column
+        begin, end = struct.unpack_from("<2I", self.buffer, self.cells_start + OFFSET.size * cell)
+        return struct.unpack_from(f"<{end - begin}I", self.buffer, self.members_start + OFFSET.size * begin)
+
+    def ring(self, row, column, radius):
+        """Grid cells exactly `radius` cells (Chebyshev) from (row, column), clipped to the grid."""
+        for r in range(max(row - radius, 0), min(row + radius, self.rows - 1) + 1):
+            if abs(r - row) == radius:
+                columns = range(max(column - radius, 0), min(column + radius, self.columns - 1) + 1)
+            else:
+                columns = [c for c in (column - radius, column + radius) if 0 <= c < self.columns]
+            for c in columns:
+                yield r, c
+
+    def nearest(self, latitude, longitude, limit=1, max_km=None):
+        """
+        Up to `limit` cities closest to the point, nearest first, as
+        (distance_km, position) pairs, optionally only within `max_km`.
+        """
+        if not self.rows:
+            return []
+        row = min(max(int((latitude * MICRO - self.min_lat) // self.cell), 0), self.rows - 1)
+        column = min(max(int((longitude * MICRO - self.min_lon) // self.cell), 0), self.columns - 1)
+
+        heap = []  # (-distance, position), the `limit` best so far
+        radius = 0
+        while True:
+            for r, c in self.ring(row, column, radius):
+                for position in self.cell_members(r, c):
+                    distance = haversine_km(latitude, longitude, *self.coordinates(position))
+                    if len(heap) < limit:
+                        heapq.heappush(heap, (-distance, position))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, position))
+            # every city outside this ring is at least `radius` cells away
+            reach = radius * self.cell_km
+            if len(heap) == limit and -heap[0][0] <= reach:
+                break
+            if (max_km is not None and reach >= max_km) or radius >= max(self.rows, self.columns):
+                break
+            radius += 1
+
+        results = sorted((-distance, position) for distance, position in heap)
+        if max_km is not None:
+            results = [(distance, position) for distance, position in results if distance <= max_km]
+        return results
+
+    def nearest_cities(self, latitude, longitude, limit=1, max_km=None):
+        return [
+            {**self.city(position), "distance_km": round(distance, 2)}
+            for distance, position in self.nearest(latitude, longitude, limit, max_km)
+        ]
+
+
+def load_index(path):
+    with open(path, "rb") as fh:
+        # the mapping stays valid after the file is closed
+        return CityIndex(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def get_city_index():
+    """The process-wide index, built first if missing or out of date."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                path = get_config().get("PATH")
+                if is_stale(path, settings.INDIA_CITIES_FILE):
+                    build_index(settings.INDIA_CITIES_FILE, path)
+                _index = load_index(path)
+    return _index
+
+
+def reset_city_index():
+    global _index
+    _index = None
@@ -0,0 +1,199 @@
+# backend_api/utils/gst.py
+"""
+GST split: CGST + SGST for intra-state supplies, IGST for inter-state ones.
+
+The supplier's state is read from the company's GSTIN (its first two digits
+are the GST state code) and the place of supply from the contact's GSTIN or,
+failing that, its billing state. Every value goes through resolve_state(), a
+cached lookup that accepts GSTINs, GST codes ("27"), state codes ("MH") and
+state names, including common older spellings. When either side cannot be
+resolved the supply is treated as intra-state.
+
+Tax is computed and split per line in paise (utils/money.py): for
+intra-state lines CGST takes the lower half and SGST the rest, so the two
+always add up to the line's tax.
+"""
+import functools
+import itertools
+import re
+from collections import defaultdict
+
+from backend_api.models import Invoice
+from backend_api.utils import money
+from backend_api.utils.geo import normalize
+from backend_api.utils.india_states import GST_STATE_CODES, STATE_ALIASES, STATE_NAMES
+
+INTRA_STATE = "intra_state"
+INTER_STATE = "inter_state"
+
+GSTIN_PATTERN = re.compile(r"^\d{2}[0-9A-Z]{13}$")
+
+_STATE_LOOKUP = {normalize(name): code for code, name in STATE_NAMES.items()}
+_STATE_LOOKUP.update({normalize(name): code for name, code in STATE_ALIASES.items()})
+
+
+# -----------------------------
+# PLACE OF SUPPLY
+# -----------------------------
+@functools.lru_cache(maxsize=4096)
+def resolve_state(value):
+    """State code ("MH") for a GSTIN, GST state code, state code or state name; None if unknown."""
+    if not value:
+        return None
+    value = value.strip()
+    if value[:2].isdigit():
+        if len(value) == 2 or GSTIN_PATTERN.match(value.upper()):
+            return GST_STATE_CODES.get(value[:2])
+        return None
+    if value.upper() in STATE_NAMES:
+        return value.upper()
+    return _STATE_LOOKUP.get(normalize(value))
+
+
+def get_supply_type(supplier_state, place_of_supply):
+    if supplier_state and place_of_supply and supplier_state != place_of_supply:
+        return INTER_STATE
+    return INTRA_STATE
+
+
+def resolve_supply(company_gstin, contact_gstin, billing_state):
+    """(supply type, place of supply state code) from the raw column values."""
+    supplier_state = resolve_state(company_gstin)
+    place_of_supply = resolve_state(contact_gstin) or resolve_state(billing_state)
+    return get_supply_type(supplier_state, place_of_supply), place_of_supply
+
+
+def get_invoice_supply(invoice):
+    company = invoice.user.company
+    contact = invoice.contact
+    return resolve_supply(company.gstin if company else None, contact.gst, contact.billing_state)
+
+
+# -----------------------------
+# PER-LINE SPLIT
+# -----------------------------
+def split_tax(tax, supply_type):
+    """(cgst, sgst, igst) of one line's tax, all in paise."""
+    if supply_type == INTER_STATE:
+        return 0, 0, tax
+    return (*money.split_tax(tax), 0)
+
+
+class GSTTotals:
+    """Running totals, in paise, of split lines."""
+
+    def __init__(self):
+        self.invoices = self.subtotal = self.cgst = self.sgst = self.igst = 0
+
+    def add_amounts(self, taxable, tax, supply_type):
+        cgst, sgst, igst = split_tax(tax, supply_type)
+        self.subtotal += taxable
+        self.cgst += cgst
+        self.sgst += sgst
+        self.igst += igst
+
+    def add_line(self, quantity, rate, discount, gst_percentage, supply_type):
+        taxable, tax, _ = money.line_amounts(
+            quantity, money.to_paise(rate), money.to_paise(discount), money.to_basis_points(gst_percentage or 0)
+        )
+        self.add_amounts(taxable, tax, supply_type)
+
+    def add_totals(self, other):
+        self.invoices += other.invoices
+        self.subtotal += other.subtotal
+        self.cgst += other.cgst
+        self.sgst += other.sgst
+        self.igst += other.igst
+
+    @property
+    def total_gst(self):
+        return self.cgst + self.sgst + self.igst
+
+    def as_dict(self):
+        return {
+            "subtotal": str(money.from_paise(self.subtotal)),
+            "total_gst": str(money.from_paise(self.total_gst)),
+            "cgst": str(money.from_paise(self.cgst)),
+            "sgst": str(money.from_paise(self.sgst)),
+            "igst": str(money.from_paise(self.igst)),
+            "grand_total": str(money.from_paise(self.subtotal + self.total_gst)),
+        }
+
+
+def get_gst_summary(lines, supply_type, place_of_supply=None):
+    """Summary of InvoiceItem-like `lines` (quantity, rate, discount, gst_percentage)."""
+    totals = GSTTotals()
+    for line in lines:
+        totals.add_line(line.quantity, line.rate, line.discount, line.gst_percentage, supply_type)
+    return {"supply_type": supply_type, "place_of_supply": place_of_supply, **totals.as_dict()}
+
+
+# -----------------------------
+# BATCH MODE
+# -----------------------------
+def get_invoice_totals(invoices, chunk_size=2000):
+    """
+    {invoice id: (supply type, place of supply, GSTTotals)} for every invoice
+    in the `invoices` queryset, with two streamed queries however many there
+    are: one for the parties of each invoice and one for all of their lines.
+    Lines are computed a chunk at a time with money.line_amounts_batch(), and
+    each distinct (company, contact) state pair is resolved once.
+    """
+    results = {}
+    for pk, company_gstin, contact_gstin, billing_state in invoices.values_list(
+        "pk", "user__company__gstin", "contact__gst", "contact__billing_state"
+    ).iterator(chunk_size=chunk_size):
+        totals = GSTTotals()
+        totals.invoices = 1
+        results[pk] = (*resolve_supply(company_gstin, contact_gstin, billing_state), totals)
+
+    lines = Invoice.items.through.objects.filter(invoice__in=invoices.values("pk")).values_list(
+        "invoice_id",
+        "invoiceitem__quantity",
+        "invoiceitem__rate",
+        "invoiceitem__discount",
+        "invoiceitem__gst_percentage",
+    )
+    rows = lines.iterator(chunk_size=chunk_size)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        invoice_ids, quantities, rates, discounts, gst_rates = zip(*chunk)
+        taxable, tax, _ = money.line_amounts_batch(
+            quantities,
+            money.to_paise_batch(rates),
+            money.to_paise_batch(discounts),
+            money.to_basis_points_batch(gst_rates),
+        )
+        for invoice_id, line_taxable, line_tax in zip(invoice_ids, taxable, tax):
+            supply_type, _, totals = results[invoice_id]
+            totals.add_amounts(line_taxable, line_tax, supply_type)
+    return results
+
+
+def summarize_invoices(invoices, chunk_size=2000):
+    """{invoice id: summary}, the same as get_gst_summary() gives for each invoice."""
+    return {
+        pk: {"supply_type": supply_type, "place_of_supply": place, **totals.as_dict()}
+        for pk, (supply_type, place, totals) in get_invoice_totals(invoices, chunk_size).items()
+    }
+
+
+def get_gst_report(invoices):
+    """Tax totals of `invoices` per (supply type, place of supply), plus overall totals."""
+    groups = defaultdict(GSTTotals)
+    for supply_type, place, totals in get_invoice_totals(invoices).values():
+        groups[(supply_type, place)].add_totals(totals)
+
+    overall = GSTTotals()
+    rows = []
+    for (supply_type, place), totals in sorted(groups.items(), key=lambda entry: (entry[0][0], entry[0][1] or "")):
+        overall.add_totals(totals)
+        rows.append(
+            {
+                "supply_type": supply_type,
+                "place_of_supply": place,
+                "state": STATE_NAMES.get(place),
+                "invoices": totals.invoices,
+                **totals.as_dict(),
+            }
+        )
+    return {"totals": {"invoices": overall.invoices, **overall.as_dict()}, "by_place_of_supply": rows}
@@ -0,0 +1,171 @@
+# backend_api/utils/idempotency.py
+"""
+Idempotency-Key support for create actions.
+
+The first request with a key claims it by inserting an IdempotencyKey row
+(unique per user and key), runs, and stores its rendered response there.
+- A retry with the same key and body gets the stored response back, with
+  an `Idempotent-Replayed: true` header, and creates nothing.
+- A retry while the first request is still running waits for it (up to
+  IDEMPOTENCY["WAIT_SECONDS"]) instead of racing it, then replays.
+- The same key with a different body is rejected (422).
+- 5xx responses and exceptions release the key so the client can retry.
+- The view runs in one transaction with storing its response, holding a
+  lock on the key's row, so the two commit (or roll back) together.
+Keys expire after IDEMPOTENCY["TTL_SECONDS"]; `manage.py purge_idempotency_keys`
+deletes expired rows.
+"""
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+
+from backend_api.models import IdempotencyKey
+from backend_api.utils.response_cache import CachedResponse
+from backend_api.utils.response_utils import error_response
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+MAX_KEY_LENGTH = 255
+
+
+def get_config():
+    return getattr(settings, "IDEMPOTENCY", {})
+
+
+def is_enabled():
+    return get_config().get("ENABLED", True)
+
+
+def get_request_hash(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def replay(record):
+    response = CachedResponse(bytes(record.content), status=record.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def claim_key(user, key, request_hash):
+    """
+    Returns (record, None) when this request owns the key and should run, or
+    (None, response) to send instead: the stored response, or an error.
+    """
+    config = get_config()
+    deadline = time.monotonic() + config.get("WAIT_SECONDS", 10)
+    while True:
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user,
+                    key=key,
+                    request_hash=request_hash,
+                    locked_at=now,
+                    expires_at=now + timedelta(seconds=config.get("TTL_SECONDS", 86400)),
+                )
+            return record, None
+        except IntegrityError:
+            pass
+
+        existing = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if existing is None:
+            # released by a failed first request in the meantime
+            continue
+        if existing.expires_at <= now:
+            IdempotencyKey.objects.filter(pk=existing.pk, expires_at__lte=now).delete()
+            continue
+        if existing.request_hash != request_hash:
+            return None, error_response(
+                "This Idempotency-Key was already used for a different request.",
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if existing.status_code is not None:
+            return None, replay(existing)
+
+        if existing.locked_at <= now - timedelta(seconds=config.get("LOCK_SECONDS", 60)):
+            # the first request died without storing a response: take over
+            taken = IdempotencyKey.objects.filter(
+                pk=existing.pk, status_code__isnull=True, locked_at=existing.locked_at
+            ).update(locked_at=now)
+            if taken:
+                existing.locked_at = now
+                return existing, None
+            continue
+
+        if time.monotonic() >= deadline:
+            return None, error_response(
+                "A request with this Idempotency-Key is still being processed. Retry shortly.",
+                status.HTTP_409_CONFLICT,
+            )
+        time.sleep(config.get("POLL_SECONDS", 0.1))
+
+
+def release_key(record):
+    IdempotencyKey.objects.filter(pk=record.pk, status_code__isnull=True).delete()
+
+
+def lock_key(record):
+    """
+    Lock the claimed row for the rest of the transaction. None when another
+    request took the key over (LOCK_SECONDS) in the meantime.
+    """
+    return (
+        IdempotencyKey.objects.select_for_update()
+        .filter(pk=record.pk, status_code__isnull=True, locked_at=record.locked_at)
+        .first()
+    )
+
+
+def store_response(record, status_code, content):
+    IdempotencyKey.objects.filter(pk=record.pk).update(status_code=status_code, content=content)
+
+
+def idempotent(view_method):
+    """Honor the Idempotency-Key header on a create action."""
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(HEADER)
+        if not key or not is_enabled():
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return error_response(
+                f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters.",
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        record, response = claim_key(request.user, key, get_request_hash(request))
+        if response is not None:
+            return response
+
+        # The view's writes and the stored response commit together: a crash
+        # in between rolls both back, so a takeover never repeats a create.
+        # The row lock makes a takeover wait for this transaction, after
+        # which it finds the response stored.
+        try:
+            with transaction.atomic():
+                if lock_key(record) is None:
+                    return error_response(
+                        "A request with this Idempotency-Key is still being processed. Retry shortly.",
+                        status.HTTP_409_CONFLICT,
+                    )
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code >= 500:
+                    release_key(record)
+                    return response
+                content = request.accepted_renderer.render(response.data)
+                store_response(record, response.status_code, content)
+        except Exception:
+            release_key(record)
+            raise
+        return CachedResponse(content, status=response.status_code, data=response.data)
+
+    return wrapper
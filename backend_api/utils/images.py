@@ -0,0 +1,107 @@
+# backend_api/utils/images.py
+"""
+Profile image processing (Pillow), run as a background job after upload.
+
+The uploaded original is replaced by a sanitized copy: EXIF metadata
+(camera, GPS) stripped, orientation applied to the pixels, and scaled down
+to PROFILE_IMAGES["MAX_SIZE"]. Square variants are written for every size in
+PROFILE_IMAGES["SIZES"] in WebP and JPEG, and their storage paths are kept in
+User.profile_image_variants as {size: {format: path}}.
+"""
+import os
+import secrets
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Pillow format name and file extension per variant format
+FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+
+def get_config():
+    return getattr(settings, "PROFILE_IMAGES", {})
+
+
+def is_valid_image(file):
+    """Cheap header check that `file` is an image Pillow can read."""
+    try:
+        with Image.open(file) as image:
+            image.verify()
+        return True
+    except Exception:
+        return False
+    finally:
+        file.seek(0)
+
+
+def load_image(file):
+    """Decode, apply the EXIF orientation, and drop every other metadata."""
+    with Image.open(file) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            # JPEG has no alpha: flatten onto white
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            return background
+        return image.convert("RGB")
+
+
+def encode(image, format_name, quality):
+    buffer = BytesIO()
+    # no exif= argument, so nothing from the upload is written back
+    image.save(buffer, format=format_name, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def build_variants(image):
+    """{size: {format: bytes}} square thumbnails of `image`."""
+    config = get_config()
+    quality = config.get("QUALITY", 80)
+    variants = {}
+    for size_name, pixels in config.get("SIZES", {}).items():
+        thumbnail = ImageOps.fit(image, (pixels, pixels), Image.LANCZOS)
+        variants[size_name] = {
+            key: encode(thumbnail, format_name, quality) for key, (format_name, _) in FORMATS.items()
+        }
+    return variants
+
+
+def delete_variants(storage, variants):
+    for formats in (variants or {}).values():
+        for path in formats.values():
+            storage.delete(path)
+
+
+def process_profile_image(user, storage):
+    """
+    Write a sanitized copy of `user.profile_image` (now pointing at it) and
+    its variants. Returns the original's name, left for the caller to delete
+    once the user row points at the copy, and the {size: {format: path}} map
+    for User.profile_image_variants.
+    """
+    config = get_config()
+    with storage.open(user.profile_image.name, "rb") as file:
+        image = load_image(file)
+
+    max_size = config.get("MAX_SIZE", 1024)
+    image.thumbnail((max_size, max_size), Image.LANCZOS)
+    original_name = user.profile_image.name
+    stem = os.path.splitext(os.path.basename(original_name))[0]
+    user.profile_image.save(f"{stem}.jpg", ContentFile(encode(image, "JPEG", config.get("QUALITY", 80))), save=False)
+
+    paths = {}
+    directory = f"profile_images/variants/{user.pk}"
+    # a fresh token per upload, so a new image never reuses a URL browsers have cached
+    token = secrets.token_hex(4)
+    for size_name, formats in build_variants(image).items():
+        paths[size_name] = {}
+        for key, content in formats.items():
+            name = f"{directory}/{stem}-{token}-{size_name}.{FORMATS[key][1]}"
+            paths[size_name][key] = storage.save(name, ContentFile(content))
+    return original_name, paths
@@ -0,0 +1,100 @@
+# backend_api/utils/india_states.py
+
+# State / union territory codes as used in `india cities.json` (ISO 3166-2:IN).
+STATE_NAMES = {
+    "AN": "Andaman and Nicobar Islands",
+    "AP": "Andhra Pradesh",
+    "AR": "Arunachal Pradesh",
+    "AS": "Assam",
+    "BR": "Bihar",
+    "CH": "Chandigarh",
+    "CT": "Chhattisgarh",
+    "DH": "Dadra and Nagar Haveli and Daman and Diu",
+    "DL": "Delhi",
+    "GA": "Goa",
+    "GJ": "Gujarat",
+    "HP": "Himachal Pradesh",
+    "HR": "Haryana",
+    "JH": "Jharkhand",
+    "JK": "Jammu and Kashmir",
+    "KA": "Karnataka",
+    "KL": "Kerala",
+    "LA": "Ladakh",
+    "LD": "Lakshadweep",
+    "MH": "Maharashtra",
+    "ML": "Meghalaya",
+    "MN": "Manipur",
+    "MP": "Madhya Pradesh",
+    "MZ": "Mizoram",
+    "NL": "Nagaland",
+    "OR": "Odisha",
+    "PB": "Punjab",
+    "PY": "Puducherry",
+    "RJ": "Rajasthan",
+    "SK": "Sikkim",
+    "TG": "Telangana",
+    "TN": "Tamil Nadu",
+    "TR": "Tripura",
+    "UP": "Uttar Pradesh",
+    "UT": "Uttarakhand",
+    "WB": "West Bengal",
+}
+
+# GST state codes (the first two digits of a GSTIN) -> state code above.
+# 25 (Daman and Diu) and 26 (Dadra and Nagar Haveli) were merged in 2020;
+# 28 is Andhra Pradesh before the 2014 split, 37 after it.
+GST_STATE_CODES = {
+    "01": "JK",
+    "02": "HP",
+    "03": "PB",
+    "04": "CH",
+    "05": "UT",
+    "06": "HR",
+    "07": "DL",
+    "08": "RJ",
+    "09": "UP",
+    "10": "BR",
+    "11": "SK",
+    "12": "AR",
+    "13": "NL",
+    "14": "MN",
+    "15": "MZ",
+    "16": "TR",
+    "17": "ML",
+    "18": "AS",
+    "19": "WB",
+    "20": "JH",
+    "21": "OR",
+    "22": "CT",
+    "23": "MP",
+    "24": "GJ",
+    "25": "DH",
+    "26": "DH",
+    "27": "MH",
+    "28": "AP",
+    "29": "KA",
+    "30": "GA",
+    "31": "LD",
+    "32": "KL",
+    "33": "TN",
+    "34": "PY",
+    "35": "AN",
+    "36": "TG",
+    "37": "AP",
+    "38": "LA",
+}
+
+# Older or informal spellings seen in address data.
+STATE_ALIASES = {
+    "Orissa": "OR",
+    "Pondicherry": "PY",
+    "Uttaranchal": "UT",
+    "Chattisgarh": "CT",
+    "Telengana": "TG",
+    "NCT of Delhi": "DL",
+    "New Delhi": "DL",
+    "Jammu & Kashmir": "JK",
+    "Andaman & Nicobar Islands": "AN",
+    "Daman and Diu": "DH",
+    "Dadra and Nagar Haveli": "DH",
+}
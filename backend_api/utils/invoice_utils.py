@@ -1,3 +1,5 @@
+from django.db.models import Q
+
 from backend_api.models import Invoice
 
 
@@ -22,9 +24,13 @@ def get_next_invoice_number(user, date):
         .first()
     )
 
-    if last_invoice:
-        last4 = int(last_invoice.invoice_number[-4:])
-        next_num = last4 + 1
+    return next_invoice_number(base, [last_invoice.invoice_number] if last_invoice else [])
+
+
+def next_invoice_number(base, used_numbers):
+    """Next number after the highest of `used_numbers` (all starting with `base`)."""
+    if used_numbers:
+        next_num = int(max(used_numbers)[-4:]) + 1
     else:
         next_num = 1
 
@@ -41,18 +47,52 @@ def get_missing_invoice_numbers(user, date):
         user=user, invoice_number__startswith=base
     ).values_list("invoice_number", flat=True)
 
-    used = sorted([int(x[-4:]) for x in invoices])
+    return missing_invoice_numbers(base, invoices)
+
+
+def missing_invoice_numbers(base, used_numbers):
+    """Numbers below the highest of `used_numbers` that haven't been used yet."""
+    used = sorted([int(x[-4:]) for x in used_numbers])
 
     missing = []
 
     if used:
+        used_set = set(used)
         for num in range(1, used[-1]):
-            if num not in used:
+            if num not in used_set:
                 missing.append(f"{base}{num:04d}")
 
     return missing
 
 
+# ----------------------------------------
+# Used numbers for many (user, prefix) pairs
+# in one query (list serialization)
+# ----------------------------------------
+def get_used_invoice_numbers(pairs):
+    """
+    `pairs` is an iterable of (user_id, prefix).
+    Returns {(user_id, prefix): [invoice_number, ...]} for every pair.
+    """
+    pairs = set(pairs)
+    used = {pair: [] for pair in pairs}
+    if not pairs:
+        return used
+
+    condition = Q()
+    prefixes_by_user = {}
+    for user_id, base in pairs:
+        condition |= Q(user_id=user_id, invoice_number__startswith=base)
+        prefixes_by_user.setdefault(user_id, []).append(base)
+
+    rows = Invoice.objects.filter(condition).values_list("user_id", "invoice_number")
+    for user_id, number in rows:
+        for base in prefixes_by_user[user_id]:
+            if number.startswith(base):
+                used[(user_id, base)].append(number)
+    return used
+
+
 # ----------------------------------------
 # Validate manually-entered invoice number
 # ----------------------------------------
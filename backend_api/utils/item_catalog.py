@@ -0,0 +1,74 @@
+# backend_api/utils/item_catalog.py
+"""
+Tenant-scoped item lookups for invoice lines.
+
+Items are resolved per tenant scope ("c<company id>" / "u<user id>", see
+response_cache.scope_for_user), so a line can only reference an item of the
+invoice owner's company. Resolved rows are kept in each process as one
+{item id: row} table per scope under a shared version counter
+(utils/versions.py), bumped whenever one of the scope's items is saved or
+deleted (signals.py) or bulk-written (invalidate_item_catalog()).
+
+Resolving the items of an invoice costs one counter read, plus one `in` query
+for the ids that are not cached yet. Only the columns invoice lines default
+from are kept, and at most ITEM_CATALOG["MAX_SCOPES"] scopes are held.
+Invoice writes still lock the referenced rows (lock_items()), so an item
+deleted meanwhile is a validation error rather than a foreign key error.
+"""
+from django.conf import settings
+
+from backend_api.models import Items
+from backend_api.utils.response_cache import scope_for_instance, scope_for_user
+from backend_api.utils.versions import VersionedTables
+
+FIELDS = ("pk", "user_id", "name", "rate", "tax_category")
+
+
+def get_config():
+    return getattr(settings, "ITEM_CATALOG", {})
+
+
+_catalogs = VersionedTables("item_catalog", max_tables=lambda: get_config().get("MAX_SCOPES", 256))
+
+
+def invalidate_item_catalog(scope):
+    if scope:
+        _catalogs.invalidate(scope)
+
+
+def invalidate_instance(item):
+    invalidate_item_catalog(scope_for_instance(item))
+
+
+def scoped_items(user):
+    """Items a user's invoices may reference: the company's, or the user's own."""
+    if user.company_id:
+        return Items.objects.filter(user__company_id=user.company_id)
+    return Items.objects.filter(user=user)
+
+
+def resolve_items(user, ids):
+    """
+    {item id: Items} for those of `ids` that belong to the user's tenant.
+    The instances are unsaved copies carrying only FIELDS.
+    """
+    rows = _catalogs.get(scope_for_user(user))
+    missing = {pk for pk in ids if pk not in rows}
+    if missing:
+        for row in scoped_items(user).filter(pk__in=missing).values_list(*FIELDS):
+            rows[row[0]] = row
+    return {pk: Items(**dict(zip(FIELDS, rows[pk]))) for pk in ids if pk in rows}
+
+
+def lock_items(user, ids):
+    """
+    Lock the rows of `ids` until the transaction ends and return the ids
+    that no longer exist, dropping the scope's cached rows if there are any.
+    """
+    ids = set(ids)
+    if not ids:
+        return set()
+    found = set(Items.objects.select_for_update().filter(pk__in=ids).values_list("pk", flat=True))
+    if ids - found:
+        invalidate_item_catalog(scope_for_user(user))
+    return ids - found
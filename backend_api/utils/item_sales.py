@@ -0,0 +1,232 @@
+# backend_api/utils/item_sales.py
+"""
+Per-item monthly sales (ItemSales), maintained as invoice lines are written.
+
+Adding lines to an invoice adds their count, quantity, taxable value and tax
+to the (scope, item, month of invoice_date) rows they fall in; replacing the
+lines or deleting the invoice subtracts the old ones again. Amounts are
+computed in paise with utils/money.py, so they match the lines' stored tax.
+Lines without an item are not counted.
+
+apply_sales() locks the affected rows with one query and writes them back
+with at most one bulk update, one bulk create and one delete, however many
+lines there are. Deleting an invoice, contact or user subtracts all the
+invoices it takes with it in one batch (signals.py); queryset deletes and
+other bulk writes do not, and are followed by rebuild_item_sales(), which
+recomputes whole scopes from the invoices.
+"""
+import datetime
+import itertools
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+
+from backend_api.models import Invoice, ItemSales
+from backend_api.utils import money
+from backend_api.utils.response_cache import scope_for_instance
+
+METRICS = ("revenue", "quantity", "tax", "lines")
+
+
+def month_of(day):
+    return datetime.date(day.year, day.month, 1)
+
+
+# -----------------------------
+# INCREMENTAL UPDATES
+# -----------------------------
+def line_sales(lines, month, sign=1):
+    """(item id, month, lines, quantity, revenue, tax) of each line with an item; amounts in paise."""
+    lines = [line for line in lines if line.item_id_id]
+    taxable, tax, _ = money.line_amounts_batch(
+        [line.quantity for line in lines],
+        money.to_paise_batch(line.rate for line in lines),
+        money.to_paise_batch(line.discount for line in lines),
+        money.to_basis_points_batch(line.gst_percentage for line in lines),
+    )
+    return [
+        (line.item_id_id, month, sign, sign * line.quantity, sign * line_taxable, sign * line_tax)
+        for line, line_taxable, line_tax in zip(lines, taxable, tax)
+    ]
+
+
+def invoice_sales(invoice, lines, sign=1):
+    return line_sales(lines, month_of(invoice.invoice_date), sign)
+
+
+def _sum_rows(rows):
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    for item_id, month, *values in rows:
+        total = totals[(item_id, month)]
+        for position, value in enumerate(values):
+            total[position] += value
+    return {key: total for key, total in totals.items() if any(total)}
+
+
+def _write(scope, totals):
+    existing = {
+        (row.item_id, row.month): row
+        for row in ItemSales.objects.select_for_update().filter(
+            scope=scope,
+            item_id__in={item_id for item_id, _ in totals},
+            month__in={month for _, month in totals},
+        )
+    }
+    changed, created, emptied = [], [], []
+    for (item_id, month), (lines, quantity, revenue, tax) in totals.items():
+        row = existing.get((item_id, month))
+        if row is None:
+            # nothing to subtract from: the month was never counted (not backfilled)
+            if lines <= 0:
+                continue
+            row = ItemSales(scope=scope, item_id=item_id, month=month)
+            created.append(row)
+        elif row.lines + lines <= 0:
+            emptied.append(row.pk)
+            continue
+        else:
+            changed.append(row)
+        row.lines += lines
+        row.quantity += quantity
+        row.revenue = money.from_paise(money.to_paise(row.revenue) + revenue)
+        row.tax = money.from_paise(money.to_paise(row.tax) + tax)
+
+    if changed:
+        ItemSales.objects.bulk_update(changed, ["lines", "quantity", "revenue", "tax"])
+    if created:
+        ItemSales.objects.bulk_create(created)
+    if emptied:
+        ItemSales.objects.filter(pk__in=emptied).delete()
+
+
+def apply_sales(scope, rows):
+    """Add the line_sales() `rows` (negative to subtract) to the scope's ItemSales."""
+    totals = _sum_rows(rows)
+    if scope is None or not totals:
+        return
+    try:
+        with transaction.atomic():
+            _write(scope, totals)
+    except IntegrityError:
+        # a concurrent write created one of the rows first; it is visible now
+        with transaction.atomic():
+            _write(scope, totals)
+
+
+def record_invoice_sales(invoice, lines, sign=1):
+    apply_sales(scope_for_instance(invoice), invoice_sales(invoice, lines, sign))
+
+
+# -----------------------------
+# WHOLE INVOICES
+# -----------------------------
+def iter_invoice_sales(invoices, chunk_size=2000):
+    """
+    (scope, item id, month, quantity, revenue, tax) of every line with an
+    item on the `invoices` queryset, from one streamed query; amounts in paise.
+    """
+    line_values = Invoice.items.through.objects.filter(
+        invoice__in=invoices.values("pk"), invoiceitem__item_id__isnull=False
+    ).values_list(
+        "invoice__user_id",
+        "invoice__user__company_id",
+        "invoice__invoice_date",
+        "invoiceitem__item_id",
+        "invoiceitem__quantity",
+        "invoiceitem__rate",
+        "invoiceitem__discount",
+        "invoiceitem__gst_percentage",
+    )
+    rows = line_values.iterator(chunk_size=chunk_size)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        user_ids, company_ids, dates, item_ids, quantities, rates, discounts, gst_rates = zip(*chunk)
+        taxable, tax, _ = money.line_amounts_batch(
+            quantities,
+            money.to_paise_batch(rates),
+            money.to_paise_batch(discounts),
+            money.to_basis_points_batch(gst_rates),
+        )
+        for user_id, company_id, day, item_id, quantity, line_taxable, line_tax in zip(
+            user_ids, company_ids, dates, item_ids, quantities, taxable, tax
+        ):
+            scope = f"c{company_id}" if company_id else f"u{user_id}"
+            yield scope, item_id, month_of(day), quantity, line_taxable, line_tax
+
+
+def remove_invoices_sales(invoices):
+    """Subtract the lines of the `invoices` queryset, e.g. before deleting them."""
+    by_scope = defaultdict(list)
+    for scope, item_id, month, quantity, revenue, tax in iter_invoice_sales(invoices):
+        by_scope[scope].append((item_id, month, -1, -quantity, -revenue, -tax))
+    for scope, rows in by_scope.items():
+        apply_sales(scope, rows)
+
+
+def rebuild_item_sales(invoices, chunk_size=2000):
+    """
+    Replace the ItemSales of every scope with an invoice in `invoices` by
+    totals recomputed from those invoices, which must therefore be all of
+    each scope's invoices. Returns the number of rows written.
+    """
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    for scope, item_id, month, quantity, revenue, tax in iter_invoice_sales(invoices, chunk_size):
+        total = totals[(scope, item_id, month)]
+        total[0] += 1
+        total[1] += quantity
+        total[2] += revenue
+        total[3] += tax
+
+    scopes = {
+        f"c{company_id}" if company_id else f"u{user_id}"
+        for user_id, company_id in invoices.values_list("user_id", "user__company_id").distinct()
+    }
+    with transaction.atomic():
+        ItemSales.objects.filter(scope__in=scopes).delete()
+        ItemSales.objects.bulk_create(
+            (
+                ItemSales(
+                    scope=scope,
+                    item_id=item_id,
+                    month=month,
+                    lines=lines,
+                    quantity=quantity,
+                    revenue=money.from_paise(revenue),
+                    tax=money.from_paise(tax),
+                )
+                for (scope, item_id, month), (lines, quantity, revenue, tax) in totals.items()
+            ),
+            batch_size=chunk_size,
+        )
+    return len(totals)
+
+
+# -----------------------------
+# READS
+# -----------------------------
+def _totals(queryset):
+    return queryset.annotate(
+        lines_total=Sum("lines"), quantity_total=Sum("quantity"), revenue_total=Sum("revenue"), tax_total=Sum("tax")
+    )
+
+
+def _row(values):
+    return {
+        "lines": values["lines_total"] or 0,
+        "quantity": values["quantity_total"] or 0,
+        # re-quantized: some backends drop the scale of a summed decimal
+        "revenue": str(money.from_paise(money.to_paise(values["revenue_total"]))),
+        "tax": str(money.from_paise(money.to_paise(values["tax_total"]))),
+    }
+
+
+def get_ranking(queryset, metric="revenue", limit=10):
+    """Top `limit` items of the ItemSales `queryset` by `metric`, summed over its months."""
+    rows = _totals(queryset.values("item_id", "item__name")).order_by(f"-{metric}_total", "item_id")[:limit]
+    return [{"item_id": row["item_id"], "name": row["item__name"], **_row(row)} for row in rows]
+
+
+def get_trend(queryset):
+    """Totals of the ItemSales `queryset` per month, oldest first."""
+    rows = _totals(queryset.values("month")).order_by("month")
+    return [{"month": row["month"].strftime("%Y-%m"), **_row(row)} for row in rows]
@@ -0,0 +1,161 @@
+# backend_api/utils/jobs.py
+"""
+Database-backed background jobs.
+
+enqueue(task, payload) stores a Job row naming the task by its dotted path
+(e.g. "backend_api.tasks.send_staff_invite"); `manage.py run_workers` runs
+worker processes that claim due jobs with SELECT ... FOR UPDATE SKIP LOCKED
+and call task(**payload). A failing job is retried with exponential backoff
+until max_attempts, then marked FAILED. The traceback goes to the
+"backend_api.jobs" log; last_error (shown by /api/jobs/) keeps only the
+exception class and message.
+
+With JOBS["ASYNC"] off (the default, for deployments that run no workers)
+enqueue() runs the job right away in the calling process. It is still
+recorded, and a failure is left queued for a worker to retry.
+"""
+import logging
+import os
+import random
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from backend_api.models import Job
+
+logger = logging.getLogger("backend_api.jobs")
+
+
+def get_config():
+    return getattr(settings, "JOBS", {})
+
+
+def task_name(task):
+    if isinstance(task, str):
+        return task
+    return f"{task.__module__}.{task.__qualname__}"
+
+
+def enqueue(task, payload=None, user=None, run_at=None, max_attempts=None):
+    config = get_config()
+    run_now = not config.get("ASYNC", False)
+    job = Job.objects.create(
+        name=task_name(task),
+        payload=payload or {},
+        user=user,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or config.get("MAX_ATTEMPTS", 3),
+        status=Job.RUNNING if run_now else Job.QUEUED,
+        attempts=1 if run_now else 0,
+    )
+    if run_now:
+        run_job(job)
+    return job
+
+
+def get_backoff(attempts):
+    """Seconds to wait before retry number `attempts`, doubling each time, with jitter."""
+    config = get_config()
+    delay = min(config.get("BACKOFF_SECONDS", 10) * 2 ** (attempts - 1), config.get("MAX_BACKOFF_SECONDS", 3600))
+    return delay * random.uniform(1, 1.1)
+
+
+# -----------------------------
+# CLAIMING
+# -----------------------------
+def claim_jobs(worker_id, limit=1):
+    """
+    Mark up to `limit` due jobs RUNNING for this worker. SKIP LOCKED lets
+    workers claim concurrently without waiting on each other's rows; the
+    status check in the UPDATE keeps claiming exclusive on databases without
+    row locks (SQLite).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.QUEUED, run_at__lte=now)
+            .order_by("run_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(pk__in=ids, status=Job.QUEUED).update(
+            status=Job.RUNNING, locked_at=now, locked_by=worker_id, attempts=F("attempts") + 1
+        )
+    return list(Job.objects.filter(pk__in=ids, status=Job.RUNNING, locked_by=worker_id, locked_at=now))
+
+
+def requeue_stale(timeout=None):
+    """Jobs left RUNNING by a worker that died: retry them, or fail them when out of attempts."""
+    timeout = timeout or get_config().get("LOCK_TIMEOUT_SECONDS", 600)
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED, finished_at=now, last_error="Worker stopped before the job finished."
+    )
+    retried = stale.update(status=Job.QUEUED, run_at=now)
+    return retried + failed
+
+
+# -----------------------------
+# RUNNING
+# -----------------------------
+def run_job(job):
+    try:
+        result = import_string(job.name)(**job.payload)
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed on attempt %s", job.pk, job.name, job.attempts)
+        job.last_error = f"{type(exc).__name__}: {exc}"
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+        else:
+            job.status = Job.QUEUED
+            job.run_at = timezone.now() + timedelta(seconds=get_backoff(job.attempts))
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "last_error", "run_at", "finished_at"])
+    return job
+
+
+def get_worker_id(number=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{number}"
+
+
+def work(worker_id, should_stop=lambda: False, once=False):
+    """
+    Claim and run jobs until should_stop() is true, or, with `once`, until
+    no job is due. Returns the number of jobs run.
+    """
+    config = get_config()
+    batch_size = config.get("BATCH_SIZE", 1)
+    poll_seconds = config.get("POLL_SECONDS", 1)
+    processed = 0
+    while not should_stop():
+        close_old_connections()
+        try:
+            jobs = claim_jobs(worker_id, batch_size)
+        except OperationalError:
+            # e.g. SQLite's "database is locked" while another worker claims
+            logger.warning("Worker %s could not claim jobs, retrying", worker_id, exc_info=True)
+            time.sleep(poll_seconds)
+            continue
+        if not jobs:
+            if once:
+                break
+            requeue_stale()
+            time.sleep(poll_seconds)
+            continue
+        for job in jobs:
+            run_job(job)
+            processed += 1
+    return processed
@@ -0,0 +1,130 @@
+# backend_api/utils/money.py
+"""
+Money arithmetic in integer paise.
+
+Every invoice amount is computed here so line saves, invoice totals, GST
+summaries and bulk recomputes agree to the paisa:
+
+- rupee amounts are converted to paise, and percentages to basis points
+  (18.00% -> 1800), rounding half up;
+- a line's taxable value is quantity * rate - discount, never below zero;
+- its tax is taxable * rate / 100, rounded half up to the paisa, per line;
+- its total is taxable + tax, and an invoice total is the sum of its lines.
+
+The scalar functions serve single saves; the *_batch functions take columns
+(equal-length sequences) and return array("q") columns, for recomputing many
+invoices at once. The batch functions give the same results at about the
+same per-line cost: they are a column-shaped API, not a faster one.
+"""
+from array import array
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+PAISE_PER_RUPEE = 100
+BASIS_POINTS = 10000  # 100% in basis points
+ONE = Decimal("1")
+
+
+def to_paise(amount):
+    """Rupees (Decimal, int, str or None) -> int paise, rounding half up."""
+    if amount is None:
+        return 0
+    return int((Decimal(amount) * PAISE_PER_RUPEE).quantize(ONE, ROUND_HALF_UP))
+
+
+def from_paise(paise):
+    """int paise -> Decimal rupees with two places."""
+    return Decimal(paise).scaleb(-2)
+
+
+def to_basis_points(percentage):
+    """Percentage (18.00) -> int basis points (1800), rounding half up."""
+    return to_paise(percentage)
+
+
+def divide_half_up(numerator, denominator):
+    """Integer division rounded half away from zero; `denominator` must be positive."""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+# -----------------------------
+# SCALAR API
+# -----------------------------
+def line_amounts(quantity, rate, discount, gst_rate):
+    """(taxable, tax, total) in paise; rate/discount in paise, gst_rate in basis points."""
+    taxable = max(quantity * rate - discount, 0)
+    tax = divide_half_up(taxable * gst_rate, BASIS_POINTS)
+    return taxable, tax, taxable + tax
+
+
+def line_amounts_from_decimal(quantity, rate, discount, gst_percentage):
+    """line_amounts() for the Decimal values stored on an InvoiceItem, returned as Decimal rupees."""
+    amounts = line_amounts(quantity, to_paise(rate), to_paise(discount), to_basis_points(gst_percentage or 0))
+    return tuple(from_paise(amount) for amount in amounts)
+
+
+def change_by_percentage(amount, percentage):
+    """Rupee `amount` raised (or, if negative, lowered) by `percentage`, rounded half up to the paisa."""
+    paise = divide_half_up(to_paise(amount) * (BASIS_POINTS + to_basis_points(percentage)), BASIS_POINTS)
+    return from_paise(paise)
+
+
+def split_tax(tax):
+    """(cgst, sgst) halves of an intra-state tax in paise: SGST takes the odd paisa."""
+    cgst = tax // 2
+    return cgst, tax - cgst
+
+
+def sum_amounts(amounts):
+    """Sum of Decimal rupee amounts, returned as Decimal rupees."""
+    return from_paise(sum(to_paise(amount) for amount in amounts))
+
+
+# -----------------------------
+# BATCH API
+# Column-shaped versions of the scalar functions, for code that recomputes
+# many lines at once. They are not vectorised: each element still goes
+# through the same Python arithmetic (and, for to_paise_batch, the same
+# Decimal conversion) as the scalar path, so they cost about as much per
+# line. line_amounts_batch() does its three columns in one pass.
+# -----------------------------
+def to_paise_batch(amounts):
+    return array("q", map(to_paise, amounts))
+
+
+def to_basis_points_batch(percentages):
+    return array("q", (to_basis_points(percentage or 0) for percentage in percentages))
+
+
+def line_amounts_batch(quantities, rates, discounts, gst_rates):
+    """
+    Column-wise line_amounts() over quantities, rates (paise), discounts
+    (paise) and gst_rates (basis points). Returns the (taxable, tax, total)
+    columns in paise.
+    """
+    taxable, tax, total = array("q"), array("q"), array("q")
+    half = BASIS_POINTS // 2
+    for quantity, rate, discount, gst_rate in zip(quantities, rates, discounts, gst_rates):
+        value = quantity * rate - discount
+        if value < 0:
+            value = 0
+        if gst_rate >= 0:
+            # value is never negative, so half up is a plain floor division
+            line_tax = (value * gst_rate + half) // BASIS_POINTS
+        else:
+            line_tax = divide_half_up(value * gst_rate, BASIS_POINTS)
+        taxable.append(value)
+        tax.append(line_tax)
+        total.append(value + line_tax)
+    return taxable, tax, total
+
+
+def sum_by_key(keys, amounts):
+    """{key: sum of amounts} for the equal-length `keys` and `amounts` columns."""
+    totals = defaultdict(int)
+    for key, amount in zip(keys, amounts):
+        totals[key] += amount
+    return dict(totals)
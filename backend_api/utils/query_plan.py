@@ -0,0 +1,141 @@
+# backend_api/utils/query_plan.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class QueryPlan:
+    """
+    select_related / prefetch_related / only() lookups needed to serialize a
+    queryset without per-row queries. `only` is None when a field reads
+    something we can't see (SerializerMethodField, model property), in which
+    case every column is loaded.
+    """
+
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = set()
+        self.only = {"pk"}
+
+    def disable_only(self):
+        self.only = None
+
+    def add_only(self, path):
+        if self.only is not None:
+            self.only.add(path)
+
+    def apply(self, queryset, use_only=True):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(self.prefetch_related))
+        if use_only and self.only is not None:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+    def __repr__(self):
+        return (
+            f"QueryPlan(select_related={sorted(self.select_related)}, "
+            f"prefetch_related={sorted(self.prefetch_related)}, "
+            f"only={sorted(self.only) if self.only is not None else None})"
+        )
+
+
+def _join(prefix, name):
+    return f"{prefix}__{name}" if prefix else name
+
+
+def _add_relation(plan, path, in_prefetch, many):
+    if in_prefetch or many:
+        plan.prefetch_related.add(path)
+    else:
+        plan.select_related.add(path)
+        plan.add_only(path)
+
+
+def _walk(serializer, model, plan, prefix="", in_prefetch=False):
+    meta = getattr(serializer, "Meta", None)
+    for hint in getattr(meta, "select_related", ()):
+        _add_relation(plan, _join(prefix, hint), in_prefetch, many=False)
+    for hint in getattr(meta, "prefetch_related", ()):
+        plan.prefetch_related.add(_join(prefix, hint))
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+            plan.disable_only()
+            if isinstance(field, serializers.BaseSerializer):
+                _walk(field, model, plan, prefix, in_prefetch)
+            continue
+
+        current_model = model
+        path = prefix
+        crossed_many = in_prefetch
+        attrs = field.source_attrs
+
+        for index, attr in enumerate(attrs):
+            is_last = index == len(attrs) - 1
+            try:
+                model_field = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # property / method on the model: we can't tell what it reads
+                plan.disable_only()
+                break
+
+            path = _join(path, attr)
+            if not model_field.is_relation:
+                if not crossed_many:
+                    plan.add_only(path)
+                break
+
+            many = model_field.many_to_many or model_field.one_to_many
+            if is_last and isinstance(field, serializers.RelatedField) and not many:
+                # primary key only: the FK column is enough
+                if not crossed_many:
+                    plan.add_only(path)
+                break
+            if is_last and isinstance(field, serializers.ManyRelatedField):
+                plan.prefetch_related.add(path)
+                break
+
+            _add_relation(plan, path, crossed_many, many)
+            crossed_many = crossed_many or many
+            current_model = model_field.related_model
+
+            if is_last and isinstance(field, serializers.ListSerializer):
+                _walk(field.child, current_model, plan, path, in_prefetch=True)
+            elif is_last and isinstance(field, serializers.BaseSerializer):
+                _walk(field, current_model, plan, path, crossed_many)
+
+
+_plan_cache = {}
+
+
+def get_query_plan(serializer_class):
+    """Build (once per serializer class) the query plan for serializing its model."""
+    plan = _plan_cache.get(serializer_class)
+    if plan is None:
+        plan = QueryPlan()
+        _walk(serializer_class(), serializer_class.Meta.model, plan)
+        _plan_cache[serializer_class] = plan
+    return plan
+
+
+class QueryPlanMixin:
+    """
+    ViewSet mixin that adds the select_related / prefetch_related / only()
+    lookups the serializer needs to every queryset passed through
+    filter_queryset() (list and get_object()).
+    only() is applied on read actions only, so saves never hit deferred fields.
+    """
+
+    query_plan_only_actions = ("list", "retrieve")
+    query_plan_skip_actions = ("destroy",)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.query_plan_skip_actions:
+            return queryset
+        plan = get_query_plan(self.get_serializer_class())
+        return plan.apply(queryset, use_only=self.action in self.query_plan_only_actions)
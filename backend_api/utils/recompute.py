@@ -0,0 +1,99 @@
+# backend_api/utils/recompute.py
+"""
+Bulk recompute of stored invoice amounts (manage.py recompute_invoice_totals).
+
+Invoices are walked in ascending primary-key chunks. Each chunk loads its
+invoices and their lines in two queries, recomputes every line at once with
+money.line_amounts_batch() and writes only the rows that changed, with
+bulk_update() in one transaction. bulk_update() sends no signals, so the sync
+change log and cached-response versions are updated here.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from backend_api.models import Invoice, InvoiceItem
+from backend_api.utils import money
+from backend_api.utils.response_cache import bump_versions, scope_for_instance
+from backend_api.utils.sync import record_changes
+
+LINE_FIELDS = ("pk", "quantity", "rate", "discount", "gst_percentage", "tax_amount", "total")
+
+
+def iter_id_chunks(queryset, chunk_size, after=None):
+    """Ascending primary keys of `queryset` after `after`, in lists of up to `chunk_size`."""
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    while True:
+        chunk = list((ids.filter(pk__gt=after) if after is not None else ids)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        after = chunk[-1]
+
+
+def recompute_chunk(invoice_ids, dry_run=False):
+    """
+    Recompute line tax/total and invoice totals of `invoice_ids`. Returns
+    {"invoices", "changed_invoices", "changed_lines", "last_pk", "diffs"},
+    where diffs describe every changed amount as text.
+    """
+    invoices = list(
+        Invoice.objects.filter(pk__in=invoice_ids)
+        .order_by("pk")
+        .only("pk", "user_id", "bill_id", "total_amount")
+        .prefetch_related(Prefetch("items", queryset=InvoiceItem.objects.only(*LINE_FIELDS).order_by("pk")))
+    )
+    lines = [(invoice, line) for invoice in invoices for line in invoice.items.all()]
+    _, taxes, totals = money.line_amounts_batch(
+        [line.quantity for _, line in lines],
+        money.to_paise_batch(line.rate for _, line in lines),
+        money.to_paise_batch(line.discount for _, line in lines),
+        money.to_basis_points_batch(line.gst_percentage for _, line in lines),
+    )
+
+    diffs = []
+    changed_lines = []
+    invoice_totals = defaultdict(int)
+    for (invoice, line), tax, total in zip(lines, taxes, totals):
+        invoice_totals[invoice.pk] += total
+        tax, total = money.from_paise(tax), money.from_paise(total)
+        if (line.tax_amount, line.total) != (tax, total):
+            diffs.append(
+                f"  {invoice.bill_id} line {line.pk}: tax {line.tax_amount} -> {tax}, total {line.total} -> {total}"
+            )
+            line.tax_amount, line.total = tax, total
+            changed_lines.append(line)
+
+    changed_invoices = []
+    for invoice in invoices:
+        total = money.from_paise(invoice_totals[invoice.pk])
+        if invoice.total_amount != total:
+            diffs.append(f"{invoice.bill_id} (#{invoice.pk}): total {invoice.total_amount} -> {total}")
+            invoice.total_amount = total
+            changed_invoices.append(invoice)
+
+    # invoices whose total or any line changed
+    changed_line_ids = {line.pk for line in changed_lines}
+    touched = {invoice.pk: invoice for invoice, line in lines if line.pk in changed_line_ids}
+    touched.update((invoice.pk, invoice) for invoice in changed_invoices)
+    if not dry_run and touched:
+        now = timezone.now()
+        for invoice in touched.values():
+            # detail ETags are built from updated_at
+            invoice.updated_at = now
+        with transaction.atomic():
+            InvoiceItem.objects.bulk_update(changed_lines, ["tax_amount", "total"], batch_size=500)
+            Invoice.objects.bulk_update(touched.values(), ["total_amount", "updated_at"], batch_size=500)
+            record_changes(touched.values())
+            for scope in {scope_for_instance(invoice) for invoice in touched.values()}:
+                bump_versions(scope, Invoice)
+
+    return {
+        "invoices": len(invoices),
+        "changed_invoices": len(changed_invoices),
+        "changed_lines": len(changed_lines),
+        "last_pk": invoice_ids[-1],
+        "diffs": diffs,
+    }
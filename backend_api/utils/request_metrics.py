@@ -0,0 +1,86 @@
+# backend_api/utils/request_metrics.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_current_metrics = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Per-request counters collected by RequestMetricsMiddleware.
+    - query_count / db_time: every SQL statement run through the connection
+    - timings: named phases such as "serializer", in seconds
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.timings = {}
+        self._depth = {}
+
+    # -------------------------------
+    # connection.execute_wrapper hook
+    # -------------------------------
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.query_count += 1
+
+    def add_timing(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def get_current_metrics():
+    return _current_metrics.get()
+
+
+def activate_metrics(metrics):
+    return _current_metrics.set(metrics)
+
+
+def deactivate_metrics(token):
+    _current_metrics.reset(token)
+
+
+@contextmanager
+def track_timing(name):
+    """
+    Add the time spent in the block to the current request's `name` timing.
+    Nested blocks with the same name are only counted once (outermost wins),
+    so nested serializers don't double count.
+    """
+    metrics = get_current_metrics()
+    if metrics is None:
+        yield
+        return
+
+    depth = metrics._depth.get(name, 0)
+    metrics._depth[name] = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._depth[name] = depth
+        if depth == 0:
+            metrics.add_timing(name, time.perf_counter() - start)
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin that reports to_representation() time as the
+    "serializer" phase of the current request.
+    """
+
+    def to_representation(self, instance):
+        with track_timing("serializer"):
+            return super().to_representation(instance)
@@ -0,0 +1,216 @@
+# backend_api/utils/response_cache.py
+"""
+Per-company response cache for read actions (list / retrieve).
+
+A cached body is keyed by the tenant scope, the view action, its URL kwargs,
+the normalized query string and the version counters of every model the
+view depends on. Writes bump the counters (see backend_api/signals.py), so
+stale entries are never read again and simply age out of the LRU cache. The
+counters are shared by all workers (backend_api/utils/versions.py), so the
+entries themselves may live in a per-process cache.
+
+Scopes are "c<company id>", or "u<user id>" for users without a company.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from backend_api.utils import versions
+
+# Version label bumped when a whole scope must be dropped (company saved or
+# deleted, new user without a company)
+SCOPE_LABEL = "*"
+
+
+def get_config():
+    return getattr(settings, "RESPONSE_CACHE", {})
+
+
+def is_enabled():
+    return get_config().get("ENABLED", False)
+
+
+def get_response_cache():
+    return caches[get_config().get("CACHE_ALIAS", "default")]
+
+
+# -----------------------------
+# SCOPES
+# -----------------------------
+def scope_for_user(user):
+    if user.company_id:
+        return f"c{user.company_id}"
+    return f"u{user.pk}"
+
+
+def _user_scope_key(user_id):
+    return f"scope:user:{user_id}"
+
+
+def remember_user_scope(user):
+    versions.get_cache().set(_user_scope_key(user.pk), scope_for_user(user), timeout=None)
+
+
+def scope_for_user_id(user_id):
+    """Scope of a user by id, from the cache when possible so signal handlers stay query-free."""
+    from backend_api.models import User
+
+    cache = versions.get_cache()
+    scope = cache.get(_user_scope_key(user_id))
+    if scope is None:
+        company_id = User.objects.filter(pk=user_id).values_list("company_id", flat=True).first()
+        scope = f"c{company_id}" if company_id else f"u{user_id}"
+        cache.set(_user_scope_key(user_id), scope, timeout=None)
+    return scope
+
+
+def scope_for_instance(instance):
+    """Tenant scope a model instance belongs to, or None if it has no owner."""
+    from backend_api.models import Company, User
+
+    if isinstance(instance, Company):
+        return f"c{instance.pk}"
+    if isinstance(instance, User):
+        return scope_for_user(instance)
+    if getattr(instance, "company_id", None):
+        return f"c{instance.company_id}"
+    if getattr(instance, "user_id", None):
+        user_field = instance._meta.get_field("user")
+        if user_field.is_cached(instance):
+            return scope_for_user(instance.user)
+        return scope_for_user_id(instance.user_id)
+    return None
+
+
+# -----------------------------
+# VERSION COUNTERS
+# -----------------------------
+def model_label(model):
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _version_key(scope, label):
+    return f"version:{scope}:{label}"
+
+
+def get_versions(scope, models, include_scope=True):
+    """Current version of each model (plus the scope itself) as a tuple."""
+    labels = [SCOPE_LABEL] if include_scope else []
+    labels += [model_label(model) for model in models]
+    return versions.get_versions([_version_key(scope, label) for label in labels])
+
+
+def bump_versions(scope, *models):
+    """Invalidate cached responses of `scope` that depend on `models`, in every worker."""
+    if not is_enabled() or scope is None:
+        return
+    labels = [model_label(model) for model in models] or [SCOPE_LABEL]
+    versions.bump(*(_version_key(scope, label) for label in labels))
+
+
+def bump_instance_versions(instance, *models):
+    """bump_versions() for the scope `instance` belongs to."""
+    if is_enabled():
+        bump_versions(scope_for_instance(instance), *models)
+
+
+# -----------------------------
+# VIEW DECORATOR
+# -----------------------------
+def get_cache_models(view):
+    return getattr(view, "cache_models", None) or (view.get_serializer_class().Meta.model,)
+
+
+def get_request_fingerprint(view, request):
+    """
+    Everything a read response depends on, as a list: model versions, action,
+    URL kwargs, query params, host. None when versions aren't being tracked.
+    """
+    if not is_enabled() or not request.user.is_authenticated:
+        return None
+
+    scope = scope_for_user(request.user)
+    params = sorted((key, request.query_params.getlist(key)) for key in request.query_params)
+    return [
+        scope,
+        get_versions(scope, get_cache_models(view)),
+        view.basename,
+        view.action,
+        sorted(view.kwargs.items()),
+        params,
+        request.get_host(),
+        request.user.pk if getattr(view, "cache_per_user", False) else None,
+    ]
+
+
+def get_cache_key(view, request):
+    """Cache key for this request, or None when the response must not be cached."""
+    if type(getattr(request, "accepted_renderer", None)) is not JSONRenderer:
+        return None
+    if view.action == "list" and getattr(view, "should_stream_list", lambda: False)():
+        return None
+
+    parts = get_request_fingerprint(view, request)
+    if parts is None:
+        return None
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f"response:{parts[0]}:{digest}"
+
+
+class CachedResponse(Response):
+    """
+    Response whose JSON body is already rendered. `.data` is decoded lazily
+    for callers (tests) that inspect it.
+    """
+
+    def __init__(self, content, status=None, data=None):
+        super().__init__(data, status=status, content_type="application/json")
+        self.cached_content = content
+
+    @property
+    def rendered_content(self):
+        return self.cached_content
+
+    @property
+    def data(self):
+        if self._data is None and getattr(self, "cached_content", None):
+            self._data = json.loads(self.cached_content)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+
+def cache_response(view_method):
+    """
+    Cache a read action's rendered JSON body. A hit returns the stored bytes
+    without touching the database or the serializer.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = get_cache_key(self, request)
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+
+        cache = get_response_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            status_code, content = cached
+            return CachedResponse(content, status=status_code)
+
+        response = view_method(self, request, *args, **kwargs)
+        if not isinstance(response, Response) or response.status_code != 200:
+            return response
+
+        content = request.accepted_renderer.render(response.data)
+        cache.set(key, (response.status_code, content), get_config().get("TIMEOUT", 300))
+        return CachedResponse(content, status=response.status_code, data=response.data)
+
+    return wrapper
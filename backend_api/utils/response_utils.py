@@ -1,4 +1,6 @@
 # backend_api/utils/response_utils.py
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -9,6 +11,29 @@ def success_response(message, data=None, status_code=status.HTTP_200_OK):
     )
 
 
+def streaming_success_response(message, chunks, status_code=status.HTTP_200_OK):
+    """
+    Same body as success_response(message, rows), streamed: the envelope goes
+    out first, then each chunk (a list of row dicts) is rendered as it's produced.
+    """
+    renderer = JSONRenderer()
+    envelope = renderer.render({"success": True, "message": message, "data": []})
+    prefix, suffix = envelope[:-3], envelope[-1:]  # split around the empty "[]"
+
+    def stream():
+        yield prefix + b"["
+        first = True
+        for chunk in chunks:
+            if not chunk:
+                continue
+            rows = renderer.render(chunk)[1:-1]
+            yield rows if first else b"," + rows
+            first = False
+        yield b"]" + suffix
+
+    return StreamingHttpResponse(stream(), status=status_code, content_type=renderer.media_type)
+
+
 def error_response(message, status_code=status.HTTP_400_BAD_REQUEST, errors=None):
     if isinstance(message, dict):
         errors = message
@@ -0,0 +1,205 @@
+# backend_api/utils/sync.py
+"""
+Delta sync for offline clients, backed by the append-only ChangeLog table.
+
+Signal receivers (backend_api/signals.py) append one entry per saved or
+deleted record. A client keeps the cursor from its last sync and gets back,
+per model, the current rows that changed after it plus tombstones (ids) for
+the ones that no longer exist or left its tenant. Entries only say *which*
+records changed; what is sent is always read from the current data.
+
+Entries are only acknowledged by the returned cursor once they are
+SYNC["SETTLE_SECONDS"] old, so a transaction that committed a lower id late
+is still picked up, on every page. Newer entries are sent anyway and simply
+sent again on the next sync; a full page of unsettled entries comes back
+with the same cursor and has_more until they settle.
+"""
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from backend_api.models import (
+    Account,
+    ChangeLog,
+    Contact,
+    Expense,
+    Income,
+    Invoice,
+    Items,
+)
+from backend_api.serializers import (
+    AccountSerializer,
+    ContactSerializer,
+    ExpenseSerializer,
+    IncomeSerializer,
+    InvoiceSerializer,
+    ItemSerializer,
+)
+from backend_api.serializers.values import get_values_serializer
+from backend_api.utils.permissions import has_module_permission
+from backend_api.utils.query_plan import get_query_plan
+from backend_api.utils.response_cache import scope_for_instance, scope_for_user
+
+
+class SyncModel:
+    def __init__(self, model, serializer_class, module, manager=None):
+        self.model = model
+        self.serializer_class = serializer_class
+        self.module = module
+        self.manager = manager or (lambda: model.objects.all())
+
+    def get_queryset(self, user):
+        """Same tenant scoping as the model's viewset."""
+        queryset = self.manager()
+        if user.company:
+            return queryset.filter(user__company=user.company)
+        return queryset.filter(user=user)
+
+
+# Key in the response -> how to read it. Keys double as ChangeLog.model.
+SYNC_MODELS = OrderedDict([
+    ("contacts", SyncModel(Contact, ContactSerializer, "contacts")),
+    ("items", SyncModel(Items, ItemSerializer, "items")),
+    ("invoices", SyncModel(Invoice, InvoiceSerializer, "invoices")),
+    ("accounts", SyncModel(Account, AccountSerializer, "accounts", lambda: Account.objects.with_balance())),
+    ("incomes", SyncModel(Income, IncomeSerializer, "accounts")),
+    ("expenses", SyncModel(Expense, ExpenseSerializer, "accounts")),
+])
+SYNC_KEYS = {sync_model.model: key for key, sync_model in SYNC_MODELS.items()}
+
+
+def get_config():
+    return getattr(settings, "SYNC", {})
+
+
+# -----------------------------
+# WRITING THE LOG
+# -----------------------------
+_pending = threading.local()
+
+
+def _entries_for(instance, action):
+    scope = scope_for_instance(instance)
+    key = SYNC_KEYS.get(type(instance))
+    if scope is None or key is None:
+        return []
+
+    entries = [ChangeLog(scope=scope, model=key, object_id=str(instance.pk), action=action)]
+    if isinstance(instance, (Income, Expense)) and instance.account_id:
+        # the account's balance moved with it
+        entries.append(
+            ChangeLog(scope=scope, model="accounts", object_id=str(instance.account_id), action=ChangeLog.UPSERT)
+        )
+    return entries
+
+
+def record_change(instance, action):
+    entries = _entries_for(instance, action)
+    if entries:
+        ChangeLog.objects.bulk_create(entries)
+
+
+def record_changes(instances, action=ChangeLog.UPSERT):
+    """record_change() for rows written with bulk_update() or update(), which send no signals."""
+    entries = [entry for instance in instances for entry in _entries_for(instance, action)]
+    if entries:
+        ChangeLog.objects.bulk_create(entries)
+
+
+def queue_delete(instance):
+    """
+    pre_delete: hold the tombstone until the delete runs. A cascade sends
+    pre_delete for every collected row before any post_delete, so
+    flush_deletes() writes all of them with one insert.
+    """
+    if not hasattr(_pending, "entries"):
+        _pending.entries = []
+    _pending.entries.extend(_entries_for(instance, ChangeLog.DELETE))
+
+
+def flush_deletes():
+    entries = getattr(_pending, "entries", None)
+    if entries:
+        _pending.entries = []
+        ChangeLog.objects.bulk_create(entries)
+
+
+# -----------------------------
+# READING CHANGES
+# -----------------------------
+def get_allowed_keys(user, requested=None):
+    keys = [key for key, sync_model in SYNC_MODELS.items() if has_module_permission(user, sync_model.module)]
+    if requested:
+        keys = [key for key in keys if key in requested]
+    return keys
+
+
+def _settled_before():
+    return timezone.now() - timedelta(seconds=get_config().get("SETTLE_SECONDS", 5))
+
+
+def serialize_rows(sync_model, queryset, context):
+    queryset = get_query_plan(sync_model.serializer_class).apply(queryset)
+    values_serializer = get_values_serializer(sync_model.serializer_class)
+    if values_serializer is not None:
+        return values_serializer.serialize(queryset)
+    return sync_model.serializer_class(queryset, many=True, context=context).data
+
+
+def get_snapshot(user, keys, context):
+    """Full current data for a client without a cursor."""
+    scope = scope_for_user(user)
+    cursor = (
+        ChangeLog.objects.filter(scope=scope, created_at__lte=_settled_before())
+        .aggregate(cursor=Max("id"))["cursor"]
+        or 0
+    )
+    changes = OrderedDict()
+    for key in keys:
+        sync_model = SYNC_MODELS[key]
+        queryset = sync_model.get_queryset(user).order_by("pk")
+        changes[key] = {"upserted": serialize_rows(sync_model, queryset, context), "deleted": []}
+    return {"cursor": cursor, "has_more": False, "changes": changes}
+
+
+def get_changes(user, cursor, keys, context, limit=None):
+    """Rows changed and deleted after `cursor`, at most `limit` log entries at a time."""
+    limit = limit or get_config().get("PAGE_SIZE", 500)
+    entries = list(
+        ChangeLog.objects.filter(scope=scope_for_user(user), id__gt=cursor, model__in=keys)
+        .order_by("id")
+        .values_list("id", "model", "object_id", "action", "created_at")[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    changed = OrderedDict((key, OrderedDict()) for key in keys)
+    for _, key, object_id, _, _ in entries:
+        changed[key][object_id] = None
+
+    # on full pages too: a lower id committing late must not fall behind the cursor.
+    # A full page with nothing settled keeps the old cursor and has_more.
+    next_cursor = cursor
+    settled_before = _settled_before()
+    for entry_id, _, _, _, created_at in entries:
+        if created_at > settled_before:
+            break
+        next_cursor = entry_id
+
+    changes = OrderedDict()
+    for key, object_ids in changed.items():
+        if not object_ids:
+            continue
+        sync_model = SYNC_MODELS[key]
+        queryset = sync_model.get_queryset(user).filter(pk__in=list(object_ids)).order_by("pk")
+        upserted = serialize_rows(sync_model, queryset, context)
+        # deleted, or moved out of this tenant
+        found = {str(row["id"]) for row in upserted}
+        deleted = [object_id for object_id in object_ids if object_id not in found]
+        changes[key] = {"upserted": upserted, "deleted": deleted}
+
+    return {"cursor": next_cursor, "has_more": has_more, "changes": changes}
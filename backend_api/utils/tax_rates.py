@@ -0,0 +1,43 @@
+# backend_api/utils/tax_rates.py
+"""
+GST rates for invoice lines.
+
+A line with a `tax` uses that Tax's rate; otherwise an explicit
+gst_percentage is kept, then the item's tax_category ("gst-18" -> 18%)
+applies, and a line with none of these is untaxed.
+
+Tax rates are read from a per-company {tax_id: rate} table held in each
+process under a shared version counter (utils/versions.py), bumped whenever
+one of the company's taxes is saved or deleted (signals.py), so a changed
+table is reloaded with one query on its next use in every worker. Resolving
+the rates of any number of lines costs one counter read and no queries.
+"""
+from decimal import Decimal
+
+from backend_api.models import Tax
+from backend_api.utils.versions import VersionedTables
+
+ZERO = Decimal("0")
+
+_tables = VersionedTables("tax_rates")
+
+
+def invalidate_tax_rates(company_id):
+    if company_id:
+        _tables.invalidate(company_id)
+
+
+def get_tax_rates(company_id):
+    """{tax id: rate} of every Tax of the company."""
+    if not company_id:
+        return {}
+    return _tables.get(
+        company_id, lambda: dict(Tax.objects.filter(company_id=company_id).values_list("id", "rate"))
+    )
+
+
+def get_category_rate(tax_category):
+    """Rate of an Items.tax_category: "gst-18" -> 18; nil-rated, exempt, non-GST and none -> 0."""
+    if tax_category and tax_category.startswith("gst-"):
+        return Decimal(tax_category[4:])
+    return ZERO
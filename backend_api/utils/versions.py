@@ -0,0 +1,127 @@
+# backend_api/utils/versions.py
+"""
+Version counters shared by every worker process.
+
+A process may keep data derived from the database in memory (rendered
+responses, tax rate tables, item rows) as long as it tags that data with a
+counter that every write to the underlying rows bumps: a tag that no longer
+matches the current counter means the data must be reloaded.
+VersionedTables does this for tables held in module state.
+
+The counters live in the VERSIONS["CACHE_ALIAS"] cache, which every worker
+must see. The default file backend is shared by the workers of one host;
+deployments on several hosts point VERSIONS_CACHE_BACKEND/LOCATION at a
+network cache. check_shared() refuses a per-process store when the app runs
+with more than one worker.
+"""
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+
+def get_config():
+    return getattr(settings, "VERSIONS", {})
+
+
+def get_cache():
+    return caches[get_config().get("CACHE_ALIAS", "versions")]
+
+
+def is_shared(cache):
+    """False for caches that live inside one process."""
+    return not isinstance(cache, LocMemCache)
+
+
+def check_shared():
+    """Raise ImproperlyConfigured when several workers would each count on their own."""
+    workers = get_config().get("WORKERS", 1)
+    if workers > 1 and not is_shared(get_cache()):
+        raise ImproperlyConfigured(
+            f"VERSIONS uses a per-process cache but WEB_CONCURRENCY is {workers}: "
+            "configure a cache shared by all workers (VERSIONS_CACHE_BACKEND)."
+        )
+
+
+def _initial_version():
+    # Counters can be evicted; restarting from the clock means a version
+    # number is never handed out twice for the same key.
+    return time.time_ns()
+
+
+def get_versions(keys):
+    """Current value of each counter in `keys`, as a tuple."""
+    cache = get_cache()
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial_version(), timeout=None)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return tuple(versions)
+
+
+def get_version(key):
+    return get_versions([key])[0]
+
+
+def _bump(keys):
+    cache = get_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+
+
+def bump(*keys):
+    """
+    Bump the counters immediately (so the writing request never reads its own
+    stale data) and again on commit (so data a concurrent reader loaded
+    before the commit, under the new version, is dropped too).
+    """
+    _bump(keys)
+    transaction.on_commit(lambda: _bump(keys))
+
+
+class VersionedTables:
+    """
+    Per-process tables, each kept under the counter "<prefix>:version:<name>"
+    and replaced when that counter moves. At most `max_tables` (a callable,
+    so it can follow settings) are held, least recently used dropped first.
+    """
+
+    def __init__(self, prefix, max_tables=None):
+        self.prefix = prefix
+        self.max_tables = max_tables
+        self._tables = OrderedDict()
+
+    def version_key(self, name):
+        return f"{self.prefix}:version:{name}"
+
+    def get(self, name, load=dict):
+        """The table of `name`, from `load()` when it is missing or out of date."""
+        # read the version first: a change made while loading leaves the table
+        # stored under the old version, so the next use reloads it
+        version = get_version(self.version_key(name))
+        entry = self._tables.get(name)
+        if entry is None or entry[0] != version:
+            entry = self._tables[name] = (version, load())
+        self._tables.move_to_end(name)
+        if self.max_tables is not None:
+            while len(self._tables) > self.max_tables():
+                self._tables.popitem(last=False)
+        return entry[1]
+
+    def invalidate(self, name):
+        """Drop the table of `name` in every process."""
+        self._tables.pop(name, None)
+        bump(self.version_key(name))
+
+    def clear(self):
+        self._tables.clear()
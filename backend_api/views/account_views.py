@@ -6,15 +6,21 @@ from backend_api.models import Account, Income, Expense
 from backend_api.utils.permissions import HasCompanyModulePermission
 from backend_api.serializers import AccountSerializer, IncomeSerializer, ExpenseSerializer
 from backend_api.utils.response_utils import success_response, error_response
+from backend_api.utils.query_plan import QueryPlanMixin
+from backend_api.views.mixins import ReplicaReadMixin, ValuesListMixin
+from backend_api.utils.response_cache import cache_response
+from backend_api.utils.conditional import check_if_match, conditional_response
+from backend_api.utils.idempotency import idempotent
 
 
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for Accounts.
     """
     serializer_class = AccountSerializer
     permission_classes = [IsAuthenticated, HasCompanyModulePermission]
     permission_module_name = "accounts"
+    cache_models = (Account, Income, Expense)
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name"]
     ordering_fields = ["created_at", "name"]
@@ -22,8 +28,8 @@ class AccountViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.company:
-            return Account.objects.filter(user__company=user.company).order_by("-created_at")
-        return Account.objects.filter(user=user).order_by("-created_at")
+            return Account.objects.with_balance().filter(user__company=user.company).order_by("-created_at")
+        return Account.objects.with_balance().filter(user=user).order_by("-created_at")
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -34,16 +40,20 @@ class AccountViewSet(viewsets.ModelViewSet):
             )
         return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Accounts fetched successfully.", serializer.data)
+        return self.list_response("Accounts fetched successfully.", queryset)
 
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return success_response("Account retrieved successfully.", serializer.data)
 
+    @check_if_match
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = self.get_object()
@@ -65,13 +75,14 @@ class AccountViewSet(viewsets.ModelViewSet):
         )
 
 
-class IncomeViewSet(viewsets.ModelViewSet):
+class IncomeViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for Income transactions.
     """
     serializer_class = IncomeSerializer
     permission_classes = [IsAuthenticated, HasCompanyModulePermission]
     permission_module_name = "accounts"
+    cache_models = (Income, Account)
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["category", "notes", "account__name"]
     ordering_fields = ["date", "created_at", "amount"]
@@ -82,6 +93,7 @@ class IncomeViewSet(viewsets.ModelViewSet):
             return Income.objects.filter(user__company=user.company).order_by("-date", "-created_at")
         return Income.objects.filter(user=user).order_by("-date", "-created_at")
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -91,16 +103,20 @@ class IncomeViewSet(viewsets.ModelViewSet):
             )
         return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Income transactions fetched successfully.", serializer.data)
+        return self.list_response("Income transactions fetched successfully.", queryset)
 
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return success_response("Income transaction retrieved successfully.", serializer.data)
 
+    @check_if_match
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = self.get_object()
@@ -122,13 +138,14 @@ class IncomeViewSet(viewsets.ModelViewSet):
         )
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for Expense transactions.
     """
     serializer_class = ExpenseSerializer
     permission_classes = [IsAuthenticated, HasCompanyModulePermission]
     permission_module_name = "accounts"
+    cache_models = (Expense, Account)
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["category", "notes", "account__name"]
     ordering_fields = ["date", "created_at", "amount"]
@@ -139,6 +156,7 @@ class ExpenseViewSet(viewsets.ModelViewSet):
             return Expense.objects.filter(user__company=user.company).order_by("-date", "-created_at")
         return Expense.objects.filter(user=user).order_by("-date", "-created_at")
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -148,16 +166,20 @@ class ExpenseViewSet(viewsets.ModelViewSet):
             )
         return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Expense transactions fetched successfully.", serializer.data)
+        return self.list_response("Expense transactions fetched successfully.", queryset)
 
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return success_response("Expense transaction retrieved successfully.", serializer.data)
 
+    @check_if_match
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = self.get_object()
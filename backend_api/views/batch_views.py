@@ -0,0 +1,190 @@
+# backend_api/views/batch_views.py
+import json
+from io import BytesIO
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpRequest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from backend_api.utils.response_utils import error_response, success_response
+from backend_api.views import (
+    ContactViewSet,
+    ExpenseViewSet,
+    IncomeViewSet,
+    InvoiceViewSet,
+    ItemsViewSet,
+)
+
+# resource -> (viewset, router basename)
+BATCH_RESOURCES = {
+    "contacts": (ContactViewSet, "contact"),
+    "items": (ItemsViewSet, "items"),
+    "invoices": (InvoiceViewSet, "invoice"),
+    "incomes": (IncomeViewSet, "income"),
+    "expenses": (ExpenseViewSet, "expense"),
+}
+METHOD_ACTIONS = {
+    "POST": "create",
+    "PUT": "update",
+    "PATCH": "partial_update",
+    "DELETE": "destroy",
+}
+# headers of the batch request that must not leak into its operations
+SKIPPED_HEADERS = ("HTTP_IF_MATCH", "HTTP_IF_NONE_MATCH", "HTTP_IDEMPOTENCY_KEY")
+
+_views = {}
+
+
+def get_operation_view(resource, method):
+    key = (resource, method)
+    if key not in _views:
+        viewset, _ = BATCH_RESOURCES[resource]
+        _views[key] = viewset.as_view({method.lower(): METHOD_ACTIONS[method]})
+    return _views[key]
+
+
+def resolve_refs(value, refs):
+    """Replace "$<ref>" strings with the id created by the operation named <ref>."""
+    if isinstance(value, str) and value.startswith("$") and value[1:] in refs:
+        return refs[value[1:]]
+    if isinstance(value, dict):
+        return {key: resolve_refs(item, refs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_refs(item, refs) for item in value]
+    return value
+
+
+def build_operation_request(request, method, path, data, if_match=None):
+    """
+    A request for one operation, dispatched straight to the viewset. It reuses
+    the batch request's already authenticated user instead of authenticating again.
+    """
+    body = json.dumps(data, cls=DjangoJSONEncoder).encode() if data is not None else b""
+    meta = {key: value for key, value in request.META.items() if key not in SKIPPED_HEADERS}
+    meta.update({
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+    })
+    if if_match:
+        meta["HTTP_IF_MATCH"] = if_match
+
+    operation_request = HttpRequest()
+    operation_request.method = method
+    operation_request.path = operation_request.path_info = path
+    operation_request.META = meta
+    operation_request._stream = BytesIO(body)
+    operation_request._read_started = False
+    operation_request._force_auth_user = request.user
+    operation_request._force_auth_token = request.auth
+    return operation_request
+
+
+class BatchView(APIView):
+    """
+    POST /api/batch/
+    Runs an ordered list of writes in one transaction: all of them are saved,
+    or none are.
+
+    {"operations": [
+        {"ref": "c1", "method": "POST", "resource": "contacts", "data": {"name": "Asha"}},
+        {"method": "POST", "resource": "invoices", "data": {"contact": "$c1", "items": [...]}},
+        {"method": "PATCH", "resource": "items", "id": 7, "data": {"rate": 120}, "if_match": "\"...\""},
+        {"method": "DELETE", "resource": "expenses", "id": 3}
+    ]}
+
+    - resource: contacts, items, invoices, incomes, expenses
+    - method: POST (create), PUT, PATCH or DELETE (need "id")
+    - ref: a client-side name for a created record; later operations use
+      "$<ref>" in "id" or anywhere in "data" to refer to its id
+    Each operation goes through the same viewset, permissions and validation
+    as its own request would. The response lists one result per operation;
+    on the first failure everything is rolled back and the failed operation
+    carries the errors.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        operations = request.data.get("operations") if isinstance(request.data, dict) else None
+        errors = self.validate_operations(operations)
+        if errors:
+            return error_response(errors, status.HTTP_400_BAD_REQUEST)
+
+        refs = {}
+        results = []
+        with transaction.atomic():
+            for index, operation in enumerate(operations):
+                result = self.run_operation(request, operation, refs)
+                results.append(result)
+                if result["status"] >= 400:
+                    transaction.set_rollback(True)
+                    return error_response(
+                        f"Operation {index} failed; no changes were saved.",
+                        status.HTTP_400_BAD_REQUEST,
+                        errors={"results": results},
+                    )
+
+        return success_response("Batch applied successfully.", {"results": results, "refs": refs})
+
+    def validate_operations(self, operations):
+        max_operations = getattr(settings, "BATCH", {}).get("MAX_OPERATIONS", 200)
+        if not isinstance(operations, list) or not operations:
+            return {"operations": "A non-empty list of operations is required."}
+        if len(operations) > max_operations:
+            return {"operations": f"At most {max_operations} operations per batch."}
+
+        errors = {}
+        refs = set()
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                errors[index] = "Each operation must be an object."
+                continue
+            method = str(operation.get("method", "")).upper()
+            if operation.get("resource") not in BATCH_RESOURCES:
+                errors[index] = f"resource must be one of: {', '.join(BATCH_RESOURCES)}."
+            elif method not in METHOD_ACTIONS:
+                errors[index] = f"method must be one of: {', '.join(METHOD_ACTIONS)}."
+            elif (method == "POST") == ("id" in operation):
+                errors[index] = "id is required for PUT, PATCH and DELETE, and not allowed for POST."
+            elif "ref" in operation and (method != "POST" or operation["ref"] in refs):
+                errors[index] = "ref names a created record and must be unique."
+            refs.add(operation.get("ref"))
+        return errors
+
+    def run_operation(self, request, operation, refs):
+        method = operation["method"].upper()
+        _, basename = BATCH_RESOURCES[operation["resource"]]
+        data = resolve_refs(operation.get("data"), refs)
+        if method == "POST":
+            path = reverse(f"{basename}-list")
+            kwargs = {}
+        else:
+            object_id = resolve_refs(operation["id"], refs)
+            path = reverse(f"{basename}-detail", kwargs={"pk": object_id})
+            kwargs = {"pk": str(object_id)}
+
+        operation_request = build_operation_request(request, method, path, data, operation.get("if_match"))
+        response = get_operation_view(operation["resource"], method)(operation_request, **kwargs)
+
+        result = {"status": response.status_code}
+        if "ref" in operation:
+            result["ref"] = operation["ref"]
+        body = response.data if isinstance(response.data, dict) else {}
+        if response.status_code >= 400:
+            result["errors"] = body.get("errors") or body.get("message") or body.get("detail")
+            return result
+
+        result["data"] = body.get("data")
+        if method == "POST" and "ref" in operation and isinstance(result["data"], dict):
+            refs[operation["ref"]] = result["data"].get("id")
+        if response.has_header("ETag"):
+            result["etag"] = response["ETag"]
+        return result
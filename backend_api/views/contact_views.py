@@ -1,12 +1,23 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, status, filters
+from rest_framework.decorators import action
 from backend_api.models import Contact
 from backend_api.utils.permissions import HasCompanyModulePermission
 from backend_api.serializers import ContactSerializer
 from rest_framework.permissions import IsAuthenticated
 from backend_api.utils.response_utils import success_response, error_response
+from backend_api.utils.query_plan import QueryPlanMixin
+from backend_api.views.mixins import ReplicaReadMixin, ValuesListMixin
+from backend_api.utils.response_cache import bump_versions, cache_response, scope_for_user
+from backend_api.utils.conditional import check_if_match, conditional_response
+from backend_api.utils.contact_items import get_suggestions
+from backend_api.utils.geo import get_city_index
+from backend_api.utils.sync import record_changes
+from backend_api.views.geo_views import parse_max_km, parse_point
 
 
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD for Contact model.
     - Only accessible to authenticated users.
@@ -27,6 +38,10 @@ class ContactViewSet(viewsets.ModelViewSet):
         "billing_country",
     ]
     ordering_fields = ["created_at", "name"]
+    max_fill_locations = 5000
+    fill_locations_max_km = 50
+    suggestions_default_limit = 10
+    suggestions_max_limit = 50
 
     # def filter_queryset(self, queryset):
     #     search_query = self.request.query_params.get('search')
@@ -53,14 +68,17 @@ class ContactViewSet(viewsets.ModelViewSet):
     # -------------------------------
     # GET /contacts/
     # -------------------------------
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Contacts fetched successfully.", serializer.data)
+        return self.list_response("Contacts fetched successfully.", queryset)
 
     # -------------------------------
     # GET /contacts/<id>/
     # -------------------------------
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -84,6 +102,7 @@ class ContactViewSet(viewsets.ModelViewSet):
     # PUT /contacts/<id>/
     # PATCH /contacts/<id>/
     # -------------------------------
+    @check_if_match
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = self.get_object()
@@ -107,3 +126,100 @@ class ContactViewSet(viewsets.ModelViewSet):
         return success_response(
             "Contact deleted successfully.", {}, status.HTTP_204_NO_CONTENT
         )
+
+    # -------------------------------
+    # POST /contacts/fill-locations/
+    # -------------------------------
+    @action(detail=False, methods=["POST"], url_path="fill-locations")
+    def fill_locations(self, request):
+        """
+        Fill billing_city / billing_state from coordinates, e.g. for an
+        imported address book: {"contacts": [{"id", "lat", "lon"}, ...]}.
+        Contacts that already have a billing city are skipped unless
+        "overwrite" is true, as are points more than "max_km" (default 50)
+        from every known city.
+        """
+        entries = request.data.get("contacts")
+        if not isinstance(entries, list) or not 0 < len(entries) <= self.max_fill_locations:
+            return error_response(
+                f"contacts must be a list of 1 to {self.max_fill_locations} {{id, lat, lon}} objects.",
+                status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            points = {int(entry["id"]): parse_point(entry) for entry in entries}
+            max_km = parse_max_km(request.data)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return error_response("Every contact needs an id and numeric lat and lon.", status.HTTP_400_BAD_REQUEST)
+        if max_km is None:
+            max_km = self.fill_locations_max_km
+        overwrite = request.data.get("overwrite") is True
+
+        index = get_city_index()
+        updated, skipped = [], []
+        now = timezone.now()
+        with transaction.atomic():
+            contacts = self.get_queryset().in_bulk(list(points))
+            for pk, (latitude, longitude) in points.items():
+                contact = contacts.get(pk)
+                if contact is None or (contact.billing_city and not overwrite):
+                    skipped.append(pk)
+                    continue
+                nearest = index.nearest(latitude, longitude, 1, max_km)
+                if not nearest:
+                    skipped.append(pk)
+                    continue
+                city = index.city(nearest[0][1])
+                contact.billing_city, contact.billing_state = city["name"], city["state"]
+                if contact.same_as_billing:
+                    contact.shipping_city, contact.shipping_state = city["name"], city["state"]
+                contact.updated_at = now
+                updated.append(contact)
+
+            if updated:
+                # bulk_update sends no signals: log the sync changes and drop cached reads here
+                Contact.objects.bulk_update(
+                    updated,
+                    ["billing_city", "billing_state", "shipping_city", "shipping_state", "updated_at"],
+                    batch_size=500,
+                )
+                record_changes(updated)
+                bump_versions(scope_for_user(request.user), Contact)
+
+        return success_response(
+            "Contact locations filled successfully.",
+            {
+                "updated": [
+                    {"id": contact.pk, "billing_city": contact.billing_city, "billing_state": contact.billing_state}
+                    for contact in updated
+                ],
+                "skipped": skipped,
+            },
+        )
+
+    # -------------------------------
+    # GET /contacts/<id>/suggested-items/
+    # -------------------------------
+    @action(detail=True, methods=["GET"], url_path="suggested-items")
+    def suggested_items(self, request, pk=None):
+        """
+        Items billed to this contact before, with the rate, discount and GST
+        of the latest line, to pre-fill a new invoice.
+        - ?order_by=frequent (default, most invoices first) or recent.
+        - ?limit=<n> (default 10, at most 50).
+        """
+        order_by = request.query_params.get("order_by", "frequent")
+        if order_by not in ("frequent", "recent"):
+            return error_response({"order_by": "Must be frequent or recent."}, status.HTTP_400_BAD_REQUEST)
+        try:
+            contact_id = int(pk)
+            limit = int(request.query_params.get("limit", self.suggestions_default_limit))
+        except ValueError:
+            return error_response("Contact id and limit must be integers.", status.HTTP_400_BAD_REQUEST)
+        if not 0 < limit <= self.suggestions_max_limit:
+            return error_response(
+                {"limit": f"Must be between 1 and {self.suggestions_max_limit}."}, status.HTTP_400_BAD_REQUEST
+            )
+
+        # scoped to the tenant, so another company's contact just has no suggestions
+        suggestions = get_suggestions(scope_for_user(request.user), contact_id, limit, order_by)
+        return success_response("Suggested items fetched successfully.", suggestions)
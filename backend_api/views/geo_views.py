@@ -0,0 +1,96 @@
+# backend_api/views/geo_views.py
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from backend_api.utils.geo import get_city_index
+from backend_api.utils.response_utils import error_response, success_response
+
+
+class CitySearchView(APIView):
+    """
+    GET /api/geo/cities/?q=<prefix>
+    Cities whose name starts with `q` (case and accents ignored), in
+    alphabetical order, as [{"name", "state_code", "state"}].
+    - ?state=MH limits the results to one state code.
+    - ?limit=<n> (default 10, at most 50).
+    """
+
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return error_response("limit must be an integer.", status.HTTP_400_BAD_REQUEST)
+        if not 0 < limit <= self.max_limit:
+            return error_response(f"limit must be between 1 and {self.max_limit}.", status.HTTP_400_BAD_REQUEST)
+
+        query = request.query_params.get("q", "")
+        state_code = request.query_params.get("state", "").upper() or None
+        cities = get_city_index().search(query, limit=limit, state_code=state_code)
+        return success_response("Cities fetched successfully.", cities)
+
+
+class NearestCityView(APIView):
+    """
+    GET /api/geo/nearest/?lat=<lat>&lon=<lon>
+    Cities closest to the point, nearest first, as
+    [{"name", "state_code", "state", "distance_km"}].
+    - ?limit=<n> (default 5, at most 50); ?max_km=<km> drops cities further away.
+
+    POST /api/geo/nearest/  {"points": [{"lat": .., "lon": ..}, ...], "max_km": ..}
+    Batch mode: the nearest city (or null) for each point, in order.
+    """
+
+    permission_classes = [IsAuthenticated]
+    default_limit = 5
+    max_limit = 50
+    max_points = 5000
+
+    def get(self, request):
+        try:
+            latitude, longitude = parse_point(request.query_params)
+            limit = int(request.query_params.get("limit", self.default_limit))
+            max_km = parse_max_km(request.query_params)
+        except (TypeError, ValueError):
+            return error_response("lat, lon, limit and max_km must be numbers.", status.HTTP_400_BAD_REQUEST)
+        if not 0 < limit <= self.max_limit:
+            return error_response(f"limit must be between 1 and {self.max_limit}.", status.HTTP_400_BAD_REQUEST)
+
+        cities = get_city_index().nearest_cities(latitude, longitude, limit, max_km)
+        return success_response("Nearest cities fetched successfully.", cities)
+
+    def post(self, request):
+        points = request.data.get("points")
+        if not isinstance(points, list) or not 0 < len(points) <= self.max_points:
+            return error_response(
+                f"points must be a list of 1 to {self.max_points} {{lat, lon}} objects.", status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            max_km = parse_max_km(request.data)
+            points = [parse_point(point) for point in points]
+        except (AttributeError, TypeError, ValueError):
+            return error_response("Every point needs numeric lat and lon.", status.HTTP_400_BAD_REQUEST)
+
+        index = get_city_index()
+        results = []
+        for latitude, longitude in points:
+            cities = index.nearest_cities(latitude, longitude, 1, max_km)
+            results.append(cities[0] if cities else None)
+        return success_response("Nearest cities fetched successfully.", results)
+
+
+def parse_point(data):
+    """(lat, lon) floats from a mapping; raises ValueError when out of range."""
+    latitude, longitude = float(data.get("lat")), float(data.get("lon"))
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("Coordinates out of range.")
+    return latitude, longitude
+
+
+def parse_max_km(data):
+    max_km = data.get("max_km")
+    return None if max_km in (None, "") else float(max_km)
@@ -6,19 +6,29 @@ from rest_framework import viewsets, status
 from django.utils.dateparse import parse_date
 from rest_framework.permissions import IsAuthenticated
 from backend_api.utils.permissions import HasCompanyModulePermission
-from backend_api.models import Invoice
+from backend_api.models import Company, Contact, Invoice
 from backend_api.serializers.invoice import InvoiceSerializer
+from backend_api.utils.gst import get_gst_report
 from backend_api.utils.invoice_utils import (
     get_missing_invoice_numbers,
     get_next_invoice_number,
 )
 from backend_api.utils.response_utils import success_response, error_response
+from backend_api.utils.query_plan import QueryPlanMixin
+from backend_api.views.mixins import ReplicaReadMixin, ValuesListMixin
+from backend_api.utils.response_cache import cache_response
+from backend_api.utils.conditional import check_if_match, conditional_response
+from backend_api.utils.idempotency import idempotent
 
 
-class InvoiceViewSet(viewsets.ModelViewSet):
+class InvoiceViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = InvoiceSerializer
     permission_classes = [IsAuthenticated, HasCompanyModulePermission]
     permission_module_name = "invoices"
+    # gst_summary reads the contact's and the company's state; next/available
+    # invoice numbers depend on the company's other invoices
+    cache_models = (Invoice, Contact, Company)
+    detail_etag_models = (Invoice, Contact, Company)
     filter_backends = [SearchFilter, DjangoFilterBackend]
     # search_fields = ["bill_id", "invoice_number", "invoice_type", "notes"]
     # filterset_fields = ["invoice_type", "supply_type", "invoice_date", "total_amount"]
@@ -31,6 +41,9 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         "contact__name",
     ]
     filterset_fields = ["invoice_type", "supply_type", "invoice_date", "total_amount"]
+    # the report reads values(), not serialized rows
+    query_plan_skip_actions = ("destroy", "gst_report")
+    replica_actions = ("list", "retrieve", "gst_report")
 
     def get_queryset(self):
         user = self.request.user
@@ -66,6 +79,29 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             status.HTTP_200_OK,
         )
 
+    # ------------------------------------------------------
+    # API: GET GST totals per place of supply
+    # ------------------------------------------------------
+    @action(detail=False, methods=["GET"], url_path="gst-report")
+    def gst_report(self, request):
+        """
+        CGST / SGST / IGST totals of the company's invoices, overall and per
+        place of supply. Optional ?date_from= and ?date_to= (YYYY-MM-DD)
+        bound invoice_date; the other list filters apply too.
+        """
+        queryset = self.get_queryset()
+        for param, lookup in (("date_from", "invoice_date__gte"), ("date_to", "invoice_date__lte")):
+            value = request.query_params.get(param)
+            if value:
+                parsed_date = parse_date(value)
+                if not parsed_date:
+                    return error_response({param: "Invalid date"}, status.HTTP_400_BAD_REQUEST)
+                queryset = queryset.filter(**{lookup: parsed_date})
+
+        queryset = self.filter_queryset(queryset)
+        return success_response("GST report fetched successfully.", get_gst_report(queryset))
+
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
 
@@ -79,11 +115,14 @@ class InvoiceViewSet(viewsets.ModelViewSet):
 
         return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Invoices fetched successfully.", serializer.data)
+        return self.list_response("Invoices fetched successfully.", queryset)
 
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         invoice = self.get_object()
         serializer = self.get_serializer(invoice)
@@ -91,6 +130,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             "Invoice details fetched successfully.", serializer.data
         )
 
+    @check_if_match
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = self.get_object()
@@ -1,16 +1,29 @@
 # backend_api/views/items_views.py
 
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, status, filters
-from backend_api.models import Items
+from rest_framework.decorators import action
+from backend_api.models import Items, ItemSales
 
 from rest_framework.permissions import IsAuthenticated
 
 from backend_api.utils.permissions import HasCompanyModulePermission
-from backend_api.serializers import ItemSerializer
+from backend_api.serializers import ItemBulkUpdateSerializer, ItemSerializer, item_price_errors
 from backend_api.utils.response_utils import success_response, error_response
-
-
-class ItemsViewSet(viewsets.ModelViewSet):
+from backend_api.utils.query_plan import QueryPlanMixin
+from backend_api.views.mixins import ReplicaReadMixin, ValuesListMixin
+from backend_api.utils.response_cache import cache_response
+from backend_api.utils.conditional import check_if_match, conditional_response
+from backend_api.utils.item_catalog import invalidate_item_catalog
+from backend_api.utils.item_sales import METRICS, get_ranking, get_trend, month_of
+from backend_api.utils.money import change_by_percentage
+from backend_api.utils.response_cache import bump_versions, scope_for_user
+from backend_api.utils.sync import record_changes
+
+
+class ItemsViewSet(ReplicaReadMixin, QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for Items model.
     - Authenticated users only
@@ -25,6 +38,9 @@ class ItemsViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name", "type", "unit_type", "tax_category"]
     ordering_fields = ["created_at", "name", "rate"]
+    replica_actions = ("list", "retrieve", "analytics")
+    analytics_default_limit = 10
+    analytics_max_limit = 100
 
     # -----------------------------
     # QUERYSET RESTRICTION
@@ -36,6 +52,137 @@ class ItemsViewSet(viewsets.ModelViewSet):
             return Items.objects.filter(user__company=user.company).order_by("-created_at")
         return Items.objects.filter(user=user).order_by("-created_at")
 
+    # -----------------------------
+    # SALES ANALYTICS
+    # -----------------------------
+    @action(detail=False, methods=["GET"], url_path="analytics")
+    def analytics(self, request):
+        """
+        Item sales from the per-item monthly totals (utils/item_sales.py):
+        a ranking of items and the totals per month.
+        - ?date_from= / ?date_to= (YYYY-MM-DD) bound the months they fall in.
+        - ?item=<id> limits both to one item.
+        - ?order_by= ranks by revenue (default), quantity, tax or lines.
+        - ?limit=<n> (default 10, at most 100) ranked items.
+        """
+        params = request.query_params
+        queryset = ItemSales.objects.filter(scope=scope_for_user(request.user))
+        for param, lookup in (("date_from", "month__gte"), ("date_to", "month__lte")):
+            value = params.get(param)
+            if value:
+                parsed_date = parse_date(value)
+                if not parsed_date:
+                    return error_response({param: "Invalid date"}, status.HTTP_400_BAD_REQUEST)
+                queryset = queryset.filter(**{lookup: month_of(parsed_date)})
+        if params.get("item"):
+            try:
+                queryset = queryset.filter(item_id=int(params["item"]))
+            except ValueError:
+                return error_response({"item": "Invalid item id"}, status.HTTP_400_BAD_REQUEST)
+
+        metric = params.get("order_by", "revenue")
+        if metric not in METRICS:
+            return error_response(
+                {"order_by": f"Must be one of: {', '.join(METRICS)}."}, status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = int(params.get("limit", self.analytics_default_limit))
+        except ValueError:
+            return error_response({"limit": "Must be an integer."}, status.HTTP_400_BAD_REQUEST)
+        if not 0 < limit <= self.analytics_max_limit:
+            return error_response(
+                {"limit": f"Must be between 1 and {self.analytics_max_limit}."}, status.HTTP_400_BAD_REQUEST
+            )
+
+        return success_response(
+            "Item analytics fetched successfully.",
+            {"ranking": get_ranking(queryset, metric, limit), "trend": get_trend(queryset)},
+        )
+
+    # -----------------------------
+    # BULK UPDATE
+    # -----------------------------
+    @action(detail=False, methods=["POST"], url_path="bulk-update")
+    def bulk_update(self, request):
+        """
+        Reprice many items at once (see ItemBulkUpdateSerializer):
+        - {"items": [{"id", "rate", "discount", "tax_category"}, ...]} sets
+          the given fields per item;
+        - {"filter": {"ids", "type", "tax_category", "search"}, "percent": 10,
+          "tax_category": "gst-18"} changes the rate of every matching item by
+          a percentage and/or sets its tax category; without a filter it
+          takes "all": true to change every item.
+        Every item must end with a rate and discount ItemSerializer would
+        accept; otherwise nothing is written.
+        """
+        serializer = ItemBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        fields = ["rate", "discount", "tax_category", "updated_at"]
+        queryset = self.get_queryset().select_for_update().only("pk", "user_id", *fields)
+        now = timezone.now()
+        with transaction.atomic():
+            if "items" in data:
+                changes = {change.pop("id"): change for change in data["items"]}
+                items = queryset.in_bulk(list(changes))
+                missing = [pk for pk in changes if pk not in items]
+                if missing:
+                    return error_response({"items": f"Items not found: {missing}"}, status.HTTP_400_BAD_REQUEST)
+                for pk, change in changes.items():
+                    for field, value in change.items():
+                        setattr(items[pk], field, value)
+                items = list(items.values())
+            else:
+                queryset = self.filter_items(queryset, data["filter"])
+                items = list(queryset)
+                for item in items:
+                    if "percent" in data:
+                        item.rate = change_by_percentage(item.rate, data["percent"])
+                    if "tax_category" in data:
+                        item.tax_category = data["tax_category"]
+
+            errors = {}
+            for item in items:
+                item_errors = item_price_errors(item.rate, item.discount)
+                if item_errors:
+                    errors[item.pk] = item_errors
+            if errors:
+                return error_response({"items": errors}, status.HTTP_400_BAD_REQUEST)
+
+            for item in items:
+                item.updated_at = now
+            # bulk_update sends no signals: log the sync changes and drop cached reads here
+            Items.objects.bulk_update(items, fields, batch_size=500)
+            record_changes(items)
+            scope = scope_for_user(request.user)
+            bump_versions(scope, Items)
+            invalidate_item_catalog(scope)
+
+        return success_response(
+            "Items updated successfully.",
+            {
+                "updated": len(items),
+                "items": [
+                    {"id": item.pk, "rate": str(item.rate), "discount": str(item.discount), "tax_category": item.tax_category}
+                    for item in items
+                ],
+            },
+        )
+
+    @staticmethod
+    def filter_items(queryset, filters):
+        if "ids" in filters:
+            queryset = queryset.filter(pk__in=filters["ids"])
+        if "type" in filters:
+            queryset = queryset.filter(type=filters["type"])
+        if "tax_category" in filters:
+            queryset = queryset.filter(tax_category=filters["tax_category"])
+        if "search" in filters:
+            queryset = queryset.filter(name__icontains=filters["search"])
+        return queryset
+
     # -----------------------------
     # CREATE
     # -----------------------------
@@ -53,14 +200,17 @@ class ItemsViewSet(viewsets.ModelViewSet):
     # -----------------------------
     # LIST
     # -----------------------------
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Items fetched successfully.", serializer.data)
+        return self.list_response("Items fetched successfully.", queryset)
 
     # -----------------------------
     # RETRIEVE
     # -----------------------------
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         item = self.get_object()
         serializer = self.get_serializer(item)
@@ -69,6 +219,7 @@ class ItemsViewSet(viewsets.ModelViewSet):
     # -----------------------------
     # UPDATE / PATCH
     # -----------------------------
+    @check_if_match
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = self.get_object()
@@ -0,0 +1,30 @@
+# backend_api/views/job_views.py
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from backend_api.models import Job
+from backend_api.serializers.job import JobSerializer
+from backend_api.utils.response_utils import error_response, success_response
+
+
+class JobStatusView(APIView):
+    """
+    GET /api/jobs/        the user's most recent background jobs
+    GET /api/jobs/<id>/   one job: status (queued, running, succeeded, failed),
+                          attempts, result and the last error
+    """
+
+    permission_classes = [IsAuthenticated]
+    recent_limit = 50
+
+    def get(self, request, pk=None):
+        jobs = Job.objects.filter(user=request.user)
+        if pk is None:
+            recent = jobs.order_by("-id")[: self.recent_limit]
+            return success_response("Jobs fetched successfully.", JobSerializer(recent, many=True).data)
+
+        job = jobs.filter(pk=pk).first()
+        if job is None:
+            return error_response("Job not found.", status.HTTP_404_NOT_FOUND)
+        return success_response("Job fetched successfully.", JobSerializer(job).data)
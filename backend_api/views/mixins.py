@@ -0,0 +1,93 @@
+# backend_api/views/mixins.py
+from itertools import islice
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from backend_api.serializers.values import get_values_serializer
+from backend_api.utils.db_routing import can_read_replica, iter_on_replica, replica_active, replica_reads
+from backend_api.utils.request_metrics import track_timing
+from backend_api.utils.response_utils import streaming_success_response, success_response
+
+
+class ValuesListMixin:
+    """
+    ViewSet mixin for list actions.
+    get_list_data() builds the rows from `.values_list()` when the serializer
+    only has plain model fields, and falls back to the serializer otherwise.
+    list_response() sends them in the success_response envelope, streamed in
+    chunks when STREAMING_LIST_RESPONSES is on or the request has ?stream=true.
+    """
+
+    def get_values_serializer(self):
+        if not getattr(settings, "VALUES_LIST_SERIALIZERS", True):
+            return None
+        return get_values_serializer(self.get_serializer_class())
+
+    def get_list_data(self, queryset):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return self.get_serializer(queryset, many=True).data
+
+        with track_timing("serializer"):
+            return values_serializer.serialize(queryset)
+
+    # -----------------------------
+    # STREAMING
+    # -----------------------------
+    def should_stream_list(self):
+        requested = self.request.query_params.get("stream", "").lower()
+        if requested in ("0", "false"):
+            return False
+        return requested in ("1", "true") or getattr(settings, "STREAMING_LIST_RESPONSES", False)
+
+    def iter_list_chunks(self, queryset, chunk_size):
+        """Yield the serialized rows `chunk_size` at a time; only one chunk is in memory."""
+        values_serializer = self.get_values_serializer()
+        if values_serializer is not None:
+            yield from values_serializer.iter_chunks(queryset, chunk_size)
+            return
+
+        instances = queryset.iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(instances, chunk_size))
+            if not chunk:
+                return
+            yield self.get_serializer(chunk, many=True).data
+
+    def list_response(self, message, queryset):
+        if not self.should_stream_list():
+            return success_response(message, self.get_list_data(queryset))
+        chunk_size = getattr(settings, "STREAMING_LIST_CHUNK_SIZE", 2000)
+        chunks = self.iter_list_chunks(queryset, chunk_size)
+        if replica_active():
+            # the body is read after finalize_response() has left replica_reads()
+            chunks = iter_on_replica(chunks)
+        return streaming_success_response(message, chunks)
+
+
+class ReplicaReadMixin:
+    """
+    ViewSet mixin that runs the reads of `replica_actions` on the read replica
+    (utils/db_routing.py), unless the user's tenant has just written.
+    Only for actions whose answer may lag the primary by a few seconds.
+    """
+
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in SAFE_METHODS
+            and self.action in self.replica_actions
+            and can_read_replica(request.user)
+        ):
+            self._replica_reads = replica_reads()
+            self._replica_reads.__enter__()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        replica = getattr(self, "_replica_reads", None)
+        if replica is not None:
+            self._replica_reads = None
+            replica.__exit__(None, None, None)
+        return super().finalize_response(request, response, *args, **kwargs)
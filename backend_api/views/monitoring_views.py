@@ -0,0 +1,21 @@
+# backend_api/views/monitoring_views.py
+from django.conf import settings
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from backend_api.utils.db_pool import get_pool_stats
+from backend_api.utils.response_utils import success_response
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    GET /api/metrics/db-pool/
+    Connection pool usage of the worker process that serves the request,
+    for every configured database. Staff only.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        stats = [get_pool_stats(alias) for alias in settings.DATABASES]
+        return success_response("Database pool stats fetched successfully.", stats)
@@ -5,6 +5,9 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from backend_api.serializers.user import UserSerializer, CompanySerializer
 from backend_api.utils.response_utils import success_response, error_response
+from backend_api.utils.images import delete_variants, is_valid_image
+from backend_api.utils.jobs import enqueue
+from backend_api.tasks import process_profile_image
 
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
@@ -145,16 +148,23 @@ class ProfileImageView(APIView):
         max_size = 5 * 1024 * 1024
         if image_file.size > max_size:
             return error_response("File size exceeds the 5MB limit.", status.HTTP_400_BAD_REQUEST)
+
+        if not is_valid_image(image_file):
+            return error_response("The file is not a valid image.", status.HTTP_400_BAD_REQUEST)
         
         # Remove old profile image file if exists
-        if user.profile_image:
-            try:
-                user.profile_image.delete(save=False)
-            except Exception:
-                pass
+        self.delete_image(user)
             
         user.profile_image = image_file
         user.save()
+
+        # Sanitize the original and build the thumbnails off the request
+        enqueue(
+            process_profile_image,
+            {"user_id": str(user.pk), "image_name": user.profile_image.name},
+            user=user,
+        )
+        user.refresh_from_db(fields=["profile_image", "profile_image_variants"])
         
         serializer = UserSerializer(user, context={"request": request})
         return success_response("Profile image updated successfully.", serializer.data)
@@ -162,12 +172,22 @@ class ProfileImageView(APIView):
     def delete(self, request):
         user = request.user
         if user.profile_image:
-            try:
-                user.profile_image.delete(save=False)
-            except Exception:
-                pass
+            self.delete_image(user)
             user.profile_image = None
             user.save()
             
         serializer = UserSerializer(user, context={"request": request})
         return success_response("Profile image removed successfully.", serializer.data)
+
+    @staticmethod
+    def delete_image(user):
+        """Remove the stored original and its size variants."""
+        if not user.profile_image:
+            return
+        storage = user.profile_image.storage
+        try:
+            user.profile_image.delete(save=False)
+            delete_variants(storage, user.profile_image_variants)
+        except Exception:
+            pass
+        user.profile_image_variants = {}
@@ -3,8 +3,12 @@ from rest_framework.permissions import IsAuthenticated
 from backend_api.models.role import Role
 from backend_api.serializers.role import RoleSerializer
 from backend_api.utils.response_utils import success_response, error_response
+from backend_api.utils.query_plan import QueryPlanMixin
+from backend_api.views.mixins import ValuesListMixin
+from backend_api.utils.response_cache import cache_response
+from backend_api.utils.conditional import check_if_match, conditional_response
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = RoleSerializer
 
@@ -14,10 +18,16 @@ class RoleViewSet(viewsets.ModelViewSet):
             return Role.objects.filter(company=user.company).order_by('-created_at')
         return Role.objects.none()
 
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Roles retrieved successfully.", serializer.data)
+        return self.list_response("Roles retrieved successfully.", queryset)
+
+    @conditional_response
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         admin = request.user
@@ -30,6 +40,7 @@ class RoleViewSet(viewsets.ModelViewSet):
             return success_response("Role created successfully.", serializer.data, status.HTTP_201_CREATED)
         return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
+    @check_if_match
     def update(self, request, *args, **kwargs):
         admin = request.user
         if not admin.company or admin.role not in ["COMPANY_ADMIN", "SUPER_ADMIN"]:
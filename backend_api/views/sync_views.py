@@ -0,0 +1,46 @@
+# backend_api/views/sync_views.py
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from backend_api.utils.response_utils import error_response, success_response
+from backend_api.utils.sync import get_allowed_keys, get_changes, get_snapshot
+
+
+class SyncView(APIView):
+    """
+    GET /api/sync/?cursor=<n>
+    Records changed since `cursor` (contacts, items, invoices with lines,
+    accounts, incomes, expenses) as {"upserted": [...], "deleted": [ids]}
+    per model, plus the cursor to send next time.
+    - Without a cursor: a full snapshot of every model.
+    - ?models=contacts,items limits the models; modules the user has no
+      permission for are left out.
+    - has_more: true means call again with the new cursor; when it did not
+      move (the page is not settled yet), wait a few seconds first.
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_limit = 5000
+
+    def get(self, request):
+        requested = request.query_params.get("models")
+        keys = get_allowed_keys(request.user, requested.split(",") if requested else None)
+        context = {"request": request}
+
+        cursor = request.query_params.get("cursor")
+        if cursor in (None, ""):
+            return success_response("Snapshot fetched successfully.", get_snapshot(request.user, keys, context))
+
+        try:
+            cursor = int(cursor)
+            limit = int(request.query_params.get("limit", 0)) or None
+        except ValueError:
+            return error_response("cursor and limit must be integers.", status.HTTP_400_BAD_REQUEST)
+        if cursor < 0 or (limit is not None and not 0 < limit <= self.max_limit):
+            return error_response(
+                f"cursor must be positive and limit between 1 and {self.max_limit}.",
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        return success_response("Changes fetched successfully.", get_changes(request.user, cursor, keys, context, limit))
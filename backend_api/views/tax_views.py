@@ -3,8 +3,12 @@ from rest_framework.permissions import IsAuthenticated
 from backend_api.models.tax import Tax
 from backend_api.serializers.tax import TaxSerializer
 from backend_api.utils.response_utils import success_response, error_response
+from backend_api.utils.query_plan import QueryPlanMixin
+from backend_api.views.mixins import ValuesListMixin
+from backend_api.utils.response_cache import cache_response
+from backend_api.utils.conditional import check_if_match, conditional_response
 
-class TaxViewSet(viewsets.ModelViewSet):
+class TaxViewSet(QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = TaxSerializer
 
@@ -14,10 +18,16 @@ class TaxViewSet(viewsets.ModelViewSet):
             return Tax.objects.filter(company=user.company).order_by('-created_at')
         return Tax.objects.none()
 
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Taxes retrieved successfully.", serializer.data)
+        return self.list_response("Taxes retrieved successfully.", queryset)
+
+    @conditional_response
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -26,6 +36,7 @@ class TaxViewSet(viewsets.ModelViewSet):
             return success_response("Tax created successfully.", serializer.data, status.HTTP_201_CREATED)
         return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
+    @check_if_match
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=True)
@@ -2,18 +2,24 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from backend_api.models import User
+from backend_api.models import Role, User
 from backend_api.serializers.user import UserSerializer, CreateUserSerializer
 from backend_api.utils.response_utils import success_response, error_response
-import random
-from django.core.mail import send_mail
-from django.conf import settings
+from backend_api.utils.query_plan import QueryPlanMixin
+from backend_api.views.mixins import ValuesListMixin
+from backend_api.utils.response_cache import cache_response
+from backend_api.utils.conditional import check_if_match, conditional_response
+from backend_api.utils.jobs import enqueue
+from backend_api.tasks import send_staff_invite
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryPlanMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     User Management API for Company Admins and Permitted Staff
     """
     permission_classes = [IsAuthenticated]
+    # list/retrieve check permissions themselves and exclude the requesting user
+    cache_per_user = True
+    cache_models = (User, Role)
     serializer_class = UserSerializer
 
     def has_user_permission(self, user, action):
@@ -36,13 +42,16 @@ class UserViewSet(viewsets.ModelViewSet):
         # If no company, they cannot see any other users to manage
         return User.objects.none()
 
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         if not self.has_user_permission(request.user, "read"):
             return error_response("You don't have permission to view users.", status.HTTP_403_FORBIDDEN)
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response("Users retrieved successfully.", serializer.data)
+        return self.list_response("Users retrieved successfully.", queryset)
 
+    @conditional_response
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         if not self.has_user_permission(request.user, "read"):
             return error_response("You don't have permission to view this user.", status.HTTP_403_FORBIDDEN)
@@ -71,7 +80,6 @@ class UserViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             email = serializer.validated_data["email"]
             custom_role_id = serializer.validated_data.get("custom_role_id")
-            temp_password = str(random.randint(10000000, 99999999)) # temporary password
             
             custom_role = None
             if custom_role_id:
@@ -89,20 +97,9 @@ class UserViewSet(viewsets.ModelViewSet):
                 is_active=True,
                 is_verified=True # Auto verify users added by admin
             )
-            new_user.set_password(temp_password)
-            new_user.save()
 
-            # Email user their temporary password
-            try:
-                send_mail(
-                    "You've been invited to Hisaab",
-                    f"Hello {new_user.first_name},\n\nYou have been invited to join {admin.company.name} on Hisaab.\n\nYour login email: {email}\nYour temporary password: {temp_password}\n\nPlease log in and change your password.",
-                    settings.DEFAULT_FROM_EMAIL,
-                    [email],
-                    fail_silently=False,
-                )
-            except Exception as e:
-                print(f"Failed to send email in user creation: {e}") # Fail silently for email in dev
+            # Temporary password is set and emailed by a background job
+            enqueue(send_staff_invite, {"user_id": str(new_user.pk)}, user=admin)
 
 
             return success_response(
@@ -112,6 +109,7 @@ class UserViewSet(viewsets.ModelViewSet):
             )
         return error_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
+    @check_if_match
     def update(self, request, *args, **kwargs):
         admin = request.user
         if not admin.company or not self.has_user_permission(admin, "update"):
@@ -92,6 +92,9 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
+# Keep the metrics middleware outermost so its timings cover the whole stack.
+MIDDLEWARE.insert(0, "backend_api.middleware.RequestMetricsMiddleware")
+MIDDLEWARE.append("backend_api.middleware.ReplicaStickyMiddleware")
 
 ROOT_URLCONF = "hisab_backend.urls"
 
@@ -138,16 +141,47 @@ WSGI_APPLICATION = "hisab_backend.wsgi.application"
 #         "PORT": os.getenv("PORT"),
 #     }
 # }
+# Connection pooling (PostgreSQL with psycopg 3 only): DB_POOL=True replaces
+# persistent per-thread connections with a per-process psycopg pool.
+# Health checks run on every checkout (CONN_HEALTH_CHECKS).
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+DB_POOL_OPTIONS = {
+    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+}
 DATABASES = {
     "default": dj_database_url.parse(
         url=os.getenv("DATABASE_URL", ""),
-        conn_max_age=600, conn_health_checks=True
+        # pooled connections must not also be persistent
+        conn_max_age=0 if DB_POOL else 600,
+        conn_health_checks=os.getenv("DB_HEALTH_CHECKS", "True") == "True",
     )
 }
-
-
-
-
+# Optional read replica for list/retrieve traffic (backend_api.utils.db_routing).
+# Locally: REPLICA_DATABASE_URL=sqlite:////path/to/copy-of-primary.sqlite3
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL", "")
+if REPLICA_DATABASE_URL:
+    DATABASES["replica"] = dj_database_url.parse(
+        url=REPLICA_DATABASE_URL,
+        conn_max_age=0 if DB_POOL else 600,
+        conn_health_checks=os.getenv("DB_HEALTH_CHECKS", "True") == "True",
+    )
+    # tests read the primary's test database through this alias
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+for alias in DATABASES:
+    if DB_POOL and DATABASES[alias]["ENGINE"] == "django.db.backends.postgresql":
+        DATABASES[alias].setdefault("OPTIONS", {})["pool"] = DB_POOL_OPTIONS
+DATABASE_ROUTERS = ["backend_api.utils.db_routing.ReplicaRouter"]
+# STICKY_SECONDS: how long a tenant reads from the primary after writing; keep
+# it above the usual replica lag. CACHE_ALIAS must be shared by all workers
+# for stickiness to hold across them; startup fails otherwise.
+REPLICA = {
+    "STICKY_SECONDS": int(os.getenv("REPLICA_STICKY_SECONDS", "5")),
+    "CACHE_ALIAS": os.getenv("REPLICA_CACHE_ALIAS", "versions"),
+}
 
 
 # Password validation
@@ -206,8 +240,23 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# City list used for seeding and address lookups
+INDIA_CITIES_FILE = BASE_DIR / "india cities.json"
+# Compiled, memory-mapped city index (backend_api.utils.geo); rebuilt when
+# missing or older than INDIA_CITIES_FILE.
+CITY_INDEX = {
+    "PATH": os.getenv("CITY_INDEX_PATH", str(BASE_DIR / ".cache" / "city_index.bin")),
+}
+
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Uploaded profile images: the original is re-encoded at most MAX_SIZE px;
+# square thumbnails are written per size in WebP and JPEG.
+PROFILE_IMAGES = {
+    "MAX_SIZE": int(os.getenv("PROFILE_IMAGE_MAX_SIZE", "1024")),
+    "SIZES": {"sm": 48, "md": 96, "lg": 256},
+    "QUALITY": int(os.getenv("PROFILE_IMAGE_QUALITY", "80")),
+}
 
 STORAGES = {
     "default": {
@@ -240,7 +289,132 @@ CORS_ALLOW_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "idempotency-key",
 ]
+# Build list responses from values() rows when the serializer has only plain fields
+VALUES_LIST_SERIALIZERS = os.getenv("VALUES_LIST_SERIALIZERS", "True") == "True"
+# Stream list responses chunk by chunk (always, or per request with ?stream=true)
+STREAMING_LIST_RESPONSES = os.getenv("STREAMING_LIST_RESPONSES", "False") == "True"
+STREAMING_LIST_CHUNK_SIZE = int(os.getenv("STREAMING_LIST_CHUNK_SIZE", "2000"))
+
+# Caches. "responses" holds rendered list/retrieve bodies
+# (backend_api.utils.response_cache). RESPONSE_CACHE_BACKEND: "locmem" (per
+# process) or "file" (shared by all workers on a host). Both evict least
+# recently used entries first.
+# "versions" holds the counters that invalidate what each process keeps in
+# memory (backend_api.utils.versions) and must be shared by every worker: the
+# default directory is shared on one host; across hosts, point
+# VERSIONS_CACHE_BACKEND/LOCATION at a network cache (e.g. Redis).
+RESPONSE_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "backend_api.utils.cache_backends.LRULocMemCache",
+        "LOCATION": "hisab-responses",
+    },
+    "file": {
+        "BACKEND": "backend_api.utils.cache_backends.LRUFileBasedCache",
+        "LOCATION": os.getenv("RESPONSE_CACHE_DIR", str(BASE_DIR / ".cache" / "responses")),
+    },
+}
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "responses": {
+        **RESPONSE_CACHE_BACKENDS[os.getenv("RESPONSE_CACHE_BACKEND", "locmem")],
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000")),
+            "MAX_BYTES": int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        },
+    },
+    "versions": {
+        "BACKEND": os.getenv("VERSIONS_CACHE_BACKEND", "backend_api.utils.cache_backends.CounterFileBasedCache"),
+        "LOCATION": os.getenv("VERSIONS_CACHE_LOCATION", str(BASE_DIR / ".cache" / "versions")),
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("VERSIONS_CACHE_MAX_ENTRIES", "100000")),
+        },
+    },
+}
+# WORKERS: web worker processes per host (gunicorn reads WEB_CONCURRENCY too);
+# startup fails if they would not share the "versions" cache.
+VERSIONS = {
+    "CACHE_ALIAS": "versions",
+    "WORKERS": int(os.getenv("WEB_CONCURRENCY", "1")),
+}
+# Delta sync (/api/sync/). SETTLE_SECONDS must exceed the longest write
+# transaction: change-log ids are only acknowledged once that old.
+SYNC = {
+    "PAGE_SIZE": int(os.getenv("SYNC_PAGE_SIZE", "500")),
+    "SETTLE_SECONDS": int(os.getenv("SYNC_SETTLE_SECONDS", "5")),
+}
+# Batched writes (/api/batch/), all applied in one transaction
+BATCH = {
+    "MAX_OPERATIONS": int(os.getenv("BATCH_MAX_OPERATIONS", "200")),
+}
+# Idempotency-Key on invoice/income/expense create (backend_api.utils.idempotency).
+# LOCK_SECONDS: after this long a still-unfinished first request is presumed dead.
+IDEMPOTENCY = {
+    "ENABLED": os.getenv("IDEMPOTENCY_ENABLED", "True") == "True",
+    "TTL_SECONDS": int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60))),
+    "WAIT_SECONDS": float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10")),
+    "LOCK_SECONDS": int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60")),
+}
+# Background jobs (backend_api.utils.jobs). With JOBS_ASYNC=True jobs wait for
+# `manage.py run_workers`; otherwise they run inline when queued.
+JOBS = {
+    "ASYNC": os.getenv("JOBS_ASYNC", "False") == "True",
+    "WORKERS": int(os.getenv("JOBS_WORKERS", "2")),
+    "BATCH_SIZE": int(os.getenv("JOBS_BATCH_SIZE", "1")),
+    "POLL_SECONDS": float(os.getenv("JOBS_POLL_SECONDS", "1")),
+    "MAX_ATTEMPTS": int(os.getenv("JOBS_MAX_ATTEMPTS", "3")),
+    "BACKOFF_SECONDS": int(os.getenv("JOBS_BACKOFF_SECONDS", "10")),
+    "MAX_BACKOFF_SECONDS": int(os.getenv("JOBS_MAX_BACKOFF_SECONDS", "3600")),
+    "LOCK_TIMEOUT_SECONDS": int(os.getenv("JOBS_LOCK_TIMEOUT_SECONDS", "600")),
+}
+# Items resolved for invoice lines, per tenant (backend_api.utils.item_catalog).
+# MAX_SCOPES caps the tenants each process keeps items for.
+ITEM_CATALOG = {
+    "MAX_SCOPES": int(os.getenv("ITEM_CATALOG_MAX_SCOPES", "256")),
+}
+RESPONSE_CACHE = {
+    "ENABLED": os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True",
+    "CACHE_ALIAS": "responses",
+    "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300")),
+}
+
+# Per-request query count / DB time instrumentation (backend_api.middleware).
+# BUDGETS maps URL names to limits, e.g. {"invoice-list": {"queries": 10, "db_ms": 200}}
+REQUEST_METRICS = {
+    "ENABLED": os.getenv("REQUEST_METRICS_ENABLED", "True") == "True",
+    "SERVER_TIMING": os.getenv("REQUEST_METRICS_SERVER_TIMING", "True") == "True",
+    "LOG_SAMPLE_RATE": float(os.getenv("REQUEST_METRICS_SAMPLE_RATE", "0.01")),
+    "BUDGETS": {
+        "invoice-list": {"queries": 10},
+        "invoice-detail": {"queries": 10},
+        "contact-list": {"queries": 5},
+        "items-list": {"queries": 5},
+        "income-list": {"queries": 5},
+        "expense-list": {"queries": 5},
+        "user-list": {"queries": 5},
+    },
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "backend_api.metrics": {
+            "handlers": ["console"],
+            "level": os.getenv("REQUEST_METRICS_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),